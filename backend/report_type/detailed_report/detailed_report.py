@@ -56,12 +56,16 @@ class DetailedReport:
             self.source_urls) if self.source_urls else set()
 
     async def run(self) -> str:
-        await self._initial_research()
-        subtopics = await self._get_all_subtopics()
-        report_introduction = await self.gpt_researcher.write_introduction()
-        _, report_body = await self._generate_subtopic_reports(subtopics)
-        self.gpt_researcher.visited_urls.update(self.global_urls)
-        report = await self._construct_detailed_report(report_introduction, report_body)
+        try:
+            await self._initial_research()
+            subtopics = await self._get_all_subtopics()
+            report_introduction = await self.gpt_researcher.write_introduction()
+            _, report_body = await self._generate_subtopic_reports(subtopics)
+            self.gpt_researcher.visited_urls.update(self.global_urls)
+            report = await self._construct_detailed_report(report_introduction, report_body)
+        finally:
+            # The subtopic researchers share this session
+            await self.gpt_researcher.aclose()
         return report
 
     async def _initial_research(self) -> None:
@@ -85,18 +89,50 @@ class DetailedReport:
         subtopic_reports = []
         subtopics_report_body = ""
 
-        for subtopic in subtopics:
-            result = await self._get_subtopic_report(subtopic)
-            if result["report"]:
-                subtopic_reports.append(result)
-                subtopics_report_body += f"\n\n\n{result['report']}"
+        concurrency = self.gpt_researcher.cfg.subtopic_concurrency
+        if concurrency <= 1:
+            for subtopic in subtopics:
+                result = await self._get_subtopic_report(subtopic)
+                if result["report"]:
+                    subtopic_reports.append(result)
+                    subtopics_report_body += f"\n\n\n{result['report']}"
+            return subtopic_reports, subtopics_report_body
+
+        # Research runs ahead under the concurrency limit; reports are still written one by one,
+        # in order, so each sees the headers and sections written before it
+        semaphore = asyncio.Semaphore(concurrency)
+        # Pages scraped by any of the subtopics, so that web results found by several of them are only
+        # scraped once; source_urls are scraped for every subtopic regardless
+        shared_urls: Set[str] = set()
+
+        async def research(subtopic: Dict) -> GPTResearcher:
+            async with semaphore:
+                subtopic_assistant = self._create_subtopic_assistant(subtopic, shared_urls)
+                await subtopic_assistant.conduct_research()
+                return subtopic_assistant
+
+        tasks = [asyncio.create_task(research(subtopic)) for subtopic in subtopics]
+        try:
+            for subtopic, task in zip(subtopics, tasks):
+                result = await self._write_subtopic_report(subtopic, await task)
+                if result["report"]:
+                    subtopic_reports.append(result)
+                    subtopics_report_body += f"\n\n\n{result['report']}"
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
 
         return subtopic_reports, subtopics_report_body
 
     async def _get_subtopic_report(self, subtopic: Dict) -> Dict[str, str]:
-        current_subtopic_task = subtopic.get("task")
+        subtopic_assistant = self._create_subtopic_assistant(subtopic)
+        await subtopic_assistant.conduct_research()
+        return await self._write_subtopic_report(subtopic, subtopic_assistant)
+
+    def _create_subtopic_assistant(self, subtopic: Dict, shared_urls: Optional[Set[str]] = None) -> GPTResearcher:
         subtopic_assistant = GPTResearcher(
-            query=current_subtopic_task,
+            query=subtopic.get("task"),
             query_domains=self.query_domains,
             report_type="subtopic_report",
             report_source=self.report_source,
@@ -104,18 +140,21 @@ class DetailedReport:
             headers=self.headers,
             parent_query=self.query,
             subtopics=self.subtopics,
-            visited_urls=self.global_urls,
+            shared_urls=shared_urls,
             agent=self.gpt_researcher.agent,
             role=self.gpt_researcher.role,
             tone=self.tone,
             complement_source_urls=self.complement_source_urls,
             source_urls=self.source_urls,
-			language=self.language
+			language=self.language,
+            session=self.gpt_researcher.session,
         )
 
         subtopic_assistant.context = list(set(self.global_context))
-        await subtopic_assistant.conduct_research()
+        return subtopic_assistant
 
+    async def _write_subtopic_report(self, subtopic: Dict, subtopic_assistant: GPTResearcher) -> Dict[str, str]:
+        current_subtopic_task = subtopic.get("task")
         draft_section_titles = await subtopic_assistant.get_draft_section_titles(current_subtopic_task)
 
         if not isinstance(draft_section_titles, str):
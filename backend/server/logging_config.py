@@ -1,39 +1,10 @@
 import logging
-import json
 import os
 from datetime import datetime
 from pathlib import Path
 
-class JSONResearchHandler:
-    def __init__(self, json_file):
-        self.json_file = json_file
-        self.research_data = {
-            "timestamp": datetime.now().isoformat(),
-            "events": [],
-            "content": {
-                "query": "",
-                "sources": [],
-                "context": [],
-                "report": "",
-                "costs": 0.0
-            }
-        }
+from gpt_researcher.utils.logging_config import JSONResearchHandler
 
-    def log_event(self, event_type: str, data: dict):
-        self.research_data["events"].append({
-            "timestamp": datetime.now().isoformat(),
-            "type": event_type,
-            "data": data
-        })
-        self._save_json()
-
-    def update_content(self, key: str, value):
-        self.research_data["content"][key] = value
-        self._save_json()
-
-    def _save_json(self):
-        with open(self.json_file, 'w') as f:
-            json.dump(self.research_data, f, indent=2)
 
 def setup_research_logging():
     # Create logs directory if it doesn't exist
@@ -0,0 +1,132 @@
+import asyncio
+import logging
+from collections import deque
+from typing import Any, Dict
+
+logger = logging.getLogger(__name__)
+
+# Log messages that are never merged or dropped
+ESSENTIAL_LOGS = {"error"}
+
+
+class QueuedWebSocket:
+    """
+    Sends a websocket's outgoing messages from a bounded queue in a background task,
+    so a slow client doesn't stall the research coroutine that produces them.
+
+    - Consecutive queued `report` chunks are coalesced into a single message.
+    - Once the queue is `merge_ratio` full, consecutive queued `logs` messages of the
+      same kind are merged; once it is full, new `logs` messages are dropped.
+    - Any other message waits for room when the queue is full, so the producer only
+      slows down when the client can't keep up with essential output.
+
+    Everything else (receive_text, close, ...) is delegated to the wrapped websocket.
+    """
+
+    def __init__(self, websocket, max_size: int = 1000, merge_ratio: float = 0.5):
+        self.websocket = websocket
+        self.max_size = max_size
+        self.merge_ratio = merge_ratio
+        self.stats = {"sent": 0, "coalesced": 0, "merged": 0, "dropped": 0, "max_depth": 0}
+        self._queue: deque = deque()
+        self._ready = asyncio.Event()
+        self._space = asyncio.Event()
+        self._space.set()
+        self._closed = False
+        self._sender = asyncio.create_task(self._send_loop())
+
+    def __getattr__(self, name):
+        return getattr(self.websocket, name)
+
+    @property
+    def depth(self) -> int:
+        """Messages waiting to be sent."""
+        return len(self._queue)
+
+    async def send_json(self, data: Dict[str, Any]) -> None:
+        await self._put("json", data)
+
+    async def send_text(self, data: str) -> None:
+        await self._put("text", data)
+
+    async def _put(self, kind: str, data: Any) -> None:
+        if self._closed:
+            return
+        if kind == "json" and self._merge(data):
+            return
+        while len(self._queue) >= self.max_size:
+            if _is_log(data):
+                self.stats["dropped"] += 1
+                return
+            self._space.clear()
+            await self._space.wait()
+            if self._closed:
+                return
+        self._queue.append((kind, data))
+        self.stats["max_depth"] = max(self.stats["max_depth"], len(self._queue))
+        self._ready.set()
+
+    def _merge(self, data: Dict[str, Any]) -> bool:
+        """Fold `data` into the last queued message when allowed; True if it was."""
+        if not self._queue or self._queue[-1][0] != "json":
+            return False
+        last = self._queue[-1][1]
+        if _is_chunk(data, "report") and _is_chunk(last, "report"):
+            self._queue[-1] = ("json", {**last, "output": last["output"] + data["output"]})
+            self.stats["coalesced"] += 1
+            return True
+        if (
+            len(self._queue) >= self.max_size * self.merge_ratio
+            and _is_log(data)
+            and _is_log(last)
+            and data.get("content") == last.get("content")
+            and not data.get("metadata")
+            and not last.get("metadata")
+        ):
+            self._queue[-1] = ("json", {**last, "output": f"{last['output']}\n{data['output']}"})
+            self.stats["merged"] += 1
+            return True
+        return False
+
+    async def _send_loop(self) -> None:
+        while True:
+            while not self._queue:
+                if self._closed:
+                    return
+                self._ready.clear()
+                await self._ready.wait()
+            kind, data = self._queue.popleft()
+            self._space.set()
+            try:
+                if kind == "json":
+                    await self.websocket.send_json(data)
+                else:
+                    await self.websocket.send_text(data)
+                self.stats["sent"] += 1
+            except Exception as e:
+                logger.warning(f"Websocket send failed, discarding {len(self._queue)} queued messages: {e}")
+                self._closed = True
+                self._queue.clear()
+                self._space.set()
+                return
+
+    async def aclose(self, timeout: float = 5.0) -> None:
+        """Stop accepting messages and give the queued ones `timeout` seconds to be sent."""
+        self._closed = True
+        self._ready.set()
+        self._space.set()
+        try:
+            await asyncio.wait_for(self._sender, timeout)
+        except (asyncio.TimeoutError, asyncio.CancelledError):
+            pass
+        logger.debug(f"Websocket output stats: {self.stats}")
+
+
+def _is_log(data: Any) -> bool:
+    return isinstance(data, dict) and data.get("type") == "logs" and data.get("content") not in ESSENTIAL_LOGS \
+        and isinstance(data.get("output"), str)
+
+
+def _is_chunk(data: Any, message_type: str) -> bool:
+    return isinstance(data, dict) and set(data) == {"type", "output"} and data["type"] == message_type \
+        and isinstance(data["output"], str)
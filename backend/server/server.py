@@ -19,6 +19,8 @@ from backend.server.server_utils import (
 
 from backend.server.websocket_manager import run_agent
 from backend.utils import write_md_to_word, write_md_to_pdf
+from gpt_researcher.llm_provider.registry import close_providers
+from gpt_researcher.scraper.fetcher import close_client_sessions
 from gpt_researcher.utils.logging_config import setup_research_logging
 from gpt_researcher.utils.enum import Tone
 
@@ -102,7 +104,13 @@ def startup_event():
     os.makedirs("outputs", exist_ok=True)
     app.mount("/outputs", StaticFiles(directory="outputs"), name="outputs")
     # os.makedirs(DOC_PATH, exist_ok=True)  # Commented out to avoid creating the folder if not needed
-    
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    await close_client_sessions()
+    await close_providers()
+
 
 # Routes
 
@@ -197,8 +205,10 @@ async def delete_file(filename: str):
 
 @app.websocket("/ws")
 async def websocket_endpoint(websocket: WebSocket):
-    await manager.connect(websocket)
+    output = await manager.connect(websocket)
     try:
-        await handle_websocket_communication(websocket, manager)
+        await handle_websocket_communication(output, manager)
     except WebSocketDisconnect:
+        pass
+    finally:
         await manager.disconnect(websocket)
@@ -9,6 +9,7 @@ from typing import Awaitable, Dict, List, Any
 from fastapi.responses import JSONResponse, FileResponse
 from gpt_researcher.document.document import DocumentLoader
 from gpt_researcher import GPTResearcher
+from gpt_researcher.utils.event_log import EventLog, empty_research_log, write_json_atomic
 from backend.utils import write_md_to_pdf, write_md_to_word, write_text_to_md
 from pathlib import Path
 from datetime import datetime
@@ -25,47 +26,30 @@ class CustomLogsHandler:
         self.websocket = websocket
         sanitized_filename = sanitize_filename(f"task_{int(time.time())}_{task}")
         self.log_file = os.path.join("outputs", f"{sanitized_filename}.json")
-        self.timestamp = datetime.now().isoformat()
+        # Events are appended to a JSON Lines file and compacted into log_file by close()
+        self.event_log = EventLog(os.path.join("outputs", f"{sanitized_filename}.jsonl"), summary_path=self.log_file)
+        self.timestamp = self.event_log.timestamp
         # Initialize log file with metadata
         os.makedirs("outputs", exist_ok=True)
-        with open(self.log_file, 'w') as f:
-            json.dump({
-                "timestamp": self.timestamp,
-                "events": [],
-                "content": {
-                    "query": "",
-                    "sources": [],
-                    "context": [],
-                    "report": "",
-                    "costs": 0.0
-                }
-            }, f, indent=2)
+        write_json_atomic(self.log_file, empty_research_log(self.timestamp))
 
     async def send_json(self, data: Dict[str, Any]) -> None:
         """Store log data and send to websocket"""
         # Send to websocket for real-time display
         if self.websocket:
             await self.websocket.send_json(data)
-            
-        # Read current log file
-        with open(self.log_file, 'r') as f:
-            log_data = json.load(f)
-            
+
         # Update appropriate section based on data type
         if data.get('type') == 'logs':
-            log_data['events'].append({
-                "timestamp": datetime.now().isoformat(),
-                "type": "event",
-                "data": data
-            })
+            self.event_log.log_event("event", data)
         else:
             # Update content section for other types of data
-            log_data['content'].update(data)
-            
-        # Save updated log file
-        with open(self.log_file, 'w') as f:
-            json.dump(log_data, f, indent=2)
-        logger.debug(f"Log entry written to: {self.log_file}")
+            self.event_log.update_content(data)
+
+    async def close(self) -> None:
+        """Write the summary JSON to log_file at the end of the run."""
+        await self.event_log.aclose()
+        logger.debug(f"Log written to: {self.log_file}")
 
 
 class Researcher:
@@ -84,9 +68,12 @@ class Researcher:
 
     async def research(self) -> dict:
         """Conduct research and return paths to generated files"""
-        await self.researcher.conduct_research()
-        report = await self.researcher.write_report()
-        
+        try:
+            await self.researcher.conduct_research()
+            report = await self.researcher.write_report()
+        finally:
+            await self.logs_handler.close()
+
         # Generate the files
         sanitized_filename = sanitize_filename(f"task_{int(time.time())}_{self.query}")
         file_paths = await generate_report_files(report, sanitized_filename)
@@ -148,18 +135,22 @@ async def handle_start_command(websocket, data: str, manager):
 
     sanitized_filename = sanitize_filename(f"task_{int(time.time())}_{task}")
 
-    report = await manager.start_streaming(
-        task,
-        report_type,
-        report_source,
-        source_urls,
-        document_urls,
-        tone,
-        websocket,
-        headers,
-        query_domains,
-        language,
-    )
+    try:
+        report = await manager.start_streaming(
+            task,
+            report_type,
+            report_source,
+            source_urls,
+            document_urls,
+            tone,
+            websocket,
+            headers,
+            query_domains,
+            language,
+            logs_handler=logs_handler,
+        )
+    finally:
+        await logs_handler.close()
     report = str(report)
     file_paths = await generate_report_files(report, sanitized_filename)
     # Add JSON log path to file_paths
@@ -281,9 +272,9 @@ async def handle_websocket_communication(websocket, manager):
                     logger.warning(
                         f"Received request while task is already running. Request data preview: {data[: min(20, len(data))]}..."
                     )
-                    websocket.send_json(
+                    await websocket.send_json(
                         {
-                            "types": "logs",
+                            "type": "logs",
                             "output": "Task already running. Please wait.",
                         }
                     )
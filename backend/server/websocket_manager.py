@@ -1,4 +1,3 @@
-import asyncio
 import datetime
 from typing import Dict, List
 
@@ -10,6 +9,7 @@ from backend.chat import ChatAgentWithMemory
 from gpt_researcher.utils.enum import ReportType, Tone
 from multi_agents.main import run_research_task
 from gpt_researcher.actions import stream_output  # Import stream_output
+from backend.server.output_queue import QueuedWebSocket
 from backend.server.server_utils import CustomLogsHandler
 
 
@@ -18,68 +18,42 @@ class WebSocketManager:
 
     def __init__(self):
         """Initialize the WebSocketManager class."""
-        self.active_connections: List[WebSocket] = []
-        self.sender_tasks: Dict[WebSocket, asyncio.Task] = {}
-        self.message_queues: Dict[WebSocket, asyncio.Queue] = {}
+        self.active_connections: List[QueuedWebSocket] = []
+        self.outputs: Dict[WebSocket, QueuedWebSocket] = {}
         self.chat_agent = None
 
-    async def start_sender(self, websocket: WebSocket):
-        """Start the sender task."""
-        queue = self.message_queues.get(websocket)
-        if not queue:
-            return
-
-        while True:
-            try:
-                message = await queue.get()
-                if message is None:  # Shutdown signal
-                    break
-                    
-                if websocket in self.active_connections:
-                    if message == "ping":
-                        await websocket.send_text("pong")
-                    else:
-                        await websocket.send_text(message)
-                else:
-                    break
-            except Exception as e:
-                print(f"Error in sender task: {e}")
-                break
-
-    async def connect(self, websocket: WebSocket):
-        """Connect a websocket."""
+    async def connect(self, websocket: WebSocket) -> QueuedWebSocket:
+        """Connect a websocket, returning it wrapped so all output goes through its send queue."""
+        output = QueuedWebSocket(websocket)
+        self.outputs[websocket] = output
         try:
             await websocket.accept()
-            self.active_connections.append(websocket)
-            self.message_queues[websocket] = asyncio.Queue()
-            self.sender_tasks[websocket] = asyncio.create_task(
-                self.start_sender(websocket))
+            self.active_connections.append(output)
         except Exception as e:
             print(f"Error connecting websocket: {e}")
-            if websocket in self.active_connections:
-                await self.disconnect(websocket)
+            await self.disconnect(websocket)
+        return output
 
     async def disconnect(self, websocket: WebSocket):
         """Disconnect a websocket."""
-        if websocket in self.active_connections:
-            self.active_connections.remove(websocket)
-            if websocket in self.sender_tasks:
-                self.sender_tasks[websocket].cancel()
-                await self.message_queues[websocket].put(None)
-                del self.sender_tasks[websocket]
-            if websocket in self.message_queues:
-                del self.message_queues[websocket]
-            try:
-                await websocket.close()
-            except:
-                pass  # Connection might already be closed
+        websocket = getattr(websocket, "websocket", websocket)
+        output = self.outputs.pop(websocket, None)
+        if output is None:
+            return
+        if output in self.active_connections:
+            self.active_connections.remove(output)
+        await output.aclose()
+        try:
+            await websocket.close()
+        except:
+            pass  # Connection might already be closed
 
-    async def start_streaming(self, task, report_type, report_source, source_urls, document_urls, tone, websocket, headers=None, query_domains=[], language="english"):
-        """Start streaming the output."""
+    async def start_streaming(self, task, report_type, report_source, source_urls, document_urls, tone, websocket, headers=None, query_domains=[], language="english", logs_handler=None):
+        """Start streaming the output. Events are logged to `logs_handler` when given, which the caller closes."""
         tone = Tone[tone]
         # add customized JSON config file path here
         config_path = "default"
-        report = await run_agent(task, report_type, report_source, source_urls, document_urls, tone, websocket, headers=headers, query_domains=query_domains, config_path=config_path, language=language)
+        report = await run_agent(task, report_type, report_source, source_urls, document_urls, tone, websocket, headers=headers, query_domains=query_domains, config_path=config_path, language=language, logs_handler=logs_handler)
         # Create new Chat Agent whenever a new report is written
         self.chat_agent = ChatAgentWithMemory(report, config_path, headers)
         return report
@@ -91,53 +65,60 @@ class WebSocketManager:
         else:
             await websocket.send_json({"type": "chat", "content": "Knowledge empty, please run the research first to obtain knowledge"})
 
-async def run_agent(task, report_type, report_source, source_urls, document_urls, tone: Tone, websocket, stream_output=stream_output, headers=None, query_domains=[], config_path="", return_researcher=False,language="english"):
-    """Run the agent."""    
-    # Create logs handler for this research task
-    logs_handler = CustomLogsHandler(websocket, task)
-
-    # Initialize researcher based on report type
-    if report_type == "multi_agents":
-        report = await run_research_task(
-            query=task, 
-            websocket=logs_handler,  # Use logs_handler instead of raw websocket
-            stream_output=stream_output, 
-            tone=tone, 
-            headers=headers
-        )
-        report = report.get("report", "")
-
-    elif report_type == ReportType.DetailedReport.value:
-        researcher = DetailedReport(
-            query=task,
-            query_domains=query_domains,
-            report_type=report_type,
-            report_source=report_source,
-            source_urls=source_urls,
-            document_urls=document_urls,
-            tone=tone,
-            config_path=config_path,
-            websocket=logs_handler,  # Use logs_handler instead of raw websocket
-            headers=headers,
-            language=language
-        )
-        report = await researcher.run()
+async def run_agent(task, report_type, report_source, source_urls, document_urls, tone: Tone, websocket, stream_output=stream_output, headers=None, query_domains=[], config_path="", return_researcher=False,language="english", logs_handler=None):
+    """Run the agent. A `logs_handler` passed in is left open for its owner to close."""
+    # Create logs handler for this research task, unless the caller already logs it
+    owns_logs_handler = logs_handler is None
+    if owns_logs_handler:
+        logs_handler = CustomLogsHandler(websocket, task)
+
+    try:
+        # Initialize researcher based on report type
+        if report_type == "multi_agents":
+            report = await run_research_task(
+                query=task, 
+                websocket=logs_handler,  # Use logs_handler instead of raw websocket
+                stream_output=stream_output, 
+                tone=tone, 
+                headers=headers
+            )
+            report = report.get("report", "")
+
+        elif report_type == ReportType.DetailedReport.value:
+            researcher = DetailedReport(
+                query=task,
+                query_domains=query_domains,
+                report_type=report_type,
+                report_source=report_source,
+                source_urls=source_urls,
+                document_urls=document_urls,
+                tone=tone,
+                config_path=config_path,
+                websocket=logs_handler,  # Use logs_handler instead of raw websocket
+                headers=headers,
+                language=language
+            )
+            report = await researcher.run()
         
-    else:
-        researcher = BasicReport(
-            query=task,
-            query_domains=query_domains,
-            report_type=report_type,
-            report_source=report_source,
-            source_urls=source_urls,
-            document_urls=document_urls,
-            tone=tone,
-            config_path=config_path,
-            websocket=logs_handler,  # Use logs_handler instead of raw websocket
-            headers=headers,
-            language=language
-        )
-        report = await researcher.run()
+        else:
+            researcher = BasicReport(
+                query=task,
+                query_domains=query_domains,
+                report_type=report_type,
+                report_source=report_source,
+                source_urls=source_urls,
+                document_urls=document_urls,
+                tone=tone,
+                config_path=config_path,
+                websocket=logs_handler,  # Use logs_handler instead of raw websocket
+                headers=headers,
+                language=language
+            )
+            report = await researcher.run()
+    finally:
+        # Write the log summary even when the run fails
+        if owns_logs_handler:
+            await logs_handler.close()
 
     if report_type != "multi_agents" and return_researcher:
         return report, researcher.gpt_researcher
@@ -17,6 +17,8 @@ import os
 from dotenv import load_dotenv
 
 from gpt_researcher import GPTResearcher
+from gpt_researcher.llm_provider.registry import close_providers
+from gpt_researcher.scraper.fetcher import close_client_sessions
 from gpt_researcher.utils.enum import ReportType, Tone
 from backend.report_type import DetailedReport
 
@@ -140,6 +142,7 @@ async def main(args):
         await researcher.conduct_research()
 
         report = await researcher.write_report()
+        await researcher.aclose()
 
     # Write the report to a file
     artifact_filepath = f"outputs/{uuid4()}.md"
@@ -149,6 +152,9 @@ async def main(args):
 
     print(f"Report written to '{artifact_filepath}'")
 
+    await close_client_sessions()
+    await close_providers()
+
 if __name__ == "__main__":
     load_dotenv()
     args = cli.parse_args()
@@ -1,3 +1,4 @@
 from .agent import GPTResearcher
+from .session import ResearchSession
 
-__all__ = ['GPTResearcher']
\ No newline at end of file
+__all__ = ['GPTResearcher', 'ResearchSession']
\ No newline at end of file
@@ -1,7 +1,7 @@
 from .retriever import get_retriever, get_retrievers
 from .query_processing import plan_research_outline, get_search_results
 from .agent_creator import extract_json_with_regex, choose_agent
-from .web_scraping import scrape_urls
+from .web_scraping import scrape_urls, iter_scrape_urls
 from .report_generation import write_conclusion, summarize_url, generate_draft_section_titles, generate_report, write_report_introduction
 from .markdown_processing import extract_headers, extract_sections, table_of_contents, add_references
 from .utils import stream_output
@@ -13,6 +13,7 @@ __all__ = [
     "plan_research_outline",
     "extract_json_with_regex",
     "scrape_urls",
+    "iter_scrape_urls",
     "write_conclusion",
     "summarize_url",
     "generate_draft_section_titles",
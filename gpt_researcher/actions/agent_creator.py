@@ -1,7 +1,9 @@
 import json
 import re
 import json_repair
-from ..utils.llm import create_chat_completion
+from ..utils.llm import create_chat_completion, llm_fallbacks
+from ..llm_provider.rate_limiter import Priority
+from ..utils.llm_cache import get_llm_cache
 from ..prompts import auto_agent_instructions
 
 async def choose_agent(
@@ -34,6 +36,10 @@ async def choose_agent(
             llm_provider=cfg.smart_llm_provider,
             llm_kwargs=cfg.llm_kwargs,
             cost_callback=cost_callback,
+            cache=get_llm_cache(cfg),
+            cache_query=query,
+            fallbacks=llm_fallbacks(cfg, "smart"),
+            priority=Priority.LOW,
         )
 
         agent_dict = json.loads(response)
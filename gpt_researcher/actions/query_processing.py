@@ -1,7 +1,9 @@
 import json_repair
 
 from gpt_researcher.llm_provider.generic.base import ReasoningEfforts
-from ..utils.llm import create_chat_completion
+from gpt_researcher.llm_provider.rate_limiter import Priority
+from ..utils.llm import create_chat_completion, llm_fallbacks
+from ..utils.llm_cache import get_llm_cache
 from ..prompts import generate_search_queries_prompt
 from typing import Any, List, Dict
 from ..config import Config
@@ -54,43 +56,25 @@ async def generate_sub_queries(
         context=context
     )
 
-    try:
-        response = await create_chat_completion(
-            model=cfg.strategic_llm_model,
-            messages=[{"role": "user", "content": gen_queries_prompt}],
-            temperature=0.6,
-            llm_provider=cfg.strategic_llm_provider,
-            max_tokens=None,
-            llm_kwargs=cfg.llm_kwargs,
-            reasoning_effort=ReasoningEfforts.High.value,
-            cost_callback=cost_callback,
-        )
-    except Exception as e:
-        logger.warning(f"Error with strategic LLM: {e}. Retrying with max_tokens={cfg.strategic_token_limit}.")
-        logger.warning(f"See https://github.com/assafelovic/gpt-researcher/issues/1022")
-        try:
-            response = await create_chat_completion(
-                model=cfg.strategic_llm_model,
-                messages=[{"role": "user", "content": gen_queries_prompt}],
-                temperature=1,
-                llm_provider=cfg.strategic_llm_provider,
-                max_tokens=cfg.strategic_token_limit,
-                llm_kwargs=cfg.llm_kwargs,
-                cost_callback=cost_callback,
-            )
-            logger.warning(f"Retrying with max_tokens={cfg.strategic_token_limit} successful.")
-        except Exception as e:
-            logger.warning(f"Retrying with max_tokens={cfg.strategic_token_limit} failed.")
-            logger.warning(f"Error with strategic LLM: {e}. Falling back to smart LLM.")
-            response = await create_chat_completion(
-                model=cfg.smart_llm_model,
-                messages=[{"role": "user", "content": gen_queries_prompt}],
-                temperature=cfg.temperature,
-                max_tokens=cfg.smart_token_limit,
-                llm_provider=cfg.smart_llm_provider,
-                llm_kwargs=cfg.llm_kwargs,
-                cost_callback=cost_callback,
-            )
+    response = await create_chat_completion(
+        model=cfg.strategic_llm_model,
+        messages=[{"role": "user", "content": gen_queries_prompt}],
+        temperature=0.6,
+        llm_provider=cfg.strategic_llm_provider,
+        max_tokens=None,
+        llm_kwargs=cfg.llm_kwargs,
+        reasoning_effort=ReasoningEfforts.High.value,
+        cost_callback=cost_callback,
+        cache=get_llm_cache(cfg),
+        cache_query=query,
+        fallbacks=[
+            # Some reasoning models reject max_tokens=None,
+            # see https://github.com/assafelovic/gpt-researcher/issues/1022
+            {"temperature": 1, "max_tokens": cfg.strategic_token_limit},
+            *llm_fallbacks(cfg, "strategic"),
+        ],
+        priority=Priority.LOW,
+    )
 
     return json_repair.loads(response)
 
@@ -2,6 +2,8 @@ import asyncio
 from typing import List, Dict, Any
 from ..config.config import Config
 from ..utils.llm import create_chat_completion
+from ..llm_provider.rate_limiter import Priority
+from ..utils.llm_cache import get_llm_cache
 from ..utils.logger import get_formatted_logger
 from ..prompts import (
     generate_report_introduction,
@@ -54,6 +56,7 @@ async def write_report_introduction(
             max_tokens=config.smart_token_limit,
             llm_kwargs=config.llm_kwargs,
             cost_callback=cost_callback,
+            priority=Priority.HIGH,
         )
         return introduction
     except Exception as e:
@@ -99,6 +102,7 @@ async def write_conclusion(
             max_tokens=config.smart_token_limit,
             llm_kwargs=config.llm_kwargs,
             cost_callback=cost_callback,
+            priority=Priority.HIGH,
         )
         return conclusion
     except Exception as e:
@@ -142,6 +146,7 @@ async def summarize_url(
             max_tokens=config.smart_token_limit,
             llm_kwargs=config.llm_kwargs,
             cost_callback=cost_callback,
+            priority=Priority.HIGH,
         )
         return summary
     except Exception as e:
@@ -182,11 +187,12 @@ async def generate_draft_section_titles(
             ],
             temperature=0.25,
             llm_provider=config.smart_llm_provider,
-            stream=True,
-            websocket=None,
             max_tokens=config.smart_token_limit,
             llm_kwargs=config.llm_kwargs,
             cost_callback=cost_callback,
+            priority=Priority.HIGH,
+            cache=get_llm_cache(config),
+            cache_query=current_subtopic,
         )
         return section_titles.split("\n")
     except Exception as e:
@@ -252,6 +258,7 @@ async def generate_report(
             max_tokens=cfg.smart_token_limit,
             llm_kwargs=cfg.llm_kwargs,
             cost_callback=cost_callback,
+            priority=Priority.HIGH,
         )
     except:
         try:
@@ -267,6 +274,7 @@ async def generate_report(
                 max_tokens=cfg.smart_token_limit,
                 llm_kwargs=cfg.llm_kwargs,
                 cost_callback=cost_callback,
+                priority=Priority.HIGH,
             )
         except Exception as e:
             print(f"Error in generate_report: {e}")
@@ -1,4 +1,5 @@
 from ..config.config import Config
+from ..retrievers.search_cache import cached_retriever, get_search_cache
 
 def get_retriever(retriever: str):
     """
@@ -97,7 +98,9 @@ def get_retrievers(headers: dict[str, str], cfg: Config):
 
     # Convert retriever names to actual retriever classes
     # Use get_default_retriever() as a fallback for any invalid retriever names
-    return [get_retriever(r) or get_default_retriever() for r in retrievers]
+    # Results are served from the search cache when it is enabled
+    search_cache = get_search_cache(cfg)
+    return [cached_retriever(get_retriever(r) or get_default_retriever(), search_cache) for r in retrievers]
 
 
 def get_default_retriever():
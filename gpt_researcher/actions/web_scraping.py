@@ -1,22 +1,53 @@
-from typing import Any
+from typing import Any, AsyncIterator
 from colorama import Fore, Style
 
 from gpt_researcher.utils.workers import WorkerPool
 from ..scraper import Scraper
+from ..scraper.fetcher import AsyncFetcher
+from ..scraper.http_cache import get_http_cache
 from ..config.config import Config
 from ..utils.logger import get_formatted_logger
 
 logger = get_formatted_logger()
 
 
+def _get_scraper(urls, cfg: Config, worker_pool: WorkerPool, query: str | None = None) -> Scraper:
+    user_agent = (
+        cfg.user_agent
+        if cfg
+        else "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/128.0.0.0 Safari/537.36"
+    )
+    http_cache = get_http_cache(cfg)
+    fetcher = AsyncFetcher(
+        user_agent,
+        http_cache=http_cache,
+        max_bytes=int(cfg.scraper_max_page_size_mb * 1024 * 1024) if cfg.scraper_max_page_size_mb else None,
+        max_connections=cfg.scraper_max_connections,
+        max_connections_per_host=cfg.scraper_max_connections_per_host,
+        host_scheduler=worker_pool.hosts,
+        client_sessions=worker_pool.client_sessions,
+    )
+    return Scraper(
+        urls,
+        user_agent,
+        cfg.scraper,
+        worker_pool=worker_pool,
+        http_cache=http_cache,
+        fetcher=fetcher,
+        query=query,
+        pdf_max_pages=cfg.scraper_pdf_max_pages,
+    )
+
+
 async def scrape_urls(
-    urls, cfg: Config, worker_pool: WorkerPool
+    urls, cfg: Config, worker_pool: WorkerPool, query: str | None = None
 ) -> tuple[list[dict[str, Any]], list[dict[str, Any]]]:
     """
     Scrapes the urls
     Args:
         urls: List of urls
         cfg: Config (optional)
+        query: The query the urls are scraped for (optional)
 
     Returns:
         tuple[list[dict[str, Any]], list[dict[str, Any]]]: tuple containing scraped content and images
@@ -24,14 +55,9 @@ async def scrape_urls(
     """
     scraped_data = []
     images = []
-    user_agent = (
-        cfg.user_agent
-        if cfg
-        else "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/128.0.0.0 Safari/537.36"
-    )
 
     try:
-        scraper = Scraper(urls, user_agent, cfg.scraper, worker_pool=worker_pool)
+        scraper = _get_scraper(urls, cfg, worker_pool, query)
         scraped_data = await scraper.run()
         for item in scraped_data:
             if 'image_urls' in item:
@@ -42,6 +68,28 @@ async def scrape_urls(
     return scraped_data, images
 
 
+async def iter_scrape_urls(
+    urls, cfg: Config, worker_pool: WorkerPool, query: str | None = None
+) -> AsyncIterator[dict[str, Any]]:
+    """
+    Scrapes the urls, yielding each page as soon as it is scraped
+    Args:
+        urls: List of urls
+        cfg: Config (optional)
+        query: The query the urls are scraped for (optional)
+
+    Yields:
+        dict[str, Any]: Scraped content of one url, with its images under "image_urls"
+
+    """
+    try:
+        scraper = _get_scraper(urls, cfg, worker_pool, query)
+        async for item in scraper.run_iter():
+            yield item
+    except Exception as e:
+        print(f"{Fore.RED}Error in iter_scrape_urls: {e}{Style.RESET_ALL}")
+
+
 async def filter_urls(urls: list[str], config: Config) -> list[str]:
     """
     Filter URLs based on configuration settings.
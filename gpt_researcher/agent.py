@@ -1,10 +1,11 @@
 from typing import Any, Optional
+import copy
 import json
+import weakref
 
-from .config import Config
-from .memory import Memory
 from .utils.enum import ReportSource, ReportType, Tone
 from .llm_provider import GenericLLMProvider
+from .session import ResearchSession
 from .vector_store import VectorStoreWrapper
 
 # Research skills
@@ -21,7 +22,6 @@ from .actions import (
     extract_sections,
     table_of_contents,
     get_search_results,
-    get_retrievers,
     choose_agent
 )
 
@@ -48,16 +48,25 @@ class GPTResearcher:
         parent_query: str = "",
         subtopics: list | None = None,
         visited_urls: set | None = None,
+        shared_urls: set | None = None,
         verbose: bool = True,
         context=None,
         headers: dict | None = None,
         max_subtopics: int = 5,
         log_handler=None,
-        language = "english"
+        language = "english",
+        session: ResearchSession | None = None,
     ):
         self.query = query
         self.report_type = report_type
-        self.cfg = Config(config_path)
+        # Sub-researchers pass their parent's session instead of rebuilding config, retrievers,
+        # embeddings and worker pool
+        if session is not None and config_path is not None:
+            raise ValueError("config_path can't be combined with session, which already carries a config")
+        self.session = session or ResearchSession.from_config_path(config_path, headers)
+        # A session this researcher created is closed by close(), or once the researcher is collected
+        self._session_finalizer = weakref.finalize(self, self.session.close) if session is None else None
+        self.cfg = copy.copy(self.session.cfg)
         self.cfg.language = language
         self.llm = GenericLLMProvider(self.cfg)
         self.report_source = report_source if report_source else getattr(self.cfg, 'report_source', None)
@@ -79,14 +88,15 @@ class GPTResearcher:
         self.parent_query = parent_query
         self.subtopics = subtopics or []
         self.visited_urls = visited_urls or set()
+        # Urls scraped by researchers running alongside this one (e.g. the other subtopics of a detailed
+        # report), skipped by web search so that each page is only scraped once between them
+        self.shared_urls = shared_urls
         self.verbose = verbose
         self.context = context or []
         self.headers = headers or {}
         self.research_costs = 0.0
-        self.retrievers = get_retrievers(self.headers, self.cfg)
-        self.memory = Memory(
-            self.cfg.embedding_provider, self.cfg.embedding_model, **self.cfg.embedding_kwargs
-        )
+        self.retrievers = self.session.retrievers
+        self.memory = self.session.memory
         self.log_handler = log_handler
 
         # Initialize components
@@ -287,6 +297,16 @@ class GPTResearcher:
     def set_verbose(self, verbose: bool):
         self.verbose = verbose
 
+    def close(self) -> None:
+        """Release the session's worker threads, unless the session was passed in and is shared."""
+        if self._session_finalizer is not None:
+            self._session_finalizer()
+
+    async def aclose(self) -> None:
+        """Same as `close`, also closing the session's HTTP connections. Use it from async code."""
+        if self._session_finalizer is not None and self._session_finalizer.detach():
+            await self.session.aclose()
+
     def add_costs(self, cost: float) -> None:
         if not isinstance(cost, (float, int)):
             raise ValueError("Cost must be an integer or float")
@@ -26,9 +26,41 @@ class BaseConfig(TypedDict):
     AGENT_ROLE: Union[str, None]
     SCRAPER: str
     MAX_SCRAPER_WORKERS: int
+    SCRAPER_MAX_CONNECTIONS: int
+    SCRAPER_MAX_CONNECTIONS_PER_HOST: int
+    SCRAPER_MAX_PAGE_SIZE_MB: int
+    SCRAPER_PARSE_PROCESSES: int
+    SCRAPER_PDF_MAX_PAGES: int
+    SCRAPER_HOST_CONCURRENCY: int
+    SCRAPER_HOST_DELAY: float
+    SCRAPER_RESPECT_ROBOTS: bool
     MAX_SUBTOPICS: int
+    SUBTOPIC_CONCURRENCY: int
     REPORT_SOURCE: Union[str, None]
     DOC_PATH: str
+    DOC_INDEX: bool
     DEEP_RESEARCH_CONCURRENCY: int
     DEEP_RESEARCH_DEPTH: int
     DEEP_RESEARCH_BREADTH: int
+    DEEP_RESEARCH_MAX_QUERIES: int
+    DEEP_RESEARCH_TIME_LIMIT: int
+    DEEP_RESEARCH_COST_LIMIT: float
+    CACHE_DIR: str
+    EMBEDDING_CACHE: str
+    EMBEDDING_CACHE_SIZE: int
+    HTTP_CACHE: str
+    HTTP_CACHE_TTL: int
+    HTTP_CACHE_MAX_SIZE_MB: int
+    RETRIEVER_TIMEOUT: int
+    SEARCH_CACHE: str
+    SEARCH_CACHE_TTL: int
+    SEARCH_CACHE_NEGATIVE_TTL: int
+    SEARCH_CACHE_URL: str
+    LLM_CACHE: str
+    LLM_CACHE_TTL: int
+    LLM_CACHE_SIZE: int
+    LLM_CACHE_SIMILARITY: float
+    LLM_CACHE_URL: str
+    LLM_REQUESTS_PER_MINUTE: int
+    LLM_TOKENS_PER_MINUTE: int
+    LLM_MAX_CONCURRENCY: int
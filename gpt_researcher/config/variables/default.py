@@ -23,12 +23,45 @@ DEFAULT_CONFIG: BaseConfig = {
     "AGENT_ROLE": None,
     "SCRAPER": "bs",
     "MAX_SCRAPER_WORKERS": 15,
+    "SCRAPER_MAX_CONNECTIONS": 100,
+    "SCRAPER_MAX_CONNECTIONS_PER_HOST": 6,
+    "SCRAPER_MAX_PAGE_SIZE_MB": 10,
+    "SCRAPER_PARSE_PROCESSES": 0,
+    "SCRAPER_PDF_MAX_PAGES": 10,
+    "SCRAPER_HOST_CONCURRENCY": 2,
+    "SCRAPER_HOST_DELAY": 0.0,
+    "SCRAPER_RESPECT_ROBOTS": False,
     "MAX_SUBTOPICS": 3,
+    "SUBTOPIC_CONCURRENCY": 1,
     "LANGUAGE": "english",
     "REPORT_SOURCE": "web",
     "DOC_PATH": "./my-docs",
+    "DOC_INDEX": True,
     # Deep research specific settings
     "DEEP_RESEARCH_BREADTH": 3,
     "DEEP_RESEARCH_DEPTH": 2,
     "DEEP_RESEARCH_CONCURRENCY": 4,
+    "DEEP_RESEARCH_MAX_QUERIES": 0,
+    "DEEP_RESEARCH_TIME_LIMIT": 0,
+    "DEEP_RESEARCH_COST_LIMIT": 0.0,
+    # Cache settings
+    "CACHE_DIR": "./cache",
+    "EMBEDDING_CACHE": "memory",
+    "EMBEDDING_CACHE_SIZE": 10000,
+    "HTTP_CACHE": "none",
+    "HTTP_CACHE_TTL": 3600,
+    "HTTP_CACHE_MAX_SIZE_MB": 512,
+    "RETRIEVER_TIMEOUT": 15,
+    "SEARCH_CACHE": "none",
+    "SEARCH_CACHE_TTL": 3600,
+    "SEARCH_CACHE_NEGATIVE_TTL": 60,
+    "SEARCH_CACHE_URL": "",
+    "LLM_CACHE": "none",
+    "LLM_CACHE_TTL": 86400,
+    "LLM_CACHE_SIZE": 1000,
+    "LLM_CACHE_SIMILARITY": 0.0,
+    "LLM_CACHE_URL": "",
+    "LLM_REQUESTS_PER_MINUTE": 0,
+    "LLM_TOKENS_PER_MINUTE": 0,
+    "LLM_MAX_CONCURRENCY": 0,
 }
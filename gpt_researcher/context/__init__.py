@@ -1,4 +1,5 @@
 from .compression import ContextCompressor
+from .chunk_index import ChunkIndex
 from .retriever import SearchAPIRetriever
 
-__all__ = ['ContextCompressor', 'SearchAPIRetriever']
+__all__ = ['ContextCompressor', 'ChunkIndex', 'SearchAPIRetriever']
@@ -0,0 +1,139 @@
+import asyncio
+import hashlib
+from typing import Dict, List
+
+import numpy as np
+from langchain.schema import Document
+from langchain.text_splitter import RecursiveCharacterTextSplitter
+
+from .similarity import normalize, top_k_similar
+
+
+class ChunkIndex:
+    """
+    Chunks and embeds scraped pages once per research run.
+
+    Every sub-query of a run searches the same index, so each page is split and embedded
+    a single time and a sub-query only costs one query embedding plus a vectorized
+    cosine top-k over the chunks of the pages it was given.
+    """
+
+    def __init__(self, embeddings, chunk_size: int = 1000, chunk_overlap: int = 100):
+        self.embeddings = embeddings
+        self.splitter = RecursiveCharacterTextSplitter(chunk_size=chunk_size, chunk_overlap=chunk_overlap)
+        self.chunks: List[Document] = []
+        self.page_rows: Dict[str, range] = {}
+        self._blocks: List[np.ndarray] = []
+        self._matrix: np.ndarray | None = None
+        self._pending: Dict[str, asyncio.Future] = {}
+
+    @staticmethod
+    def page_key(page: dict) -> str:
+        # Local documents share a url across pages, so the content is part of the key
+        return hashlib.sha1(
+            f"{page.get('url', '')}\0{page.get('raw_content', '')}".encode("utf-8")
+        ).hexdigest()
+
+    @property
+    def matrix(self) -> np.ndarray:
+        """Row-normalized float32 matrix of all chunk embeddings."""
+        if self._matrix is None:
+            self._matrix = np.vstack(self._blocks) if self._blocks else np.empty((0, 0), dtype=np.float32)
+        return self._matrix
+
+    async def add_pages(self, pages: List[dict]) -> List[Document]:
+        """
+        Split and embed the pages that are not indexed yet.
+
+        Args:
+            pages (List[dict]): Scraped pages with "url", "raw_content" and "title" keys.
+
+        Returns:
+            List[Document]: The newly indexed chunks, empty if every page was already indexed.
+        """
+        new_pages: Dict[str, dict] = {}
+        in_flight = []
+        for page in pages:
+            key = self.page_key(page)
+            if key in self.page_rows or key in new_pages:
+                continue
+            if key in self._pending:
+                in_flight.append(self._pending[key])
+                continue
+            new_pages[key] = page
+
+        new_chunks: List[Document] = []
+        if new_pages:
+            done = asyncio.get_running_loop().create_future()
+            for key in new_pages:
+                self._pending[key] = done
+            try:
+                page_chunks = {
+                    key: self.splitter.split_documents([
+                        Document(
+                            page_content=page.get("raw_content") or "",
+                            metadata={"title": page.get("title", ""), "source": page.get("url", "")},
+                        )
+                    ])
+                    for key, page in new_pages.items()
+                }
+                new_chunks = [chunk for chunks in page_chunks.values() for chunk in chunks]
+                if new_chunks:
+                    vectors = await self.embeddings.aembed_documents([chunk.page_content for chunk in new_chunks])
+                    self._append(normalize(vectors))
+
+                start = len(self.chunks)
+                for key, chunks in page_chunks.items():
+                    self.page_rows[key] = range(start, start + len(chunks))
+                    start += len(chunks)
+                self.chunks.extend(new_chunks)
+            finally:
+                for key in new_pages:
+                    self._pending.pop(key, None)
+                # Waiters re-check page_rows, so a failed batch is simply missing from their search
+                done.set_result(None)
+
+        if in_flight:
+            await asyncio.gather(*in_flight)
+        return new_chunks
+
+    async def search(self, query: str, pages: List[dict], k: int = 10, threshold: float = 0.0) -> List[Document]:
+        """
+        Find the chunks of `pages` most similar to `query`.
+
+        Args:
+            query (str): The sub-query to match.
+            pages (List[dict]): Restricts the search to chunks of these (already indexed) pages.
+            k (int): Maximum number of chunks to return.
+            threshold (float): Minimum cosine similarity for a chunk to be returned.
+
+        Returns:
+            List[Document]: Matching chunks ordered by decreasing similarity.
+        """
+        rows = np.fromiter(
+            {
+                row
+                for page in pages
+                for row in self.page_rows.get(self.page_key(page), ())
+            },
+            dtype=np.int64,
+        )
+        if not rows.size:
+            return []
+        rows.sort()
+
+        query_vectors = normalize([await self.embeddings.aembed_query(query)])
+        (matches,) = top_k_similar(query_vectors, self.matrix[rows], k, threshold)
+        return [self.chunks[rows[row]] for row, _ in matches]
+
+    async def async_get_context(self, query: str, pages: List[dict], max_results: int = 10, threshold: float = 0.0) -> str:
+        relevant_docs = await self.search(query, pages, k=max_results, threshold=threshold)
+        return "\n".join(f"Source: {d.metadata.get('source')}\n"
+                         f"Title: {d.metadata.get('title')}\n"
+                         f"Content: {d.page_content}\n"
+                         for d in relevant_docs)
+
+    def _append(self, block: np.ndarray) -> None:
+        self._blocks.append(block)
+        self._matrix = None
+
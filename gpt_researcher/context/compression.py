@@ -1,17 +1,11 @@
 import os
-import asyncio
-from typing import Optional
-from .retriever import SearchAPIRetriever, SectionRetriever
-from langchain.retrievers import (
-    ContextualCompressionRetriever,
-)
-from langchain.retrievers.document_compressors import (
-    DocumentCompressorPipeline,
-    EmbeddingsFilter,
-)
+from typing import List, Optional
+from langchain.schema import Document
 from langchain.text_splitter import RecursiveCharacterTextSplitter
+from .retriever import SearchAPIRetriever, SectionRetriever
+from .similarity import SimilarityFilter
 from ..vector_store import VectorStoreWrapper
-from ..utils.costs import estimate_embedding_cost
+from ..utils.costs import aestimate_embedding_cost
 from ..memory.embeddings import OPENAI_EMBEDDING_MODEL
 
 
@@ -36,27 +30,27 @@ class VectorstoreCompressor:
 
 
 class ContextCompressor:
-    def __init__(self, documents, embeddings, max_results=5, **kwargs):
+    def __init__(
+        self,
+        documents,
+        embeddings,
+        max_results=5,
+        embedding_model: str = OPENAI_EMBEDDING_MODEL,
+        embedding_provider: str | None = None,
+        **kwargs,
+    ):
         self.max_results = max_results
         self.documents = documents
         self.kwargs = kwargs
         self.embeddings = embeddings
-        self.similarity_threshold = os.environ.get("SIMILARITY_THRESHOLD", 0.35)
+        # The model and provider behind `embeddings`, to estimate the cost of embedding the documents
+        self.embedding_model = embedding_model
+        self.embedding_provider = embedding_provider
+        self.similarity_threshold = float(os.environ.get("SIMILARITY_THRESHOLD", 0.35))
 
-    def __get_contextual_retriever(self):
+    def __split_documents(self, query) -> List[Document]:
         splitter = RecursiveCharacterTextSplitter(chunk_size=1000, chunk_overlap=100)
-        relevance_filter = EmbeddingsFilter(embeddings=self.embeddings,
-                                            similarity_threshold=self.similarity_threshold)
-        pipeline_compressor = DocumentCompressorPipeline(
-            transformers=[splitter, relevance_filter]
-        )
-        base_retriever = SearchAPIRetriever(
-            pages=self.documents
-        )
-        contextual_retriever = ContextualCompressionRetriever(
-            base_compressor=pipeline_compressor, base_retriever=base_retriever
-        )
-        return contextual_retriever
+        return splitter.split_documents(SearchAPIRetriever(pages=self.documents).invoke(query))
 
     def __pretty_print_docs(self, docs, top_n):
         return f"\n".join(f"Source: {d.metadata.get('source')}\n"
@@ -65,41 +59,51 @@ class ContextCompressor:
                           for i, d in enumerate(docs) if i < top_n)
 
     async def async_get_context(self, query, max_results=5, cost_callback=None):
-        compressed_docs = self.__get_contextual_retriever()
+        relevance_filter = SimilarityFilter(self.embeddings, self.similarity_threshold)
         if cost_callback:
-            cost_callback(estimate_embedding_cost(model=OPENAI_EMBEDDING_MODEL, docs=self.documents))
-        relevant_docs = await asyncio.to_thread(compressed_docs.invoke, query)
-        return self.__pretty_print_docs(relevant_docs, max_results)
+            cost_callback(await aestimate_embedding_cost(
+                model=self.embedding_model, docs=self.documents, provider=self.embedding_provider
+            ))
+        (matches,) = await relevance_filter.afilter([query], self.__split_documents(query), k=max_results)
+        return self.__pretty_print_docs([doc for doc, _ in matches], max_results)
 
 
 class WrittenContentCompressor:
-    def __init__(self, documents, embeddings, similarity_threshold, **kwargs):
+    def __init__(
+        self,
+        documents,
+        embeddings,
+        similarity_threshold,
+        embedding_model: str = OPENAI_EMBEDDING_MODEL,
+        embedding_provider: str | None = None,
+        **kwargs,
+    ):
         self.documents = documents
         self.kwargs = kwargs
         self.embeddings = embeddings
         self.similarity_threshold = similarity_threshold
+        self.embedding_model = embedding_model
+        self.embedding_provider = embedding_provider
 
-    def __get_contextual_retriever(self):
+    def __split_documents(self, query) -> List[Document]:
         splitter = RecursiveCharacterTextSplitter(chunk_size=1000, chunk_overlap=100)
-        relevance_filter = EmbeddingsFilter(embeddings=self.embeddings,
-                                            similarity_threshold=self.similarity_threshold)
-        pipeline_compressor = DocumentCompressorPipeline(
-            transformers=[splitter, relevance_filter]
-        )
-        base_retriever = SectionRetriever(
-            sections=self.documents
-        )
-        contextual_retriever = ContextualCompressionRetriever(
-            base_compressor=pipeline_compressor, base_retriever=base_retriever
-        )
-        return contextual_retriever
+        return splitter.split_documents(SectionRetriever(sections=self.documents).invoke(query))
 
     def __pretty_docs_list(self, docs, top_n):
         return [f"Title: {d.metadata.get('section_title')}\nContent: {d.page_content}\n" for i, d in enumerate(docs) if i < top_n]
 
     async def async_get_context(self, query, max_results=5, cost_callback=None):
-        compressed_docs = self.__get_contextual_retriever()
+        (context,) = await self.async_get_contexts([query], max_results, cost_callback)
+        return context
+
+    async def async_get_contexts(self, queries, max_results=5, cost_callback=None):
+        """Get the relevant written contents for several queries, embedding the sections only once"""
+        if not queries:
+            return []
+        relevance_filter = SimilarityFilter(self.embeddings, self.similarity_threshold)
         if cost_callback:
-            cost_callback(estimate_embedding_cost(model=OPENAI_EMBEDDING_MODEL, docs=self.documents))
-        relevant_docs = await asyncio.to_thread(compressed_docs.invoke, query)
-        return self.__pretty_docs_list(relevant_docs, max_results)
+            cost_callback(await aestimate_embedding_cost(
+                model=self.embedding_model, docs=self.documents, provider=self.embedding_provider
+            ))
+        matches = await relevance_filter.afilter(queries, self.__split_documents(queries[0]), k=max_results)
+        return [self.__pretty_docs_list([doc for doc, _ in query_matches], max_results) for query_matches in matches]
@@ -0,0 +1,94 @@
+import asyncio
+from typing import List, Tuple
+
+import numpy as np
+from langchain.schema import Document
+
+
+def normalize(vectors: np.ndarray) -> np.ndarray:
+    """L2-normalize each row so that dot products are cosine similarities."""
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+def top_k_similar(
+    query_vectors: np.ndarray,
+    chunk_vectors: np.ndarray,
+    k: int,
+    threshold: float = 0.0,
+) -> List[List[Tuple[int, float]]]:
+    """
+    Score every query against every chunk with a single matrix multiply.
+
+    Args:
+        query_vectors (np.ndarray): Normalized (queries x dim) float32 matrix.
+        chunk_vectors (np.ndarray): Normalized (chunks x dim) float32 matrix.
+        k (int): Maximum number of chunks to keep per query.
+        threshold (float): Minimum cosine similarity for a chunk to be kept.
+
+    Returns:
+        List[List[Tuple[int, float]]]: For each query, (chunk row, score) pairs ordered by decreasing score.
+    """
+    n_chunks = chunk_vectors.shape[0]
+    if not n_chunks or not len(query_vectors) or k <= 0:
+        return [[] for _ in range(len(query_vectors))]
+
+    scores = query_vectors @ chunk_vectors.T
+    if k < n_chunks:
+        candidates = np.argpartition(-scores, k, axis=1)[:, :k]
+    else:
+        candidates = np.broadcast_to(np.arange(n_chunks), scores.shape)
+    candidate_scores = np.take_along_axis(scores, candidates, axis=1)
+    order = np.argsort(-candidate_scores, axis=1, kind="stable")
+    candidates = np.take_along_axis(candidates, order, axis=1)
+    candidate_scores = np.take_along_axis(candidate_scores, order, axis=1)
+
+    results = []
+    for rows, row_scores in zip(candidates, candidate_scores):
+        keep = row_scores >= threshold
+        results.append(list(zip(rows[keep].tolist(), row_scores[keep].tolist())))
+    return results
+
+
+class SimilarityFilter:
+    """
+    Batched replacement for langchain's EmbeddingsFilter.
+
+    Embeds the documents once, embeds every query, and keeps the top-k documents per query
+    whose cosine similarity reaches the threshold.
+    """
+
+    def __init__(self, embeddings, similarity_threshold: float = 0.0, k: int = 20):
+        self.embeddings = embeddings
+        self.similarity_threshold = float(similarity_threshold)
+        self.k = k
+
+    async def embed_queries(self, queries: List[str]) -> np.ndarray:
+        vectors = await asyncio.gather(*[self.embeddings.aembed_query(query) for query in queries])
+        return normalize(vectors)
+
+    async def afilter(
+        self, queries: List[str], documents: List[Document], k: int | None = None
+    ) -> List[List[Tuple[Document, float]]]:
+        """
+        Args:
+            queries (List[str]): Queries to match against the documents.
+            documents (List[Document]): Candidate chunks.
+            k (int, optional): Overrides the number of documents kept per query.
+
+        Returns:
+            List[List[Tuple[Document, float]]]: For each query, matching documents with their scores.
+        """
+        if not documents or not queries:
+            return [[] for _ in queries]
+
+        chunk_vectors, query_vectors = await asyncio.gather(
+            self.embeddings.aembed_documents([doc.page_content for doc in documents]),
+            self.embed_queries(queries),
+        )
+        matches = await asyncio.to_thread(
+            top_k_similar, query_vectors, normalize(chunk_vectors), k or self.k, self.similarity_threshold
+        )
+        return [[(documents[row], score) for row, score in query_matches] for query_matches in matches]
@@ -1,8 +1,8 @@
 import asyncio
 import os
+from concurrent.futures import Executor
 from typing import List, Union
 from langchain_community.document_loaders import (
-    PyMuPDFLoader,
     TextLoader,
     UnstructuredCSVLoader,
     UnstructuredExcelLoader,
@@ -11,16 +11,36 @@ from langchain_community.document_loaders import (
     UnstructuredWordDocumentLoader
 )
 from langchain_community.document_loaders import BSHTMLLoader
+from langchain_core.documents import Document
+
+from ..scraper.pymupdf.extraction import extract_pdf
+from .index import LocalDocumentIndex
 
 
 class DocumentLoader:
 
-    def __init__(self, path: Union[str, List[str]]):
+    def __init__(
+        self,
+        path: Union[str, List[str]],
+        parse_executor: Executor | None = None,
+        index: LocalDocumentIndex | None = None,
+    ):
+        """
+        Args:
+            path: A directory to load recursively, or a list of files.
+            parse_executor: Optional process pool to extract large PDFs in parallel.
+            index: Optional persistent index, so only new and changed files of a directory are parsed.
+        """
         self.path = path
+        self.parse_executor = parse_executor
+        self.index = index
 
     async def load(self) -> list:
         tasks = []
-        if isinstance(self.path, list):
+        if isinstance(self.path, (str, os.PathLike)) and self.index is not None:
+            tasks.append(self.index.load(self.path, self._load_file))
+
+        elif isinstance(self.path, list):
             for file_path in self.path:
                 if os.path.isfile(file_path):  # Ensure it's a valid file
                     filename = os.path.basename(file_path)
@@ -60,11 +80,17 @@ class DocumentLoader:
 
         return docs
 
+    async def _load_file(self, file_path: str) -> list:
+        file_extension = os.path.splitext(file_path)[1].strip(".").lower()
+        return await self._load_document(file_path, file_extension)
+
     async def _load_document(self, file_path: str, file_extension: str) -> list:
+        if file_extension == "pdf":
+            return await asyncio.to_thread(self._load_pdf, file_path)
+
         ret_data = []
         try:
             loader_dict = {
-                "pdf": PyMuPDFLoader(file_path),
                 "txt": TextLoader(file_path),
                 "doc": UnstructuredWordDocumentLoader(file_path),
                 "docx": UnstructuredWordDocumentLoader(file_path),
@@ -90,3 +116,20 @@ class DocumentLoader:
             print(e)
 
         return ret_data
+
+    def _load_pdf(self, file_path: str) -> list:
+        """Load every page of a PDF as a document"""
+        try:
+            content = extract_pdf(file_path, max_pages=None, executor=self.parse_executor)
+        except Exception as e:
+            print(f"Failed to load document : {file_path}")
+            print(e)
+            return []
+
+        return [
+            Document(
+                page_content=page.text,
+                metadata={"source": file_path, "page": page.number, "total_pages": content.page_count, "title": content.title},
+            )
+            for page in content.pages
+        ]
@@ -0,0 +1,193 @@
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+from typing import Awaitable, Callable, Dict, List, Tuple
+
+from langchain_core.documents import Document
+
+logger = logging.getLogger(__name__)
+
+HASH_BLOCK_SIZE = 1024 * 1024
+
+Parser = Callable[[str], Awaitable[List[Document]]]
+
+
+class LocalDocumentIndex:
+    """
+    Persistent index of the local documents researched with `DOC_PATH`.
+
+    Every file is recorded with its path, modification time, size and content hash, and
+    the text extracted from it is stored under the hash. A file whose modification time
+    and size are unchanged is served from the index without being read; otherwise it is
+    hashed, and only parsed again when its content actually changed. Files that were
+    removed are dropped from the index, along with their text once no file refers to it.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS files ("
+            "path TEXT PRIMARY KEY, mtime_ns INTEGER NOT NULL, size INTEGER NOT NULL, digest TEXT NOT NULL)"
+        )
+        self._conn.execute("CREATE TABLE IF NOT EXISTS documents (digest TEXT PRIMARY KEY, pages TEXT NOT NULL)")
+        self.stats = {"reused": 0, "parsed": 0, "removed": 0}
+
+    async def load(self, root: str, parse: Parser) -> List[Document]:
+        """
+        Load every file under `root`, parsing only the new and changed ones.
+
+        Args:
+            root: The directory to load recursively.
+            parse: Coroutine function extracting the pages of a file, e.g. DocumentLoader's loader.
+
+        Returns:
+            List[Document]: The pages of every file, with the file path as "source".
+        """
+        root = os.path.abspath(root)
+        found = await asyncio.to_thread(_walk, root)
+        known = await asyncio.to_thread(self._files_under, root)
+
+        digests: Dict[str, str] = {}
+        changed: List[Tuple[str, int, int]] = []
+        for path, mtime_ns, size in found:
+            entry = known.get(path)
+            if entry is not None and entry[:2] == (mtime_ns, size):
+                digests[path] = entry[2]
+            else:
+                changed.append((path, mtime_ns, size))
+
+        if changed:
+            hashed = await asyncio.gather(*(asyncio.to_thread(file_digest, path) for path, _, _ in changed))
+            await asyncio.to_thread(self._record_files, [
+                (path, mtime_ns, size, digest) for (path, mtime_ns, size), digest in zip(changed, hashed)
+            ])
+            digests.update((path, digest) for (path, _, _), digest in zip(changed, hashed))
+
+        removed = [path for path in known if path not in digests]
+        if removed:
+            await asyncio.to_thread(self._remove_files, removed)
+
+        stored = await asyncio.to_thread(self._get_documents, set(digests.values()))
+        to_parse = {digest: path for path, digest in digests.items() if digest not in stored}
+        if to_parse:
+            results = await asyncio.gather(*(parse(path) for path in to_parse.values()))
+            parsed = {digest: pages for digest, pages in zip(to_parse, results) if pages}
+            # Files that yielded nothing (unsupported, or failed to load) are tried again next time
+            await asyncio.to_thread(self._store_documents, parsed)
+            stored.update(parsed)
+
+        self.stats["parsed"] += len(to_parse)
+        self.stats["reused"] += len(digests) - len(to_parse)
+        self.stats["removed"] += len(removed)
+        logger.info(
+            f"Local document index: {len(digests) - len(to_parse)} files unchanged, "
+            f"{len(to_parse)} parsed, {len(removed)} removed"
+        )
+
+        return [
+            Document(page_content=page.page_content, metadata={**page.metadata, "source": path})
+            for path, digest in sorted(digests.items())
+            for page in stored.get(digest, ())
+        ]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM files")
+            self._conn.execute("DELETE FROM documents")
+
+    def _files_under(self, root: str) -> Dict[str, Tuple[int, int, str]]:
+        prefix = os.path.join(root, "")
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT path, mtime_ns, size, digest FROM files WHERE substr(path, 1, ?) = ?",
+                (len(prefix), prefix),
+            ).fetchall()
+        return {path: (mtime_ns, size, digest) for path, mtime_ns, size, digest in rows}
+
+    def _record_files(self, rows: List[Tuple[str, int, int, str]]) -> None:
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO files (path, mtime_ns, size, digest) VALUES (?, ?, ?, ?)", rows
+            )
+            self._remove_orphans()
+
+    def _remove_files(self, paths: List[str]) -> None:
+        with self._lock:
+            self._conn.executemany("DELETE FROM files WHERE path = ?", [(path,) for path in paths])
+            self._remove_orphans()
+
+    def _remove_orphans(self) -> None:
+        self._conn.execute("DELETE FROM documents WHERE digest NOT IN (SELECT digest FROM files)")
+
+    def _get_documents(self, digests: set[str]) -> Dict[str, List[Document]]:
+        with self._lock:
+            rows = [
+                row
+                for digest in digests
+                for row in self._conn.execute("SELECT digest, pages FROM documents WHERE digest = ?", (digest,))
+            ]
+        return {
+            digest: [Document(page_content=page["content"], metadata=page["metadata"]) for page in json.loads(pages)]
+            for digest, pages in rows
+        }
+
+    def _store_documents(self, documents: Dict[str, List[Document]]) -> None:
+        rows = [
+            (digest, json.dumps(
+                [{"content": page.page_content, "metadata": page.metadata} for page in pages], default=str
+            ))
+            for digest, pages in documents.items()
+        ]
+        with self._lock:
+            self._conn.executemany("INSERT OR REPLACE INTO documents (digest, pages) VALUES (?, ?)", rows)
+
+
+def file_digest(path: str) -> str:
+    sha256 = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(HASH_BLOCK_SIZE), b""):
+            sha256.update(block)
+    return sha256.hexdigest()
+
+
+def _walk(root: str) -> List[Tuple[str, int, int]]:
+    files = []
+    for directory, _, names in os.walk(root):
+        for name in names:
+            path = os.path.join(directory, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            files.append((path, stat.st_mtime_ns, stat.st_size))
+    return files
+
+
+_INDEXES: Dict[str, LocalDocumentIndex] = {}
+_INDEXES_LOCK = threading.Lock()
+
+
+def get_document_index(cfg) -> LocalDocumentIndex | None:
+    """Get the process-wide local document index described by the config, or None when it is disabled."""
+    if not cfg.doc_index:
+        return None
+    path = os.path.abspath(os.path.join(cfg.cache_dir, "documents.sqlite"))
+    with _INDEXES_LOCK:
+        index = _INDEXES.get(path)
+        if index is None:
+            try:
+                index = LocalDocumentIndex(path)
+            except (OSError, sqlite3.Error) as e:
+                logger.warning(f"Local document index unavailable, documents will be parsed on every run: {e}")
+                return None
+            _INDEXES[path] = index
+        return index
@@ -10,12 +10,15 @@ from langchain_community.document_loaders import (
     UnstructuredPowerPointLoader,
     UnstructuredWordDocumentLoader
 )
+from ..scraper.fetcher import AsyncFetcher, ClientSessions
+from ..scraper.http_cache import HTTPCache
 
 
 class OnlineDocumentLoader:
 
-    def __init__(self, urls):
+    def __init__(self, urls, http_cache: HTTPCache | None = None, client_sessions: ClientSessions | None = None):
         self.urls = urls
+        self.fetcher = AsyncFetcher("Mozilla/5.0", http_cache=http_cache, timeout=6, client_sessions=client_sessions)
 
     async def load(self) -> list:
         docs = []
@@ -35,21 +38,15 @@ class OnlineDocumentLoader:
 
     async def _download_and_process(self, url: str) -> list:
         try:
-            headers = {
-                "User-Agent": "Mozilla/5.0"
-            }
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, headers=headers, timeout=6) as response:
-                    if response.status != 200:
-                        print(f"Failed to download {url}: HTTP {response.status}")
-                        return []
+            content = await self._fetch(url)
+            if content is None:
+                return []
 
-                    content = await response.read()
-                    with tempfile.NamedTemporaryFile(delete=False, suffix=self._get_extension(url)) as tmp_file:
-                        tmp_file.write(content)
-                        tmp_file_path = tmp_file.name
+            with tempfile.NamedTemporaryFile(delete=False, suffix=self._get_extension(url)) as tmp_file:
+                tmp_file.write(content)
+                tmp_file_path = tmp_file.name
 
-                    return await self._load_document(tmp_file_path, self._get_extension(url).strip('.'))
+            return await self._load_document(tmp_file_path, self._get_extension(url).strip('.'))
         except aiohttp.ClientError as e:
             print(f"Failed to process {url}")
             print(e)
@@ -59,6 +56,13 @@ class OnlineDocumentLoader:
             print(e)
             return []
 
+    async def _fetch(self, url: str) -> bytes | None:
+        response = await self.fetcher.fetch(url)
+        if response.status != 200:
+            print(f"Failed to download {url}: HTTP {response.status}")
+            return None
+        return response.content
+
     async def _load_document(self, file_path: str, file_extension: str) -> list:
         ret_data = []
         try:
@@ -6,6 +6,8 @@ from colorama import Fore, Style, init
 import os
 from enum import Enum
 
+from ..resilience import StreamInterruptedError
+
 _SUPPORTED_PROVIDERS = {
     "openai",
     "anthropic",
@@ -189,33 +191,60 @@ class GenericLLMProvider:
 
 
     async def get_chat_response(self, messages, stream, websocket=None):
+        response, _ = await self.get_chat_response_with_usage(messages, stream, websocket)
+        return response
+
+    async def get_chat_response_with_usage(self, messages, stream, websocket=None):
+        """
+        Like get_chat_response, also returning the token usage reported by the provider
+        (a dict with `input_tokens` and `output_tokens`), or None when it reports none.
+        """
         if not stream:
             # Getting output from the model chain using ainvoke for asynchronous invoking
             output = await self.llm.ainvoke(messages)
 
-            return output.content
+            return output.content, getattr(output, "usage_metadata", None)
 
         else:
-            return await self.stream_response(messages, websocket)
+            return await self.stream_response_with_usage(messages, websocket)
 
     async def stream_response(self, messages, websocket=None):
+        response, _ = await self.stream_response_with_usage(messages, websocket)
+        return response
+
+    async def stream_response_with_usage(self, messages, websocket=None):
         paragraph = ""
         response = ""
+        usage = None
+        sent = False
 
         # Streaming the response using the chain astream method from langchain
-        async for chunk in self.llm.astream(messages):
-            content = chunk.content
-            if content is not None:
-                response += content
-                paragraph += content
-                if "\n" in paragraph:
-                    await self._send_output(paragraph, websocket)
-                    paragraph = ""
+        try:
+            async for chunk in self.llm.astream(messages):
+                content = chunk.content
+                if content is not None:
+                    response += content
+                    paragraph += content
+                    if "\n" in paragraph:
+                        await self._send_output(paragraph, websocket)
+                        sent = True
+                        paragraph = ""
+                # Providers report usage on some chunks, e.g. input tokens first and output tokens last
+                chunk_usage = getattr(chunk, "usage_metadata", None)
+                if chunk_usage:
+                    usage = {
+                        key: (usage or {}).get(key, 0) + chunk_usage.get(key, 0)
+                        for key in ("input_tokens", "output_tokens", "total_tokens")
+                    }
+        except Exception as e:
+            if sent:
+                raise StreamInterruptedError(f"Response stream failed after output was sent: {e}") from e
+            raise
 
         if paragraph:
             await self._send_output(paragraph, websocket)
 
-        return response
+        return response, usage
 
     async def _send_output(self, content, websocket=None):
         if websocket is not None:
@@ -224,7 +253,12 @@ class GenericLLMProvider:
             print(f"{Fore.GREEN}{content}{Style.RESET_ALL}")
 
 
+_CHECKED_PKGS: set[str] = set()
+
+
 def _check_pkg(pkg: str) -> None:
+    if pkg in _CHECKED_PKGS:
+        return
     if not importlib.util.find_spec(pkg):
         pkg_kebab = pkg.replace("_", "-")
         # Import colorama and initialize it
@@ -243,3 +277,4 @@ def _check_pkg(pkg: str) -> None:
                 Fore.RED + f"Failed to install {pkg_kebab}. Please install manually with "
                 f"`pip install -U {pkg_kebab}`"
             )
+    _CHECKED_PKGS.add(pkg)
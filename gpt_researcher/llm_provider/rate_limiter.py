@@ -0,0 +1,157 @@
+import asyncio
+import threading
+import time
+from contextlib import asynccontextmanager
+from enum import IntEnum
+
+# How often a waiting call re-checks the budget, at most
+POLL_INTERVAL = 0.05
+
+
+class Priority(IntEnum):
+    """Rate limiter lanes. A call only proceeds when no call of a higher priority is waiting."""
+    HIGH = 0  # report writing
+    NORMAL = 1
+    LOW = 2  # planning: agent choice, sub-queries, subtopics
+
+
+class TokenBucket:
+    """Refills `per_minute` units per minute, holding at most a minute's worth."""
+
+    def __init__(self, per_minute: float):
+        self.capacity = per_minute
+        self.rate = per_minute / 60
+        self.available = per_minute
+        self.updated = time.monotonic()
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds until `amount` units are available, 0 if they are now."""
+        now = time.monotonic()
+        self.available = min(self.capacity, self.available + (now - self.updated) * self.rate)
+        self.updated = now
+        # A single request larger than the bucket waits for a full bucket instead of forever
+        missing = min(amount, self.capacity) - self.available
+        return max(0.0, missing / self.rate)
+
+    def take(self, amount: float) -> None:
+        self.available -= min(amount, self.capacity)
+
+    def set_rate(self, per_minute: float) -> None:
+        """Change the rate, keeping what was already taken from the bucket."""
+        self.wait_time(0)
+        self.capacity = per_minute
+        self.rate = per_minute / 60
+        self.available = min(self.available, per_minute)
+
+
+class RateLimiter:
+    """
+    Shared request, token and concurrency budget for one provider and model.
+
+    It is safe to share across threads and event loops: waiting is done by polling
+    instead of loop-bound asyncio primitives. A limit of 0 means unlimited.
+    """
+
+    def __init__(self, requests_per_minute: int = 0, tokens_per_minute: int = 0, max_concurrency: int = 0):
+        self.requests: TokenBucket | None = None
+        self.tokens: TokenBucket | None = None
+        self.max_concurrency = 0
+        self.in_flight = 0
+        self._waiting = {priority: 0 for priority in Priority}
+        self._lock = threading.Lock()
+        self.set_limits(requests_per_minute, tokens_per_minute, max_concurrency)
+
+    def set_limits(self, requests_per_minute: int = 0, tokens_per_minute: int = 0, max_concurrency: int = 0) -> None:
+        """Change the limits in place, so the calls in flight and the budget already used still count."""
+        with self._lock:
+            self.requests = _resize(self.requests, requests_per_minute)
+            self.tokens = _resize(self.tokens, tokens_per_minute)
+            self.max_concurrency = max_concurrency
+
+    @property
+    def counts_tokens(self) -> bool:
+        return self.tokens is not None
+
+    @asynccontextmanager
+    async def slot(self, tokens: int = 0, priority: Priority = Priority.NORMAL):
+        """Hold a share of the budget for the duration of one call of roughly `tokens` tokens."""
+        await self.acquire(tokens, priority)
+        try:
+            yield
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+    async def acquire(self, tokens: int = 0, priority: Priority = Priority.NORMAL) -> None:
+        with self._lock:
+            self._waiting[priority] += 1
+        try:
+            while True:
+                with self._lock:
+                    wait = self._try_acquire(tokens, priority)
+                if not wait:
+                    return
+                await asyncio.sleep(min(wait, POLL_INTERVAL))
+        finally:
+            with self._lock:
+                self._waiting[priority] -= 1
+
+    def _try_acquire(self, tokens: int, priority: Priority) -> float:
+        if any(self._waiting[lane] for lane in Priority if lane < priority):
+            return POLL_INTERVAL
+        if self.max_concurrency and self.in_flight >= self.max_concurrency:
+            return POLL_INTERVAL
+        wait = max(
+            self.requests.wait_time(1) if self.requests else 0.0,
+            self.tokens.wait_time(tokens) if self.tokens else 0.0,
+        )
+        if wait:
+            return wait
+        if self.requests:
+            self.requests.take(1)
+        if self.tokens:
+            self.tokens.take(tokens)
+        self.in_flight += 1
+        return 0.0
+
+
+def _resize(bucket: TokenBucket | None, per_minute: int) -> TokenBucket | None:
+    if not per_minute:
+        return None
+    if bucket is None:
+        return TokenBucket(per_minute)
+    bucket.set_rate(per_minute)
+    return bucket
+
+
+_LIMITS = {"requests_per_minute": 0, "tokens_per_minute": 0, "max_concurrency": 0}
+_LIMITERS: dict[str, RateLimiter] = {}
+_LOCK = threading.Lock()
+
+
+def configure_rate_limits(requests_per_minute: int = 0, tokens_per_minute: int = 0, max_concurrency: int = 0) -> None:
+    """
+    Set the budget every provider and model gets, shared by all researchers in the process.
+    Changing it updates the existing limiters in place; 0 disables a limit.
+    """
+    limits = {
+        "requests_per_minute": requests_per_minute,
+        "tokens_per_minute": tokens_per_minute,
+        "max_concurrency": max_concurrency,
+    }
+    with _LOCK:
+        if limits != _LIMITS:
+            _LIMITS.update(limits)
+            for limiter in _LIMITERS.values():
+                limiter.set_limits(**limits)
+
+
+def get_rate_limiter(key: str) -> RateLimiter | None:
+    """The process-wide limiter for a provider and model, e.g. 'openai:gpt-4o', or None when unlimited."""
+    with _LOCK:
+        if not any(_LIMITS.values()):
+            return None
+        limiter = _LIMITERS.get(key)
+        if limiter is None:
+            limiter = _LIMITERS[key] = RateLimiter(**_LIMITS)
+        return limiter
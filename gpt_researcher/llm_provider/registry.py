@@ -0,0 +1,83 @@
+import asyncio
+import inspect
+import json
+import threading
+import weakref
+from collections import OrderedDict
+from typing import Any
+
+from .generic import GenericLLMProvider
+
+# Distinct (provider, model, kwargs) combinations kept per event loop
+MAX_PROVIDERS_PER_LOOP = 32
+
+_NO_LOOP = object()
+_PROVIDERS: "weakref.WeakKeyDictionary[Any, OrderedDict[str, GenericLLMProvider]]" = weakref.WeakKeyDictionary()
+_NO_LOOP_PROVIDERS: "OrderedDict[str, GenericLLMProvider]" = OrderedDict()
+_LOCK = threading.Lock()
+
+
+def _provider_key(provider: str, kwargs: dict) -> str:
+    return json.dumps([provider, kwargs], sort_keys=True, default=repr)
+
+
+def _current_loop():
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return _NO_LOOP
+
+
+def get_provider(provider: str, **kwargs: Any) -> GenericLLMProvider:
+    """
+    Get a GenericLLMProvider for `provider` and `kwargs`, reusing an existing one when possible.
+
+    Reusing the provider keeps its HTTP client and keep-alive connections. Async clients
+    are bound to the event loop they were first used on, so providers are pooled per loop;
+    the least recently used ones are dropped beyond MAX_PROVIDERS_PER_LOOP.
+    """
+    key = _provider_key(provider, kwargs)
+    loop = _current_loop()
+    with _LOCK:
+        providers = _NO_LOOP_PROVIDERS if loop is _NO_LOOP else _PROVIDERS.setdefault(loop, OrderedDict())
+        llm_provider = providers.get(key)
+        if llm_provider is not None:
+            providers.move_to_end(key)
+            return llm_provider
+
+    # Built outside the lock: from_provider may install a missing package
+    llm_provider = GenericLLMProvider.from_provider(provider, **kwargs)
+    with _LOCK:
+        llm_provider = providers.setdefault(key, llm_provider)
+        providers.move_to_end(key)
+        while len(providers) > MAX_PROVIDERS_PER_LOOP:
+            providers.popitem(last=False)
+    return llm_provider
+
+
+async def close_providers() -> None:
+    """
+    Close the HTTP clients of the providers pooled on the current event loop and forget them.
+
+    Meant for application shutdown, e.g. a FastAPI shutdown handler.
+    """
+    with _LOCK:
+        providers = _PROVIDERS.pop(asyncio.get_running_loop(), OrderedDict())
+    for llm_provider in providers.values():
+        await _close_clients(llm_provider.llm)
+
+
+async def _close_clients(llm) -> None:
+    # langchain keeps the SDK clients under different names depending on the integration
+    for name in ("root_async_client", "async_client", "_async_client"):
+        client = getattr(llm, name, None)
+        close = getattr(client, "close", None)
+        if close is None:
+            continue
+        try:
+            result = close()
+            if inspect.isawaitable(result):
+                await result
+        except Exception:
+            pass
+        break
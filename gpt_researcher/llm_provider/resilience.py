@@ -0,0 +1,256 @@
+import asyncio
+import logging
+import random
+import threading
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable
+
+logger = logging.getLogger(__name__)
+
+# Retries of a transient error (rate limit, overload, 5xx, timeout) before failing over
+MAX_RETRIES = 3
+RETRY_BASE_DELAY = 1.0
+RETRY_MAX_DELAY = 30.0
+# Consecutive failed calls (retries exhausted, rate limits aside) after which a provider is skipped for
+# CIRCUIT_RESET_TIMEOUT seconds while there is another one to fall back to
+CIRCUIT_FAILURE_THRESHOLD = 5
+CIRCUIT_RESET_TIMEOUT = 60.0
+# A fallback is fired alongside a call that is slower than this percentile of its recent latencies
+HEDGE_PERCENTILE = 95
+HEDGE_MIN_SAMPLES = 20
+LATENCY_WINDOW = 200
+
+TRANSIENT_STATUS_CODES = {408, 409, 425, 429, 500, 502, 503, 504, 529}
+_TRANSIENT_ERROR_NAMES = (
+    "RateLimit", "Timeout", "APIConnectionError", "ServiceUnavailable", "InternalServerError", "Overloaded",
+)
+
+
+class StreamInterruptedError(RuntimeError):
+    """
+    Raised when a streamed response fails after part of it was sent to the user.
+
+    It is neither retried nor failed over, since a new attempt would send that part again.
+    """
+
+
+def _status_code(error: BaseException) -> int | None:
+    for source in (error, getattr(error, "response", None)):
+        for name in ("status_code", "http_status", "status"):
+            value = getattr(source, name, None)
+            if isinstance(value, int):
+                return value
+    return None
+
+
+def is_transient(error: BaseException) -> bool:
+    """Whether `error` is worth retrying: rate limits, overloads, server errors and timeouts."""
+    if isinstance(error, (asyncio.TimeoutError, TimeoutError, ConnectionError)):
+        return True
+    status = _status_code(error)
+    if status is not None:
+        return status in TRANSIENT_STATUS_CODES
+    return any(name in type(error).__name__ for name in _TRANSIENT_ERROR_NAMES)
+
+
+def is_rate_limit(error: BaseException) -> bool:
+    """Whether `error` asks to slow down, which says nothing about the provider's health."""
+    return _status_code(error) == 429 or "RateLimit" in type(error).__name__
+
+
+def backoff_delay(attempt: int, base_delay: float = RETRY_BASE_DELAY, max_delay: float = RETRY_MAX_DELAY) -> float:
+    """Exponential backoff with full jitter for the given zero-based retry attempt."""
+    return random.uniform(0, min(max_delay, base_delay * 2 ** attempt))
+
+
+class CircuitBreaker:
+    """
+    Stops calling a provider after repeated failed calls.
+
+    After `failure_threshold` consecutive failures the circuit opens and `allow()` returns
+    False. Once `reset_timeout` seconds have passed a single trial call is let through;
+    its success closes the circuit, its failure opens it again.
+    """
+
+    def __init__(self, failure_threshold: int = CIRCUIT_FAILURE_THRESHOLD, reset_timeout: float = CIRCUIT_RESET_TIMEOUT):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: float | None = None
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.opened_at is None:
+                return True
+            if time.monotonic() - self.opened_at < self.reset_timeout:
+                return False
+            # Half-open: let this call through and hold back the others until it finishes
+            self.opened_at = time.monotonic()
+            return True
+
+    @property
+    def closed(self) -> bool:
+        """Whether the provider is healthy, without claiming a half-open trial call like `allow()`."""
+        return self.opened_at is None
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+
+
+class LatencyTracker:
+    """Rolling window of successful call durations."""
+
+    def __init__(self, window: int = LATENCY_WINDOW):
+        self._samples = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+
+    def percentile(self, percentile: float, min_samples: int = HEDGE_MIN_SAMPLES) -> float | None:
+        """The given percentile of the recorded durations, or None with fewer than `min_samples`."""
+        with self._lock:
+            samples = sorted(self._samples)
+        if len(samples) < min_samples:
+            return None
+        return samples[min(len(samples) - 1, int(len(samples) * percentile / 100))]
+
+
+_BREAKERS: dict[str, CircuitBreaker] = {}
+_LATENCIES: dict[str, LatencyTracker] = {}
+_LOCK = threading.Lock()
+
+
+def get_circuit_breaker(key: str) -> CircuitBreaker:
+    """The process-wide circuit breaker for a provider and model, e.g. 'openai:gpt-4o'."""
+    with _LOCK:
+        return _BREAKERS.setdefault(key, CircuitBreaker())
+
+
+def get_latency_tracker(key: str) -> LatencyTracker:
+    """The process-wide latency window for a provider and model, e.g. 'openai:gpt-4o'."""
+    with _LOCK:
+        return _LATENCIES.setdefault(key, LatencyTracker())
+
+
+async def call_with_retries(
+    key: str,
+    call: Callable[[], Awaitable[Any]],
+    max_retries: int = MAX_RETRIES,
+    track_latency: bool = True,
+) -> Any:
+    """
+    Await `call()`, retrying transient errors with exponential backoff and jitter.
+
+    The outcome is recorded once on the circuit breaker for `key`: a call still failing
+    after its retries counts as one failure, unless it was rate limited. Other errors are
+    raised immediately since retrying the same request would fail the same way.
+    """
+    breaker = get_circuit_breaker(key)
+    for attempt in range(max_retries + 1):
+        start = time.monotonic()
+        try:
+            result = await call()
+        except Exception as e:
+            if not is_transient(e):
+                raise
+            if attempt == max_retries:
+                if not is_rate_limit(e):
+                    breaker.record_failure()
+                raise
+            delay = backoff_delay(attempt)
+            logger.warning(f"{key} failed with {type(e).__name__}, retrying in {delay:.1f}s")
+            await asyncio.sleep(delay)
+            continue
+        breaker.record_success()
+        if track_latency:
+            get_latency_tracker(key).record(time.monotonic() - start)
+        return result
+
+
+async def _hedged(primary: Awaitable[Any], hedge: Callable[[], Awaitable[Any]], delay: float, fired: list) -> Any:
+    tasks = [asyncio.ensure_future(primary)]
+    try:
+        done, _ = await asyncio.wait(tasks, timeout=delay)
+        if done:
+            return tasks[0].result()
+
+        fired.append(True)
+        tasks.append(asyncio.ensure_future(hedge()))
+        pending = set(tasks)
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    return task.result()
+        raise tasks[0].exception()
+    finally:
+        for task in tasks:
+            if not task.done():
+                task.cancel()
+
+
+async def call_with_failover(
+    targets: list[tuple[str, Callable[[], Awaitable[Any]]]],
+    hedge: bool = True,
+    max_retries: int = MAX_RETRIES,
+) -> Any:
+    """
+    Call the first available target, falling back to the next ones in order when it fails.
+
+    A target whose circuit is open is skipped, except the last one: with nothing left to
+    fall back to it is still called, retrying as usual, rather than failing right away.
+
+    Args:
+        targets: (key, call) pairs in order of preference, keyed by provider and model.
+        hedge: Whether to also fire the next target with a different key when a call takes
+            longer than the HEDGE_PERCENTILE of its recent latencies, taking whichever answers first.
+        max_retries: Retries of a transient error on each target before moving on.
+
+    Returns:
+        The result of the first target to succeed.
+    """
+    last_error: BaseException | None = None
+    index = 0
+    while index < len(targets):
+        key, call = targets[index]
+        index += 1
+        if index < len(targets) and not get_circuit_breaker(key).allow():
+            logger.warning(f"Skipping {key}: circuit open after repeated failures")
+            continue
+
+        attempt = call_with_retries(key, call, max_retries, track_latency=hedge)
+        delay = get_latency_tracker(key).percentile(HEDGE_PERCENTILE) if hedge else None
+        hedge_index = next(
+            (i for i in range(index, len(targets)) if targets[i][0] != key and get_circuit_breaker(targets[i][0]).closed),
+            None,
+        ) if delay is not None else None
+
+        fired = []
+        try:
+            if hedge_index is None:
+                return await attempt
+            hedge_key, hedge_call = targets[hedge_index]
+            return await _hedged(attempt, lambda: call_with_retries(hedge_key, hedge_call, max_retries), delay, fired)
+        except StreamInterruptedError:
+            raise
+        except Exception as e:
+            last_error = e
+            if fired:
+                # The hedge target has had its chance too
+                targets = targets[:hedge_index] + targets[hedge_index + 1:]
+            remaining = len(targets) - index
+            logger.warning(f"{key} failed: {e}" + (f". Falling back ({remaining} left)." if remaining else ""))
+
+    raise last_error
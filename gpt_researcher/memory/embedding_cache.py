@@ -0,0 +1,81 @@
+import asyncio
+import hashlib
+from array import array
+from typing import List
+
+from langchain_core.embeddings import Embeddings
+
+from ..utils.cache import BaseCache
+
+
+class CachedEmbeddings(Embeddings):
+    """
+    Embeddings wrapper that only sends texts it has not seen before to the underlying model.
+
+    Vectors are keyed by the embedding model namespace and a hash of the chunk text,
+    and stored as packed float32 so a shared cache stays compact.
+    """
+
+    def __init__(self, embeddings: Embeddings, cache: BaseCache, namespace: str):
+        self.embeddings = embeddings
+        self.cache = cache
+        self.namespace = namespace
+
+    def _key(self, text: str, kind: str) -> str:
+        # Queries and documents are keyed apart since some providers embed them differently
+        return hashlib.sha256(f"{self.namespace}\0{kind}\0{text}".encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def _encode(vector: List[float]) -> bytes:
+        return array("f", vector).tobytes()
+
+    @staticmethod
+    def _decode(value: bytes) -> List[float]:
+        vector = array("f")
+        vector.frombytes(value)
+        return vector.tolist()
+
+    def _lookup(self, texts: List[str], kind: str) -> tuple[list[str], dict[str, List[float]], list[str]]:
+        keys = [self._key(text, kind) for text in texts]
+        unique_keys = list(dict.fromkeys(keys))
+        found = {
+            key: self._decode(value)
+            for key, value in zip(unique_keys, self.cache.mget(unique_keys))
+            if value is not None
+        }
+        missing = list({key: text for key, text in zip(keys, texts) if key not in found}.values())
+        return keys, found, missing
+
+    def _store(self, found: dict[str, List[float]], texts: List[str], vectors: List[List[float]], kind: str) -> None:
+        items = []
+        for text, vector in zip(texts, vectors):
+            key = self._key(text, kind)
+            found[key] = vector
+            items.append((key, self._encode(vector)))
+        self.cache.mset(items)
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        keys, found, missing = self._lookup(texts, "document")
+        if missing:
+            self._store(found, missing, self.embeddings.embed_documents(missing), "document")
+        return [found[key] for key in keys]
+
+    def embed_query(self, text: str) -> List[float]:
+        keys, found, missing = self._lookup([text], "query")
+        if missing:
+            self._store(found, missing, [self.embeddings.embed_query(text)], "query")
+        return found[keys[0]]
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        keys, found, missing = await asyncio.to_thread(self._lookup, texts, "document")
+        if missing:
+            vectors = await self.embeddings.aembed_documents(missing)
+            await asyncio.to_thread(self._store, found, missing, vectors, "document")
+        return [found[key] for key in keys]
+
+    async def aembed_query(self, text: str) -> List[float]:
+        keys, found, missing = await asyncio.to_thread(self._lookup, [text], "query")
+        if missing:
+            vector = await self.embeddings.aembed_query(text)
+            await asyncio.to_thread(self._store, found, missing, [vector], "query")
+        return found[keys[0]]
@@ -1,6 +1,11 @@
+import hashlib
+import json
 import os
 from typing import Any
 
+from .embedding_cache import CachedEmbeddings
+from ..utils.cache import BaseCache
+
 OPENAI_EMBEDDING_MODEL = os.environ.get(
     "OPENAI_EMBEDDING_MODEL", "text-embedding-3-small"
 )
@@ -23,9 +28,31 @@ _SUPPORTED_PROVIDERS = {
     "bedrock",
 }
 
+# Embedding kwargs that change how vectors are requested but not the vectors themselves
+_TRANSPORT_KWARGS = {
+    "timeout", "request_timeout", "max_retries", "retry_min_seconds", "retry_max_seconds",
+    "chunk_size", "batch_size", "embed_batch_size", "show_progress_bar", "skip_empty",
+    "headers", "default_headers", "default_query", "http_client", "http_async_client",
+}
+
+
+def embeddings_cache_namespace(embedding_provider: str, model: str, embedding_kwargs: dict[str, Any]) -> str:
+    """
+    The CachedEmbeddings namespace of a provider and model, with a hash of the kwargs that
+    can change the vectors (e.g. `dimensions`). Credentials and transport settings are left out.
+    """
+    options = {
+        name: value for name, value in embedding_kwargs.items()
+        if name not in _TRANSPORT_KWARGS and not any(word in name for word in ("key", "token", "secret"))
+    }
+    if not options:
+        return f"{embedding_provider}:{model}"
+    digest = hashlib.sha256(json.dumps(options, sort_keys=True, default=str).encode("utf-8")).hexdigest()[:16]
+    return f"{embedding_provider}:{model}:{digest}"
+
 
 class Memory:
-    def __init__(self, embedding_provider: str, model: str, **embdding_kwargs: Any):
+    def __init__(self, embedding_provider: str, model: str, cache: BaseCache | None = None, **embdding_kwargs: Any):
         _embeddings = None
         match embedding_provider:
             case "custom":
@@ -115,6 +142,11 @@ class Memory:
             case _:
                 raise Exception("Embedding not found.")
 
+        if cache is not None:
+            _embeddings = CachedEmbeddings(
+                _embeddings, cache, namespace=embeddings_cache_namespace(embedding_provider, model, embdding_kwargs)
+            )
+
         self._embeddings = _embeddings
 
     def get_embeddings(self):
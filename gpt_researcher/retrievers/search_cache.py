@@ -0,0 +1,99 @@
+import hashlib
+import json
+import logging
+
+from ..utils.cache import BaseCache, get_cache
+
+logger = logging.getLogger(__name__)
+
+
+class SearchCache:
+    """
+    Caches retriever results by (retriever, query, domains, headers, search arguments).
+
+    Empty results are cached too, for `negative_ttl` seconds, so a query that yields
+    nothing is not searched again by every sub-query. Failed searches are not cached.
+    """
+
+    def __init__(self, cache: BaseCache, ttl: float = 3600, negative_ttl: float = 60):
+        self.cache = cache
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+
+    @staticmethod
+    def key(retriever_name: str, query: str, init_kwargs: dict, search_args: tuple, search_kwargs: dict) -> str:
+        # Headers carry per-request settings such as the API keys and the Google search engine,
+        # so users with different ones don't share results. The key is a hash, so they aren't stored.
+        init_kwargs = dict(init_kwargs)
+        if init_kwargs.get("query_domains"):
+            init_kwargs["query_domains"] = sorted(init_kwargs["query_domains"])
+        payload = json.dumps(
+            [retriever_name, query, init_kwargs, search_args, search_kwargs],
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> list | None:
+        value = self.cache.get(key)
+        return json.loads(value) if value is not None else None
+
+    def set(self, key: str, results: list) -> None:
+        try:
+            value = json.dumps(results).encode("utf-8")
+        except TypeError:
+            return  # custom retrievers may return objects we can't round-trip
+        self.cache.set(key, value, ttl=self.ttl if results else self.negative_ttl)
+
+
+def cached_retriever(retriever_class, search_cache: SearchCache | None):
+    """
+    Wrap a retriever class so its `search` results go through `search_cache`.
+
+    The wrapper is constructed and searched exactly like the retriever it wraps, so it can
+    be used wherever retriever classes are. Returns the class unchanged when caching is off.
+    """
+    if search_cache is None or getattr(retriever_class, "search_cache", None) is not None:
+        return retriever_class
+
+    class CachedRetriever:
+        def __init__(self, query, *args, **kwargs):
+            self.retriever = retriever_class(query, *args, **kwargs)
+            self.query = query
+            self.init_kwargs = {"args": args, **kwargs}
+
+        def search(self, *args, **kwargs):
+            key = search_cache.key(retriever_class.__name__, self.query, self.init_kwargs, args, kwargs)
+            results = search_cache.get(key)
+            if results is not None:
+                logger.info(f"Search cache hit for {retriever_class.__name__}: {self.query}")
+                return results
+
+            try:
+                results = self.retriever.search(*args, **kwargs) or []
+            except Exception as e:
+                # Not cached: the error may be a transient rate limit or timeout
+                logger.warning(f"{retriever_class.__name__} search failed for '{self.query}': {e}")
+                return []
+            search_cache.set(key, results)
+            return results
+
+        def __getattr__(self, name):
+            return getattr(self.retriever, name)
+
+    CachedRetriever.__name__ = retriever_class.__name__
+    CachedRetriever.__qualname__ = retriever_class.__qualname__
+    CachedRetriever.__doc__ = retriever_class.__doc__
+    CachedRetriever.search_cache = search_cache
+    CachedRetriever.wrapped = retriever_class
+    return CachedRetriever
+
+
+def get_search_cache(cfg) -> SearchCache | None:
+    """Get the search cache described by the config, or None when it is disabled."""
+    cache = get_cache(
+        cfg.search_cache, "search", cache_dir=cfg.cache_dir, max_entries=10000, url=cfg.search_cache_url or None
+    )
+    if cache is None:
+        return None
+    return SearchCache(cache, ttl=cfg.search_cache_ttl, negative_ttl=cfg.search_cache_negative_ttl)
@@ -1,5 +1,6 @@
 import importlib.util
 import os
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
 
 VALID_RETRIEVERS = [
     "arxiv",
@@ -40,3 +41,64 @@ def get_all_retriever_names() -> list:
         retrievers = VALID_RETRIEVERS
     
     return retrievers
+
+
+# Query parameters that only track where a click came from
+TRACKING_PARAMS = {"fbclid", "gclid", "msclkid", "ref_src", "yclid"}
+
+
+def normalize_url(url: str) -> str:
+    """
+    Reduce a URL to a key that is the same for trivially different links to one page:
+    scheme and host case, "www.", default ports, fragments, trailing slashes, tracking
+    parameters and query parameter order are ignored.
+    """
+    try:
+        parts = urlsplit(url.strip())
+        host = (parts.hostname or "").lower()
+        port = parts.port
+    except ValueError:
+        return url
+    if host.startswith("www."):
+        host = host[4:]
+    scheme = parts.scheme.lower()
+    if port and (scheme, port) not in (("http", 80), ("https", 443)):
+        host = f"{host}:{port}"
+    query = urlencode(sorted(
+        (name, value) for name, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not name.lower().startswith("utm_") and name.lower() not in TRACKING_PARAMS
+    ))
+    path = parts.path.rstrip("/") or "/"
+    # http and https usually serve the same page, so the scheme is not part of the key
+    return urlunsplit(("", host, path, query, ""))
+
+
+def reciprocal_rank_fusion(ranked_urls: list[list[str]], k: int = 60) -> list[str]:
+    """
+    Merge ranked URL lists from several retrievers into one ranking.
+
+    Each URL scores sum(1 / (k + rank)) over the lists it appears in, so pages ranked well by
+    several retrievers come first. Duplicates (by `normalize_url`) are merged, keeping the
+    first spelling seen.
+
+    Args:
+        ranked_urls (list[list[str]]): One list of URLs per retriever, best result first.
+        k (int): Damping constant from the original RRF paper; larger values flatten the ranking.
+
+    Returns:
+        list[str]: Unique URLs, best first.
+    """
+    scores: dict[str, float] = {}
+    urls: dict[str, str] = {}
+    for ranking in ranked_urls:
+        seen = set()
+        for rank, url in enumerate(ranking, start=1):
+            if not url:
+                continue
+            key = normalize_url(url)
+            if key in seen:
+                continue
+            seen.add(key)
+            urls.setdefault(key, url)
+            scores[key] = scores.get(key, 0.0) + 1.0 / (k + rank)
+    return [urls[key] for key in sorted(scores, key=scores.get, reverse=True)]
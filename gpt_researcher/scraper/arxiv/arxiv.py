@@ -1,28 +1,53 @@
-from langchain_community.retrievers import ArxivRetriever
+import re
+from urllib.parse import urlparse
+
+import arxiv
+import requests
+
+from ..pymupdf.extraction import MAX_PDF_PAGES, extract_pdf
 
 
 class ArxivScraper:
 
-    def __init__(self, link, session=None):
+    def __init__(self, link, session=None, query=None, max_pages=MAX_PDF_PAGES, parse_executor=None):
         self.link = link
         self.session = session
+        self.query = query
+        self.max_pages = max_pages
+        self.parse_executor = parse_executor
 
     def scrape(self):
         """
-        The function scrapes relevant documents from Arxiv based on a given link and returns the content
-        of the first document.
-        
+        The function looks up the Arxiv paper of a given link and extracts its PDF, parsed from
+        memory and limited to the first `max_pages` pages or the `max_pages` pages most relevant
+        to `query`.
+
         Returns:
-          The code is returning the page content of the first document retrieved by the ArxivRetriever
-        for a given query extracted from the link.
+          The text of the extracted pages, prefixed with the paper's publication date and authors,
+        no images and the paper's title.
         """
-        query = self.link.split("/")[-1]
-        retriever = ArxivRetriever(load_max_docs=2, doc_content_chars_max=None)
-        docs = retriever.invoke(query)
+        paper_id = get_paper_id(self.link)
+        # A StopIteration can't be raised into the Future this runs in, so don't let next() raise one
+        paper = next(arxiv.Client().results(arxiv.Search(id_list=[paper_id])), None) if paper_id else None
+        if paper is None:
+            print(f"No arXiv paper found at {self.link}")
+            return "", [], ""
+
+        response = (self.session or requests).get(paper.pdf_url, timeout=10)
+        response.raise_for_status()
+        content = extract_pdf(response.content, max_pages=self.max_pages, query=self.query, executor=self.parse_executor)
 
         # Include the published date and author to provide additional context, 
         # aligning with APA-style formatting in the report.
-        context = f"Published: {docs[0].metadata['Published']}; Author: {docs[0].metadata['Authors']}; Content: {docs[0].page_content}"
+        authors = ", ".join(author.name for author in paper.authors)
+        context = f"Published: {paper.published.date()}; Author: {authors}; Content: {content.text}"
         image = []
 
-        return context, image, docs[0].metadata["Title"]
+        return context, image, paper.title
+
+
+def get_paper_id(link: str) -> str:
+    """The arXiv id of an abs or pdf link, without query string, fragment or version suffix."""
+    path = urlparse(link).path.rstrip("/")
+    paper_id = path.split("/")[-1].removesuffix(".pdf")
+    return re.sub(r"v\d+$", "", paper_id)
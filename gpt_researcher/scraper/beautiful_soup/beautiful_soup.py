@@ -1,19 +1,21 @@
-from bs4 import BeautifulSoup
-from urllib.parse import urljoin
+import asyncio
 
-from ..utils import get_relevant_images, extract_title, get_text_from_soup, clean_soup
+from ..utils import parse_html, expand_images
+from ...utils.workers import run_in_executor
 
 class BeautifulSoupScraper:
 
-    def __init__(self, link, session=None):
+    def __init__(self, link, session=None, fetcher=None, parse_executor=None):
         self.link = link
         self.session = session
+        self.fetcher = fetcher
+        self.parse_executor = parse_executor
 
     def scrape(self):
         """
         This function scrapes content from a webpage by making a GET request, parsing the HTML using
         BeautifulSoup, and extracting script and style elements before returning the cleaned content.
-        
+
         Returns:
           The `scrape` method is returning the cleaned and extracted content from the webpage specified
         by the `self.link` attribute. The method fetches the webpage content, removes script and style
@@ -22,21 +24,28 @@ class BeautifulSoupScraper:
         """
         try:
             response = self.session.get(self.link, timeout=4)
-            soup = BeautifulSoup(
-                response.content, "lxml", from_encoding=response.encoding
-            )
-
-            soup = clean_soup(soup)
+            content, images, title = parse_html(response.content, self.link, response.encoding)
+            return content, expand_images(images), title
 
-            content = get_text_from_soup(soup)
+        except Exception as e:
+            print("Error! : " + str(e))
+            return "", [], ""
 
-            image_urls = get_relevant_images(soup, self.link)
-            
-            # Extract the title using the utility function
-            title = extract_title(soup)
+    async def scrape_async(self):
+        """
+        Same as `scrape`, but downloads the page on the event loop with the shared async fetcher.
+        Parsing runs in `parse_executor` (typically a process pool) or, without one, in a thread.
+        """
+        if self.fetcher is None:
+            return await asyncio.to_thread(self.scrape)
 
-            return content, image_urls, title
+        try:
+            response = await self.fetcher.fetch(self.link)
+            content, images, title = await run_in_executor(
+                self.parse_executor, parse_html, response.content, self.link, response.encoding
+            )
+            return content, expand_images(images), title
 
         except Exception as e:
             print("Error! : " + str(e))
-            return "", [], ""
\ No newline at end of file
+            return "", [], ""
@@ -1,13 +1,9 @@
 from __future__ import annotations
 
 import traceback
-import pickle
 from pathlib import Path
 from sys import platform
 import time
-import random
-import string
-import os
 
 from bs4 import BeautifulSoup
 from typing import Iterable, cast
@@ -18,6 +14,7 @@ from .processing.scrape_skills import (scrape_pdf_with_pymupdf,
 from urllib.parse import urljoin
 
 from ..utils import get_relevant_images, extract_title, get_text_from_soup, clean_soup
+from .pool import get_driver_pool
 
 FILE_DIR = Path(__file__).parent.parent
 
@@ -33,7 +30,6 @@ class BrowserScraper:
         self.driver = None
         self.use_browser_cookies = False
         self._import_selenium()  # Import only if used to avoid unnecessary dependencies
-        self.cookie_filename = f"{self._generate_random_string(8)}.pkl"
 
     def scrape(self) -> tuple:
         if not self.url:
@@ -41,22 +37,32 @@ class BrowserScraper:
             return "A URL was not specified, cancelling request to browse website.", [], ""
 
         try:
-            self.setup_driver()
-            self._visit_google_and_save_cookies()
-            self._load_saved_cookies()
-            self._add_header()
+            with get_driver_pool().lease(self._driver_key(), self._create_driver) as driver:
+                self.driver = driver
+                self._add_header()
 
-            text, image_urls, title = self.scrape_text_with_selenium()
-            return text, image_urls, title
+                text, image_urls, title = self.scrape_text_with_selenium()
+                return text, image_urls, title
         except Exception as e:
             print(f"An error occurred during scraping: {str(e)}")
             print("Full stack trace:")
             print(traceback.format_exc())
             return f"An error occurred: {str(e)}\n\nStack trace:\n{traceback.format_exc()}", [], ""
         finally:
-            if self.driver:
-                self.driver.quit()
-            self._cleanup_cookie_file()
+            self.driver = None
+
+    def _driver_key(self) -> tuple:
+        """Drivers are only shared between scrapers that would have set them up the same way"""
+        return self.selenium_web_browser, self.headless, self.user_agent, self.use_browser_cookies
+
+    def _create_driver(self):
+        """Set up a new driver for the pool, with the cookies collected by the previous ones"""
+        self.setup_driver()
+        if len(get_driver_pool().cookie_jar):
+            self._load_saved_cookies()
+        else:
+            self._visit_google_and_save_cookies()
+        return self.driver
 
     def _import_selenium(self):
         try:
@@ -119,14 +125,13 @@ class BrowserScraper:
             raise
 
     def _load_saved_cookies(self):
-        """Load saved cookies before visiting the target URL"""
-        cookie_file = Path(self.cookie_filename)
-        if cookie_file.exists():
-            cookies = pickle.load(open(self.cookie_filename, "rb"))
-            for cookie in cookies:
+        """Load the cookies shared by the pooled drivers before visiting the target URL"""
+        try:
+            self.driver.get("https://www.google.com")
+            for cookie in get_driver_pool().cookie_jar.for_domain("www.google.com"):
                 self.driver.add_cookie(cookie)
-        else:
-            print("No saved cookies found.")
+        except Exception as e:
+            print(f"Failed to load saved cookies: {str(e)}")
 
     def _load_browser_cookies(self):
         """Load cookies directly from the browser"""
@@ -149,21 +154,6 @@ class BrowserScraper:
         for cookie in cookies:
             self.driver.add_cookie({'name': cookie.name, 'value': cookie.value, 'domain': cookie.domain})
 
-    def _cleanup_cookie_file(self):
-        """Remove the cookie file"""
-        cookie_file = Path(self.cookie_filename)
-        if cookie_file.exists():
-            try:
-                os.remove(self.cookie_filename)
-            except Exception as e:
-                print(f"Failed to remove cookie file: {str(e)}")
-        else:
-            print("No cookie file found to remove.")
-
-    def _generate_random_string(self, length):
-        """Generate a random string of specified length"""
-        return "".join(random.choices(string.ascii_letters + string.digits, k=length))
-
     def _get_domain(self):
         """Extract domain from URL"""
         from urllib.parse import urlparse
@@ -178,9 +168,8 @@ class BrowserScraper:
             self.driver.get("https://www.google.com")
             time.sleep(2)  # Wait for cookies to be set
 
-            # Save cookies to a file
-            cookies = self.driver.get_cookies()
-            pickle.dump(cookies, open(self.cookie_filename, "wb"))
+            # Share the cookies with the other pooled drivers
+            get_driver_pool().cookie_jar.update(self.driver.get_cookies())
 
             # print("Google cookies saved successfully.")
         except Exception as e:
@@ -1,23 +1,55 @@
-from contextlib import asynccontextmanager
 from pathlib import Path
+import atexit
+import os
 import random
+import signal
+import threading
 import traceback
 from urllib.parse import urlparse
 from bs4 import BeautifulSoup
-from typing import Dict, cast, Tuple, List
+from typing import cast, Dict, Tuple, List
 import requests
 import asyncio
 import logging
 
 from ..utils import get_relevant_images, extract_title, get_text_from_soup, clean_soup
+from .pool import (
+    BROWSER_IDLE_TIMEOUT,
+    MAX_BROWSER_MEMORY_MB,
+    MAX_PAGES_PER_BROWSER,
+    CookieJar,
+    process_memory_mb,
+)
+from .readiness import SCROLL_READY_TIMEOUT, ReadinessProfiles, wait_until_ready
 
 
 class NoDriverScraper:
+    """
+    Scrapes pages with zendriver browsers kept warm in a class-wide pool: up to
+    `max_browsers` browsers with at most `max_tabs_per_browser` pages each. Closed pages
+    leave their tab open for the next one, browsers are recycled after
+    `max_pages_per_browser` pages or once they use more than `max_browser_memory_mb`,
+    and are stopped after `idle_timeout` seconds without pages. Cookies are shared
+    between the browsers through `cookie_jar`.
+
+    Browsers are driven through the event loop that started them, so each loop gets its
+    own pool. The browsers of a loop that has been closed, and those left at exit, are
+    killed rather than reused.
+
+    Instead of fixed delays, pages are read as soon as their network, DOM and text have
+    settled. `readiness_profiles` learns per domain how long that takes, which bounds
+    the wait, and whether scrolling loads more content, so it can be skipped.
+    """
     logger = logging.getLogger(__name__)
     max_browsers = 3
-    browser_load_threshold = 5
-    browsers: set["NoDriverScraper.Browser"] = set()
-    browsers_lock = asyncio.Lock()
+    max_tabs_per_browser = 5
+    max_pages_per_browser = MAX_PAGES_PER_BROWSER
+    max_browser_memory_mb = MAX_BROWSER_MEMORY_MB
+    idle_timeout = BROWSER_IDLE_TIMEOUT
+    pools: Dict[asyncio.AbstractEventLoop, "NoDriverScraper.LoopPool"] = {}
+    pools_lock = threading.Lock()
+    cookie_jar = CookieJar()
+    readiness_profiles = ReadinessProfiles()
 
     @staticmethod
     def get_domain(url: str) -> str:
@@ -27,6 +59,37 @@ class NoDriverScraper:
             domain = ".".join(parts[-2:])
         return domain
 
+    class LoopPool:
+        def __init__(self):
+            self.browsers: set["NoDriverScraper.Browser"] = set()
+            self.browser_available = asyncio.Condition(asyncio.Lock())
+
+    @classmethod
+    def get_pool(cls) -> "NoDriverScraper.LoopPool":
+        """The browser pool of the running event loop"""
+        loop = asyncio.get_running_loop()
+        with cls.pools_lock:
+            pool = cls.pools.get(loop)
+            if pool is None:
+                for closed in [other for other in cls.pools if other.is_closed()]:
+                    cls.kill_browsers(cls.pools.pop(closed))
+                pool = cls.pools[loop] = cls.LoopPool()
+            return pool
+
+    @classmethod
+    def kill_browsers(cls, pool: "NoDriverScraper.LoopPool"):
+        """Kill the browser processes of a pool whose event loop can't stop them anymore"""
+        for browser in pool.browsers:
+            browser.kill()
+        pool.browsers.clear()
+
+    @classmethod
+    def kill_all_browsers(cls):
+        with cls.pools_lock:
+            for pool in cls.pools.values():
+                cls.kill_browsers(pool)
+            cls.pools.clear()
+
     class Browser:
         def __init__(
             self,
@@ -35,28 +98,41 @@ class NoDriverScraper:
             self.driver = driver
             self.processing_count = 0
             self.has_blank_page = True
-            self.allowed_requests_times = {}
-            self.domain_semaphores: Dict[str, asyncio.Semaphore] = {}
             self.tab_mode = True
             self.max_scroll_percent = 500
             self.stopping = False
+            self.idle_tabs: List["zendriver.Tab"] = []
+            self.pages_served = 0
+            self.retiring = False
+            self.idle_timer: asyncio.TimerHandle | None = None
+            self.idle_task: asyncio.Task | None = None
+            self.broken = False
 
         async def get(self, url: str) -> "zendriver.Tab":
-            self.processing_count += 1
-            try:
-                async with self.rate_limit_for_domain(url):
-                    new_window = not self.has_blank_page
-                    self.has_blank_page = False
-                    if self.tab_mode:
-                        return await self.driver.get(url, new_tab=new_window)
-                    else:
-                        return await self.driver.get(url, new_window=new_window)
-            except Exception:
-                self.processing_count -= 1
-                raise
-
-        async def scroll_page_to_bottom(self, page: "zendriver.Tab"):
+            # Per-host limits and delays are applied by the caller's worker pool (see HostScheduler)
+            self.pages_served += 1
+            if self.idle_tabs:
+                page = self.idle_tabs.pop()
+                try:
+                    return await page.get(url)
+                except Exception as e:
+                    self.record_error(e)
+                    await self._close_tab(page)
+                    raise
+            new_window = not self.has_blank_page
+            self.has_blank_page = False
+            if self.tab_mode:
+                return await self.driver.get(url, new_tab=new_window)
+            else:
+                return await self.driver.get(url, new_window=new_window)
+
+        async def scroll_page_to_bottom(self, page: "zendriver.Tab", text_length: int = 0) -> float:
+            """
+            Scroll down to the bottom of the page, waiting for lazily loaded content after each
+            step. Returns the fraction of text added by scrolling, relative to `text_length`.
+            """
             total_scroll_percent = 0
+            final_length = text_length
             while True:
                 # in tab mode, we need to bring the tab to front before scrolling to load the page content properly
                 if self.tab_mode:
@@ -64,8 +140,8 @@ class NoDriverScraper:
                 scroll_percent = random.randrange(46, 97)
                 total_scroll_percent += scroll_percent
                 await page.scroll_down(scroll_percent)
-                await page.wait(2)
-                await page.sleep(random.uniform(0.23, 0.56))
+                state = await wait_until_ready(page, timeout=SCROLL_READY_TIMEOUT)
+                final_length = state.get("textLength") or final_length
 
                 if total_scroll_percent >= self.max_scroll_percent:
                     break
@@ -77,88 +153,197 @@ class NoDriverScraper:
                     ),
                 ):
                     break
+            return max(final_length - text_length, 0) / max(text_length, 1)
 
         async def close_page(self, page: "zendriver.Tab"):
+            """Keep the tab for the next page, unless enough tabs are kept or the browser is being recycled"""
+            if not self.retiring and len(self.idle_tabs) < NoDriverScraper.max_tabs_per_browser:
+                try:
+                    await page.get("about:blank")
+                    self.idle_tabs.append(page)
+                    return
+                except Exception as e:
+                    NoDriverScraper.logger.debug(f"Failed to reset tab, closing it: {str(e)}")
+            await self._close_tab(page)
+
+        async def _close_tab(self, page: "zendriver.Tab"):
             try:
                 await page.close()
-            finally:
-                self.processing_count -= 1
+            except Exception as e:
+                NoDriverScraper.logger.warning(f"Failed to close tab: {str(e)}")
 
-        @asynccontextmanager
-        async def rate_limit_for_domain(self, url: str):
-            semaphore = None
-            try:
-                domain = NoDriverScraper.get_domain(url)
+        def healthy(self) -> bool:
+            if self.stopping or self.broken or getattr(self.driver, "stopped", False):
+                return False
+            return not getattr(getattr(self.driver, "connection", None), "closed", False)
 
-                semaphore = self.domain_semaphores.get(domain)
-                if not semaphore:
-                    semaphore = asyncio.Semaphore(1)
-                    self.domain_semaphores[domain] = semaphore
+        def record_error(self, error: BaseException):
+            """Retire the browser when an error shows its DevTools connection is gone"""
+            if is_connection_error(error):
+                self.broken = True
+
+        def kill(self):
+            self.cancel_idle_stop()
+            process = getattr(self.driver, "_process", None)
+            pid = getattr(process, "pid", None)
+            if pid:
+                try:
+                    os.kill(pid, signal.SIGTERM)
+                except OSError:
+                    pass
 
-                was_locked = semaphore.locked()
-                async with semaphore:
-                    if was_locked:
-                        await asyncio.sleep(random.uniform(0.6, 1.2))
-                    yield
+        def needs_recycling(self) -> bool:
+            if self.pages_served >= NoDriverScraper.max_pages_per_browser:
+                return True
+            process = getattr(self.driver, "_process", None)
+            memory = process_memory_mb(getattr(process, "pid", None))
+            return memory is not None and memory > NoDriverScraper.max_browser_memory_mb
+
+        async def load_cookies(self, jar: CookieJar):
+            cookies = jar.all()
+            if not cookies:
+                return
+            try:
+                await self.driver.cookies.set_all([
+                    zendriver.cdp.network.CookieParam(
+                        name=cookie["name"],
+                        value=cookie["value"],
+                        domain=cookie.get("domain"),
+                        path=cookie.get("path"),
+                        secure=cookie.get("secure"),
+                        http_only=cookie.get("httpOnly"),
+                    )
+                    for cookie in cookies
+                ])
+            except Exception as e:
+                NoDriverScraper.logger.warning(f"Failed to load shared cookies: {str(e)}")
 
+        async def save_cookies(self, jar: CookieJar):
+            try:
+                cookies = await self.driver.cookies.get_all()
             except Exception as e:
-                # Log error but don't block the request
-                NoDriverScraper.logger.warning(
-                    f"Rate limiting error for {url}: {str(e)}"
-                )
+                NoDriverScraper.logger.warning(f"Failed to save cookies: {str(e)}")
+                return
+            jar.update([
+                {
+                    "name": cookie.name,
+                    "value": cookie.value,
+                    "domain": cookie.domain,
+                    "path": cookie.path,
+                    "secure": cookie.secure,
+                    "httpOnly": cookie.http_only,
+                }
+                for cookie in cookies
+            ])
+
+        def cancel_idle_stop(self):
+            if self.idle_timer:
+                self.idle_timer.cancel()
+                self.idle_timer = None
 
         async def stop(self):
             if self.stopping:
                 return
             self.stopping = True
+            self.cancel_idle_stop()
+            if not getattr(self.driver, "stopped", False):
+                await self.save_cookies(NoDriverScraper.cookie_jar)
             await self.driver.stop()
 
     @classmethod
-    async def get_browser(cls, headless: bool = False) -> "NoDriverScraper.Browser":
-        async def create_browser():
-            try:
-                global zendriver
-                import zendriver
-            except ImportError:
-                raise ImportError(
-                    "The zendriver package is required to use NoDriverScraper. "
-                    "Please install it with: pip install zendriver"
-                )
-
-            config = zendriver.Config(
-                headless=headless,
-                browser_connection_timeout=3,
+    async def start_driver(cls, headless: bool = False) -> "zendriver.Browser":
+        try:
+            global zendriver
+            import zendriver
+        except ImportError:
+            raise ImportError(
+                "The zendriver package is required to use NoDriverScraper. "
+                "Please install it with: pip install zendriver"
             )
-            driver = await zendriver.start(config)
-            browser = cls.Browser(driver)
-            cls.browsers.add(browser)
-            return browser
 
-        async with cls.browsers_lock:
-            if len(cls.browsers) == 0:
-                # No browsers available, create new one
-                return await create_browser()
+        config = zendriver.Config(
+            headless=headless,
+            browser_connection_timeout=3,
+        )
+        return await zendriver.start(config)
 
-            # Load balancing: Get browser with lowest number of tabs
-            browser = min(cls.browsers, key=lambda b: b.processing_count)
+    @classmethod
+    async def get_browser(cls, headless: bool = False) -> "NoDriverScraper.Browser":
+        """
+        Lease a page slot on the least loaded pooled browser. A new browser is started once
+        every browser has `max_tabs_per_browser` pages open; when the pool is full too,
+        wait for a slot. Release it with `release_browser`.
+        """
+        pool = cls.get_pool()
+        async with pool.browser_available:
+            while True:
+                for browser in [b for b in pool.browsers if not b.healthy()]:
+                    pool.browsers.discard(browser)
+                    await cls._stop_browser(browser)
 
-            # If all browsers are heavily loaded and we can create more
-            if (
-                browser.processing_count >= cls.browser_load_threshold
-                and len(cls.browsers) < cls.max_browsers
-            ):
-                return await create_browser()
+                available = [
+                    b for b in pool.browsers
+                    if not b.retiring and b.processing_count < cls.max_tabs_per_browser
+                ]
+                if available:
+                    # Load balancing: Get browser with lowest number of tabs
+                    browser = min(available, key=lambda b: b.processing_count)
+                    break
+                if len(pool.browsers) < cls.max_browsers:
+                    browser = cls.Browser(await cls.start_driver(headless))
+                    await browser.load_cookies(cls.cookie_jar)
+                    pool.browsers.add(browser)
+                    break
+                await pool.browser_available.wait()
 
+            browser.cancel_idle_stop()
+            browser.processing_count += 1
             return browser
 
     @classmethod
     async def release_browser(cls, browser: Browser):
-        async with cls.browsers_lock:
-            if browser and browser.processing_count <= 0:
-                try:
-                    await browser.stop()
-                finally:
-                    cls.browsers.discard(browser)
+        """
+        Give back a slot leased with `get_browser`. Browsers left without pages stay warm
+        for `idle_timeout` seconds, or are stopped right away when due for recycling.
+        """
+        pool = cls.get_pool()
+        async with pool.browser_available:
+            browser.processing_count -= 1
+            if not browser.retiring and (not browser.healthy() or browser.needs_recycling()):
+                browser.retiring = True
+            if browser.processing_count <= 0:
+                if browser.retiring:
+                    pool.browsers.discard(browser)
+                    await cls._stop_browser(browser)
+                else:
+                    cls._schedule_idle_stop(browser)
+            pool.browser_available.notify_all()
+
+    @classmethod
+    def _schedule_idle_stop(cls, browser: Browser):
+        loop = asyncio.get_running_loop()
+
+        def stop_if_idle():
+            browser.idle_task = loop.create_task(cls._stop_if_idle(browser))
+
+        browser.cancel_idle_stop()
+        browser.idle_timer = loop.call_later(cls.idle_timeout, stop_if_idle)
+
+    @classmethod
+    async def _stop_if_idle(cls, browser: Browser):
+        pool = cls.get_pool()
+        async with pool.browser_available:
+            if browser.processing_count <= 0 and browser in pool.browsers:
+                pool.browsers.discard(browser)
+                await cls._stop_browser(browser)
+                pool.browser_available.notify_all()
+
+    @classmethod
+    async def _stop_browser(cls, browser: Browser):
+        try:
+            await browser.stop()
+        except Exception as e:
+            cls.logger.warning(f"Failed to stop browser: {str(e)}")
 
     def __init__(self, url: str, session: requests.Session | None = None):
         self.url = url
@@ -184,11 +369,15 @@ class NoDriverScraper:
                 return str(e), [], ""
 
             page = await browser.get(self.url)
-            await page.wait(2)
-            await page.sleep(random.uniform(1, 2.3))
-            await page.wait(random.uniform(2, 3))
+            domain = NoDriverScraper.get_domain(self.url)
+            readiness = self.readiness_profiles.get(domain)
+            state = await wait_until_ready(page, timeout=readiness.timeout())
+
+            scroll_gain = None
+            if readiness.should_scroll():
+                scroll_gain = await browser.scroll_page_to_bottom(page, state.get("textLength") or 0)
+            self.readiness_profiles.record(domain, state["elapsed"], scroll_gain)
 
-            await browser.scroll_page_to_bottom(page)
             html = await page.get_content()
             soup = BeautifulSoup(html, "lxml")
             clean_soup(soup)
@@ -215,6 +404,8 @@ class NoDriverScraper:
 
             return text, image_urls, title
         except Exception as e:
+            if browser:
+                browser.record_error(e)
             self.logger.error(
                 f"An error occurred during scraping: {str(e)}\n"
                 "Full stack trace:\n"
@@ -226,3 +417,13 @@ class NoDriverScraper:
                 await browser.close_page(page)
             if browser:
                 await self.release_browser(browser)
+
+
+def is_connection_error(error: BaseException) -> bool:
+    """Whether `error` means the browser's DevTools connection was lost, e.g. a closed websocket"""
+    if isinstance(error, (ConnectionError, EOFError)):
+        return True
+    return any(name in type(error).__name__ for name in ("ConnectionClosed", "ConnectionError", "InvalidState"))
+
+
+atexit.register(NoDriverScraper.kill_all_browsers)
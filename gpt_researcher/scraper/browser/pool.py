@@ -0,0 +1,209 @@
+import atexit
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Hashable, Iterator, List
+
+logger = logging.getLogger(__name__)
+
+# Browsers are recycled after serving this many pages or growing past this much memory
+MAX_PAGES_PER_BROWSER = 100
+MAX_BROWSER_MEMORY_MB = 2048
+# Idle browsers are stopped after this many seconds
+BROWSER_IDLE_TIMEOUT = 300
+
+
+class CookieJar:
+    """
+    Cookies shared by the pooled browsers, so a fresh browser starts with the cookies
+    collected by the ones before it. Cookies are stored in Selenium's dict format
+    (`name`, `value`, `domain`, `path`, `secure`, `httpOnly`, `expiry`).
+    """
+
+    def __init__(self):
+        self._cookies: Dict[tuple, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def update(self, cookies: List[Dict[str, Any]]) -> None:
+        with self._lock:
+            for cookie in cookies:
+                self._cookies[(cookie["name"], cookie.get("domain"), cookie.get("path", "/"))] = dict(cookie)
+
+    def all(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [dict(cookie) for cookie in self._cookies.values()]
+
+    def for_domain(self, domain: str) -> List[Dict[str, Any]]:
+        """Cookies that a page on `domain` would receive."""
+        return [
+            cookie for cookie in self.all()
+            if not cookie.get("domain")
+            or domain == cookie["domain"].lstrip(".")
+            or domain.endswith("." + cookie["domain"].lstrip("."))
+        ]
+
+    def __len__(self) -> int:
+        return len(self._cookies)
+
+
+def process_memory_mb(pid: int | None) -> float | None:
+    """Resident memory of a process and its children, or None when it can't be measured."""
+    if not pid:
+        return None
+    try:
+        import psutil
+    except ImportError:
+        return None
+    try:
+        process = psutil.Process(pid)
+        processes = [process, *process.children(recursive=True)]
+        return sum(p.memory_info().rss for p in processes) / (1024 * 1024)
+    except psutil.Error:
+        return None
+
+
+class PooledDriver:
+    def __init__(self, driver: Any, key: Hashable):
+        self.driver = driver
+        self.key = key
+        self.pages = 0
+        self.last_used = time.monotonic()
+
+
+class DriverPool:
+    """
+    Warm Selenium drivers shared by BrowserScraper instances. Each driver is leased to a
+    single scrape at a time, checked for health before being handed out and quit after
+    `max_pages` pages, once its browser uses more than `max_memory_mb`, or after sitting
+    idle for `idle_timeout` seconds.
+    """
+
+    def __init__(
+        self,
+        max_drivers: int = 3,
+        max_pages: int = MAX_PAGES_PER_BROWSER,
+        max_memory_mb: float = MAX_BROWSER_MEMORY_MB,
+        idle_timeout: float = BROWSER_IDLE_TIMEOUT,
+    ):
+        self.max_drivers = max_drivers
+        self.max_pages = max_pages
+        self.max_memory_mb = max_memory_mb
+        self.idle_timeout = idle_timeout
+        self.cookie_jar = CookieJar()
+        self._idle: List[PooledDriver] = []
+        self._count = 0
+        self._cond = threading.Condition()
+
+    @contextmanager
+    def lease(self, key: Hashable, create: Callable[[], Any]) -> Iterator[Any]:
+        """Lease a driver created with `create` for drivers of the same `key` (browser, options, ...)."""
+        pooled = self._acquire(key, create)
+        try:
+            yield pooled.driver
+        finally:
+            self._release(pooled)
+
+    def _acquire(self, key: Hashable, create: Callable[[], Any]) -> PooledDriver:
+        while True:
+            stale: List[PooledDriver] = []
+            with self._cond:
+                while True:
+                    stale.extend(self._take_expired())
+                    pooled = next((p for p in reversed(self._idle) if p.key == key), None)
+                    if pooled is not None:
+                        self._idle.remove(pooled)
+                        break
+                    if self._count < self.max_drivers:
+                        self._count += 1
+                        break
+                    if self._idle:
+                        # Make room by retiring an idle driver of another kind
+                        stale.append(self._idle.pop(0))
+                        self._count -= 1
+                        continue
+                    self._cond.wait()
+            for old in stale:
+                _quit(old.driver)
+
+            if pooled is None:
+                try:
+                    return PooledDriver(create(), key)
+                except Exception:
+                    with self._cond:
+                        self._count -= 1
+                        self._cond.notify()
+                    raise
+            if _is_healthy(pooled.driver):
+                return pooled
+            logger.info("Replacing an unresponsive browser driver")
+            self._retire(pooled)
+
+    def _release(self, pooled: PooledDriver) -> None:
+        pooled.pages += 1
+        pooled.last_used = time.monotonic()
+        memory = process_memory_mb(_driver_pid(pooled.driver))
+        if pooled.pages >= self.max_pages or (memory is not None and memory > self.max_memory_mb):
+            self._retire(pooled)
+            return
+        with self._cond:
+            self._idle.append(pooled)
+            self._cond.notify()
+
+    def _retire(self, pooled: PooledDriver) -> None:
+        _quit(pooled.driver)
+        with self._cond:
+            self._count -= 1
+            self._cond.notify()
+
+    def _take_expired(self) -> List[PooledDriver]:
+        """Remove the drivers idle for longer than `idle_timeout`. Must hold the lock."""
+        now = time.monotonic()
+        expired = [p for p in self._idle if now - p.last_used > self.idle_timeout]
+        for pooled in expired:
+            self._idle.remove(pooled)
+            self._count -= 1
+        return expired
+
+    def close(self) -> None:
+        """Quit the idle drivers; drivers still leased are quit when returned."""
+        with self._cond:
+            idle, self._idle = self._idle, []
+            self._count -= len(idle)
+            self.max_pages = 0
+        for pooled in idle:
+            _quit(pooled.driver)
+
+
+def _is_healthy(driver: Any) -> bool:
+    try:
+        driver.current_url
+        return True
+    except Exception:
+        return False
+
+
+def _driver_pid(driver: Any) -> int | None:
+    process = getattr(getattr(driver, "service", None), "process", None)
+    return getattr(process, "pid", None)
+
+
+def _quit(driver: Any) -> None:
+    try:
+        driver.quit()
+    except Exception as e:
+        logger.warning(f"Failed to quit browser driver: {e}")
+
+
+_DRIVER_POOL: DriverPool | None = None
+_DRIVER_POOL_LOCK = threading.Lock()
+
+
+def get_driver_pool() -> DriverPool:
+    """Get the Selenium driver pool shared by every scrape in this process."""
+    global _DRIVER_POOL
+    with _DRIVER_POOL_LOCK:
+        if _DRIVER_POOL is None:
+            _DRIVER_POOL = DriverPool()
+            atexit.register(_DRIVER_POOL.close)
+        return _DRIVER_POOL
@@ -1,6 +1,8 @@
-from langchain_community.document_loaders import PyMuPDFLoader
+import requests
 from langchain_community.retrievers import ArxivRetriever
 
+from ...pymupdf.extraction import extract_pdf
+
 
 def scrape_pdf_with_pymupdf(url) -> str:
     """Scrape a pdf with pymupdf
@@ -11,9 +13,9 @@ def scrape_pdf_with_pymupdf(url) -> str:
     Returns:
         str: The text scraped from the pdf
     """
-    loader = PyMuPDFLoader(url)
-    doc = loader.load()
-    return str(doc)
+    response = requests.get(url, timeout=10)
+    response.raise_for_status()
+    return extract_pdf(response.content).text
 
 
 def scrape_pdf_with_arxiv(query) -> str:
@@ -0,0 +1,133 @@
+import asyncio
+import json
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict
+
+# How often the page is polled, and how long it must be free of DOM mutations and
+# finished network requests, with an unchanged text length, to count as ready
+POLL_INTERVAL = 0.25
+QUIET_PERIOD = 0.5
+# Bounds of the time waited for a page to become ready
+MIN_READY_TIMEOUT = 2.0
+MAX_READY_TIMEOUT = 10.0
+# Time waited for lazily loaded content after each scroll
+SCROLL_READY_TIMEOUT = 2.0
+# Scrolling is skipped on domains where it added less than this fraction of text,
+# except on every SCROLL_RECHECK_INTERVAL-th page
+MIN_SCROLL_GAIN = 0.05
+SCROLL_RECHECK_INTERVAL = 10
+
+# Installs a MutationObserver on first call and reports what the page is doing
+READINESS_JS = """
+(() => {
+    if (!window.__gptrReadiness) {
+        window.__gptrReadiness = {lastMutation: performance.now()};
+        try {
+            new MutationObserver(() => { window.__gptrReadiness.lastMutation = performance.now(); })
+                .observe(document, {childList: true, subtree: true, characterData: true});
+        } catch (e) {}
+    }
+    let lastResponse = 0;
+    for (const entry of performance.getEntriesByType('resource')) {
+        lastResponse = Math.max(lastResponse, entry.responseEnd || entry.startTime);
+    }
+    const now = performance.now();
+    return JSON.stringify({
+        readyState: document.readyState,
+        textLength: document.body ? document.body.textContent.length : 0,
+        sinceMutation: (now - window.__gptrReadiness.lastMutation) / 1000,
+        sinceResponse: (now - lastResponse) / 1000,
+    });
+})()
+"""
+
+
+async def read_page_state(page: "zendriver.Tab") -> Dict[str, Any]:
+    return json.loads(await page.evaluate(READINESS_JS))
+
+
+async def wait_until_ready(
+    page: "zendriver.Tab",
+    timeout: float = MAX_READY_TIMEOUT,
+    quiet_period: float = QUIET_PERIOD,
+    poll_interval: float = POLL_INTERVAL,
+) -> Dict[str, Any]:
+    """
+    Wait until the page has been parsed, the network and the DOM have been quiet for
+    `quiet_period` seconds and the text length stopped changing, or `timeout` seconds.
+
+    Returns the last page state with `ready` (False on timeout) and `elapsed` seconds.
+    """
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    state: Dict[str, Any] = {}
+    last_length = None
+    while True:
+        try:
+            state = await read_page_state(page)
+        except Exception:
+            # The page may be navigating or not scriptable yet
+            state = {}
+        length = state.get("textLength")
+        ready = bool(
+            state.get("readyState") in ("interactive", "complete")
+            and length
+            and length == last_length
+            and state.get("sinceMutation", 0) >= quiet_period
+            and state.get("sinceResponse", 0) >= quiet_period
+        )
+        elapsed = loop.time() - start
+        if ready or elapsed >= timeout:
+            return {**state, "ready": ready, "elapsed": elapsed}
+        last_length = length
+        await asyncio.sleep(min(poll_interval, max(timeout - elapsed, 0)))
+
+
+@dataclass
+class DomainReadiness:
+    """What pages of a domain have needed so far; the averages are exponential moving averages."""
+    pages: int = 0
+    ready_time: float = 0.0
+    scroll_gain: float = 1.0
+    scrolled_pages: int = 0
+
+    def timeout(self) -> float:
+        """Time to wait for a page: a generous multiple of what the domain usually needs."""
+        if not self.pages:
+            return MAX_READY_TIMEOUT
+        return min(max(self.ready_time * 3, MIN_READY_TIMEOUT), MAX_READY_TIMEOUT)
+
+    def should_scroll(self) -> bool:
+        """Scroll unless scrolling hasn't been loading more content on this domain."""
+        return self.scrolled_pages < 3 or self.scroll_gain >= MIN_SCROLL_GAIN \
+            or self.pages % SCROLL_RECHECK_INTERVAL == 0
+
+
+class ReadinessProfiles:
+    """Per-domain readiness profiles learned from the pages scraped in this process."""
+
+    def __init__(self, smoothing: float = 0.3):
+        self.smoothing = smoothing
+        self._profiles: Dict[str, DomainReadiness] = {}
+        self._lock = threading.Lock()
+
+    def get(self, domain: str) -> DomainReadiness:
+        with self._lock:
+            return self._profiles.setdefault(domain, DomainReadiness())
+
+    def record(self, domain: str, ready_time: float, scroll_gain: float | None = None) -> None:
+        """Record the time a page took to be ready and, if it was scrolled, the fraction of text scrolling added."""
+        with self._lock:
+            profile = self._profiles.setdefault(domain, DomainReadiness())
+            if profile.pages:
+                profile.ready_time += self.smoothing * (ready_time - profile.ready_time)
+            else:
+                profile.ready_time = ready_time
+            profile.pages += 1
+            if scroll_gain is not None:
+                if profile.scrolled_pages:
+                    profile.scroll_gain += self.smoothing * (scroll_gain - profile.scroll_gain)
+                else:
+                    profile.scroll_gain = scroll_gain
+                profile.scrolled_pages += 1
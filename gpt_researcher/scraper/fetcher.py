@@ -0,0 +1,166 @@
+import asyncio
+import threading
+import weakref
+from dataclasses import dataclass
+
+import aiohttp
+from requests.structures import CaseInsensitiveDict
+
+from ..utils.host_scheduler import HostScheduler
+from .http_cache import HTTPCache
+
+class ClientSessions:
+    """
+    aiohttp sessions, one per event loop, each with a bounded connection pool shared by the
+    fetchers using it.
+
+    The connection pool is created on first use, so the limits of the first caller apply
+    until the session is closed with `close`.
+    """
+
+    def __init__(self):
+        self._sessions: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, aiohttp.ClientSession]" = weakref.WeakKeyDictionary()
+
+    def get(self, max_connections: int = 100, max_connections_per_host: int = 6) -> aiohttp.ClientSession:
+        """Get the session of the current event loop, creating it if needed."""
+        loop = asyncio.get_running_loop()
+        session = self._sessions.get(loop)
+        if session is None or session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=max_connections,
+                limit_per_host=max_connections_per_host,
+                ttl_dns_cache=300,
+            )
+            session = aiohttp.ClientSession(connector=connector)
+            self._sessions[loop] = session
+        return session
+
+    async def close(self) -> None:
+        """Close the session of the current event loop, if any."""
+        session = self._sessions.pop(asyncio.get_running_loop(), None)
+        if session is not None and not session.closed:
+            await session.close()
+
+
+# Used by fetchers that aren't given sessions of their own, e.g. outside of a research session
+_CLIENT_SESSIONS = ClientSessions()
+
+
+def get_client_session(max_connections: int = 100, max_connections_per_host: int = 6) -> aiohttp.ClientSession:
+    """Get the process-wide aiohttp session of the current event loop."""
+    return _CLIENT_SESSIONS.get(max_connections, max_connections_per_host)
+
+
+async def close_client_sessions() -> None:
+    """Close the process-wide aiohttp session of the current event loop, if any."""
+    await _CLIENT_SESSIONS.close()
+
+
+@dataclass
+class FetchResult:
+    url: str
+    status: int
+    headers: CaseInsensitiveDict
+    content: bytes
+    truncated: bool = False
+
+    @property
+    def encoding(self) -> str | None:
+        content_type = self.headers.get("Content-Type", "")
+        for param in content_type.split(";")[1:]:
+            name, _, value = param.strip().partition("=")
+            if name.lower() == "charset" and value:
+                return value.strip("\"'")
+        return None
+
+
+class AsyncFetcher:
+    """
+    Fetches pages on the event loop through a shared, bounded aiohttp connection pool.
+
+    Bodies are streamed and cut off after `max_bytes`, and GET responses go through the
+    optional HTTPCache the same way CachedSession does for the synchronous scrapers.
+    Response statuses are reported to the optional HostScheduler. Connections come from
+    `client_sessions`, such as those of a research session, or the process-wide ones.
+    """
+
+    def __init__(
+        self,
+        user_agent: str | None = None,
+        http_cache: HTTPCache | None = None,
+        timeout: float = 4,
+        max_bytes: int | None = None,
+        max_connections: int = 100,
+        max_connections_per_host: int = 6,
+        host_scheduler: HostScheduler | None = None,
+        client_sessions: ClientSessions | None = None,
+    ):
+        self.headers = {"User-Agent": user_agent} if user_agent else {}
+        self.http_cache = http_cache
+        self.timeout = timeout
+        self.max_bytes = max_bytes
+        self.max_connections = max_connections
+        self.max_connections_per_host = max_connections_per_host
+        self.host_scheduler = host_scheduler
+        self.client_sessions = client_sessions or _CLIENT_SESSIONS
+        self.cache_stats = {"hits": 0, "revalidated": 0, "misses": 0}
+        self._stats_lock = threading.Lock()
+
+    async def fetch(self, url: str, headers: dict | None = None, timeout: float | None = None) -> FetchResult:
+        """
+        GET `url`, serving it from the HTTP cache when possible.
+
+        Args:
+            url (str): The page to download.
+            headers (dict, optional): Extra request headers.
+            timeout (float, optional): Connect and read timeout in seconds, like requests' `timeout`.
+
+        Returns:
+            FetchResult: The response, with `truncated` set if the body exceeded `max_bytes`.
+        """
+        headers = {**self.headers, **(headers or {})}
+        entry = await asyncio.to_thread(self.http_cache.lookup, url) if self.http_cache else None
+        if entry is not None and self.http_cache.is_fresh(entry):
+            self._count("hits")
+            return FetchResult(entry.url, entry.status, CaseInsensitiveDict(entry.headers), entry.content)
+        if entry is not None:
+            headers.update(self.http_cache.conditional_headers(entry))
+
+        timeout = self.timeout if timeout is None else timeout
+        session = self.client_sessions.get(self.max_connections, self.max_connections_per_host)
+        async with session.get(
+            url,
+            headers=headers,
+            timeout=aiohttp.ClientTimeout(sock_connect=timeout, sock_read=timeout),
+        ) as response:
+            response_headers = CaseInsensitiveDict(response.headers)
+            if self.host_scheduler is not None:
+                self.host_scheduler.report(url, response.status, response_headers.get("Retry-After"))
+            if entry is not None and response.status == 304:
+                self._count("revalidated")
+                entry = await asyncio.to_thread(self.http_cache.refresh, entry, dict(response_headers))
+                return FetchResult(entry.url, entry.status, CaseInsensitiveDict(entry.headers), entry.content)
+
+            content, truncated = await self._read(response)
+
+        self._count("misses")
+        if self.http_cache and response.status == 200 and not truncated:
+            await asyncio.to_thread(self.http_cache.store, url, response.status, dict(response_headers), content)
+        return FetchResult(str(response.url), response.status, response_headers, content, truncated)
+
+    async def _read(self, response: aiohttp.ClientResponse) -> tuple[bytes, bool]:
+        if self.max_bytes is None:
+            return await response.read(), False
+
+        chunks = []
+        size = 0
+        async for chunk in response.content.iter_chunked(64 * 1024):
+            chunks.append(chunk)
+            size += len(chunk)
+            if size > self.max_bytes:
+                return b"".join(chunks)[:self.max_bytes], True
+        return b"".join(chunks), False
+
+    def _count(self, outcome: str) -> None:
+        with self._stats_lock:
+            self.cache_stats[outcome] += 1
@@ -0,0 +1,168 @@
+import hashlib
+import json
+import threading
+import time
+from dataclasses import dataclass, field
+from email.utils import formatdate
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from ..utils.cache import BaseCache, get_cache
+from ..utils.host_scheduler import HostScheduler
+
+
+@dataclass
+class CachedResponse:
+    url: str
+    status: int
+    headers: dict
+    content: bytes
+    stored_at: float = field(default_factory=time.time)
+
+    def to_response(self) -> requests.Response:
+        """Rebuild a requests.Response so scrapers can't tell a cached page from a fresh one."""
+        response = requests.Response()
+        response.url = self.url
+        response.status_code = self.status
+        response.reason = "OK"
+        response.headers = CaseInsensitiveDict(self.headers)
+        response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+        response._content = self.content
+        response._content_consumed = True
+        return response
+
+
+class HTTPCache:
+    """
+    Shared HTTP response cache for the scrapers.
+
+    Responses are stored with their headers so that, once the TTL has expired, they can be
+    revalidated with If-None-Match / If-Modified-Since instead of being downloaded again.
+    Size capping and LRU eviction are handled by the underlying cache backend.
+    """
+
+    def __init__(self, cache: BaseCache, ttl: float = 3600, max_entry_bytes: int | None = None):
+        self.cache = cache
+        self.ttl = ttl
+        self.max_entry_bytes = max_entry_bytes
+
+    @staticmethod
+    def _key(url: str) -> str:
+        return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+    def lookup(self, url: str) -> CachedResponse | None:
+        value = self.cache.get(self._key(url))
+        if value is None:
+            return None
+        meta, _, content = value.partition(b"\n")
+        meta = json.loads(meta)
+        meta["headers"] = CaseInsensitiveDict(meta["headers"])
+        return CachedResponse(content=content, **meta)
+
+    def is_fresh(self, entry: CachedResponse) -> bool:
+        return time.time() - entry.stored_at < self.ttl
+
+    @staticmethod
+    def conditional_headers(entry: CachedResponse) -> dict:
+        headers = {}
+        etag = entry.headers.get("ETag")
+        last_modified = entry.headers.get("Last-Modified")
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+        elif etag is None:
+            headers["If-Modified-Since"] = formatdate(entry.stored_at, usegmt=True)
+        return headers
+
+    def store(self, url: str, status: int, headers: dict, content: bytes) -> None:
+        headers = CaseInsensitiveDict(headers)
+        cache_control = headers.get("Cache-Control", "").lower()
+        if "no-store" in cache_control:
+            return
+        if self.max_entry_bytes and len(content) > self.max_entry_bytes:
+            return
+        self._write(CachedResponse(url=url, status=status, headers=headers, content=content))
+
+    def refresh(self, entry: CachedResponse, headers: dict) -> CachedResponse:
+        """Mark a revalidated (304) entry as fresh again, picking up any updated validators."""
+        entry.headers.update({
+            key: value for key, value in headers.items()
+            if key.lower() in ("etag", "last-modified", "cache-control", "expires", "date")
+        })
+        entry.stored_at = time.time()
+        self._write(entry)
+        return entry
+
+    def _write(self, entry: CachedResponse) -> None:
+        meta = json.dumps({
+            "url": entry.url,
+            "status": entry.status,
+            "headers": dict(entry.headers),
+            "stored_at": entry.stored_at,
+        }).encode("utf-8")
+        self.cache.set(self._key(entry.url), meta + b"\n" + entry.content)
+
+
+class CachedSession(requests.Session):
+    """
+    requests.Session that serves GET requests from an HTTPCache and counts hits and misses.
+    Response statuses are reported to the optional HostScheduler so throttling hosts are backed off.
+    """
+
+    def __init__(self, http_cache: HTTPCache | None = None, host_scheduler: HostScheduler | None = None):
+        super().__init__()
+        self.http_cache = http_cache
+        self.host_scheduler = host_scheduler
+        self.cache_stats = {"hits": 0, "revalidated": 0, "misses": 0}
+        self._stats_lock = threading.Lock()
+
+    def request(self, method, url, *args, **kwargs):
+        if self.http_cache is None or method.upper() != "GET":
+            return self._report(url, super().request(method, url, *args, **kwargs))
+
+        entry = self.http_cache.lookup(url)
+        if entry is not None and self.http_cache.is_fresh(entry):
+            self._count("hits")
+            return entry.to_response()
+
+        if entry is not None:
+            kwargs["headers"] = {**(kwargs.get("headers") or {}), **self.http_cache.conditional_headers(entry)}
+
+        response = self._report(url, super().request(method, url, *args, **kwargs))
+
+        if entry is not None and response.status_code == 304:
+            self._count("revalidated")
+            return self.http_cache.refresh(entry, response.headers).to_response()
+
+        self._count("misses")
+        if response.status_code == 200:
+            self.http_cache.store(url, response.status_code, response.headers, response.content)
+        return response
+
+    def _report(self, url: str, response: requests.Response) -> requests.Response:
+        if self.host_scheduler is not None:
+            self.host_scheduler.report(url, response.status_code, response.headers.get("Retry-After"))
+        return response
+
+    def _count(self, outcome: str) -> None:
+        with self._stats_lock:
+            self.cache_stats[outcome] += 1
+
+
+_HTTP_CACHES: dict[int, HTTPCache] = {}
+
+
+def get_http_cache(cfg) -> HTTPCache | None:
+    """Get the process-wide HTTP cache described by the config, or None when it is disabled."""
+    max_bytes = int(cfg.http_cache_max_size_mb * 1024 * 1024) if cfg.http_cache_max_size_mb else None
+    cache = get_cache(cfg.http_cache, "http", cache_dir=cfg.cache_dir, max_bytes=max_bytes)
+    if cache is None:
+        return None
+    http_cache = _HTTP_CACHES.get(id(cache))
+    if http_cache is None:
+        # Keep any single response from evicting a large share of the cache
+        http_cache = HTTPCache(cache, ttl=cfg.http_cache_ttl, max_entry_bytes=max_bytes // 10 if max_bytes else None)
+        _HTTP_CACHES[id(cache)] = http_cache
+    return http_cache
@@ -0,0 +1,127 @@
+import math
+import re
+from collections import Counter
+from concurrent.futures import Executor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from typing import List, Sequence
+
+try:
+    import pymupdf
+except ImportError:  # PyMuPDF < 1.24.3
+    import fitz as pymupdf
+
+from ...utils.workers import discard_process_pool
+
+# Pages extracted from a scraped PDF when no budget is given
+MAX_PDF_PAGES = 10
+# Pages always kept when selecting pages by relevance: title, abstract, introduction
+LEADING_PAGES = 2
+# Pages scanned for relevant ones, as a multiple of the page budget
+SCAN_FACTOR = 4
+# Documents with fewer pages to extract are extracted in the calling thread
+PARALLEL_MIN_PAGES = 24
+
+PDFSource = bytes | str
+
+
+@dataclass
+class PDFPage:
+    number: int
+    text: str
+
+
+@dataclass
+class PDFContent:
+    title: str
+    page_count: int
+    pages: List[PDFPage] = field(default_factory=list)
+
+    @property
+    def text(self) -> str:
+        return "\n\n".join(page.text for page in self.pages if page.text.strip())
+
+
+def open_pdf(source: PDFSource) -> "pymupdf.Document":
+    """Open a PDF from its bytes (without a temporary file) or from a file path."""
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return pymupdf.open(stream=source, filetype="pdf")
+    return pymupdf.open(source)
+
+
+def extract_page_texts(source: PDFSource, page_numbers: Sequence[int]) -> List[str]:
+    """Extract the text of the given pages. Runs in worker processes, so it reopens the document."""
+    with open_pdf(source) as doc:
+        return [doc[number].get_text() for number in page_numbers]
+
+
+def extract_pdf(
+    source: PDFSource,
+    max_pages: int | None = MAX_PDF_PAGES,
+    query: str | None = None,
+    executor: Executor | None = None,
+) -> PDFContent:
+    """
+    Extract the text of a PDF, page by page.
+
+    Only the pages kept are extracted. Without `query` those are the first `max_pages`
+    pages (all pages when `max_pages` is None). With a query, up to `max_pages * SCAN_FACTOR`
+    pages are scanned and the leading pages plus the ones most relevant to the query are
+    kept, in document order. Large extractions are split across the processes of `executor`.
+
+    Args:
+        source: The PDF bytes or file path.
+        max_pages: The page budget.
+        query: Text the kept pages should be relevant to.
+        executor: Optional process pool for page-level parallelism.
+    """
+    with open_pdf(source) as doc:
+        page_count = doc.page_count
+        title = (doc.metadata or {}).get("title") or ""
+        budget = page_count if max_pages is None else min(max_pages, page_count)
+        terms = _terms(query)
+        scanned = min(budget * SCAN_FACTOR, page_count) if terms else budget
+        numbers = list(range(scanned))
+        if executor is None or len(numbers) < PARALLEL_MIN_PAGES:
+            texts = [doc[number].get_text() for number in numbers]
+        else:
+            texts = None
+
+    if texts is None:
+        texts = _extract_in_parallel(source, numbers, executor)
+    pages = [PDFPage(number, text) for number, text in zip(numbers, texts)]
+    if len(pages) > budget:
+        pages = select_relevant_pages(pages, terms, budget)
+    return PDFContent(title=title, page_count=page_count, pages=pages)
+
+
+def select_relevant_pages(pages: List[PDFPage], terms: set[str], budget: int) -> List[PDFPage]:
+    """Keep the leading pages and the pages scoring best for `terms`, in document order."""
+    leading = pages[:min(LEADING_PAGES, budget)]
+    rest = sorted(pages[len(leading):], key=lambda page: _score(page.text, terms), reverse=True)
+    kept = leading + rest[:budget - len(leading)]
+    return sorted(kept, key=lambda page: page.number)
+
+
+def _extract_in_parallel(source: PDFSource, numbers: List[int], executor: Executor) -> List[str]:
+    workers = max(getattr(executor, "_max_workers", 1), 1)
+    size = math.ceil(len(numbers) / workers)
+    try:
+        futures = [
+            executor.submit(extract_page_texts, source, numbers[start:start + size])
+            for start in range(0, len(numbers), size)
+        ]
+        return [text for future in futures for text in future.result()]
+    except BrokenProcessPool:
+        # A worker died; start a new pool next time and extract these pages here
+        discard_process_pool(executor)
+        return extract_page_texts(source, numbers)
+
+
+def _terms(query: str | None) -> set[str]:
+    return {word for word in re.findall(r"\w+", (query or "").lower()) if len(word) > 2}
+
+
+def _score(text: str, terms: set[str]) -> float:
+    counts = Counter(re.findall(r"\w+", text.lower()))
+    return sum(math.log1p(counts[term]) for term in terms)
@@ -1,22 +1,27 @@
-import os
 import requests
-import tempfile
 from urllib.parse import urlparse
-from langchain_community.document_loaders import PyMuPDFLoader
+
+from .extraction import MAX_PDF_PAGES, extract_pdf
 
 
 class PyMuPDFScraper:
 
-    def __init__(self, link, session=None):
+    def __init__(self, link, session=None, query=None, max_pages=MAX_PDF_PAGES, parse_executor=None):
         """
         Initialize the scraper with a link and an optional session.
 
         Args:
           link (str): The URL or local file path of the PDF document.
           session (requests.Session, optional): An optional session for making HTTP requests.
+          query (str, optional): The research query, used to pick the most relevant pages of long documents.
+          max_pages (int, optional): The number of pages to extract.
+          parse_executor (concurrent.futures.Executor, optional): A process pool to extract large documents in parallel.
         """
         self.link = link
         self.session = session
+        self.query = query
+        self.max_pages = max_pages
+        self.parse_executor = parse_executor
 
     def is_url(self) -> bool:
         """
@@ -33,34 +38,26 @@ class PyMuPDFScraper:
 
     def scrape(self) -> str:
         """
-        The `scrape` function uses PyMuPDFLoader to load a document from the provided link (either URL or local file)
-        and returns the document as a string.
+        The `scrape` function extracts the text of the PDF at the provided link (either URL or local file).
+        Downloaded documents are parsed from memory, and only the first `max_pages` pages, or the
+        `max_pages` pages most relevant to `query`, are extracted.
 
         Returns:
-          str: A string representation of the loaded document.
+          str: The text of the extracted pages.
         """
         try:
             if self.is_url():
-                response = requests.get(self.link, timeout=5, stream=True)
+                response = (self.session or requests).get(self.link, timeout=5)
                 response.raise_for_status()
-
-                with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as temp_file:
-                    temp_filename = temp_file.name  # Get the temporary file name
-                    for chunk in response.iter_content(chunk_size=8192):
-                        temp_file.write(chunk)  # Write the downloaded content to the temporary file
-
-                loader = PyMuPDFLoader(temp_filename)
-                doc = loader.load()
-
-                os.remove(temp_filename)
+                source = response.content
             else:
-                loader = PyMuPDFLoader(self.link)
-                doc = loader.load()
+                source = self.link
+
+            content = extract_pdf(source, max_pages=self.max_pages, query=self.query, executor=self.parse_executor)
 
             # Extract the content, image (if any), and title from the document.
             image = []
-            # Retrieve the content of the first page to minimize embedding costs.
-            return doc[0].page_content, image, doc[0].metadata["title"]
+            return content.text, image, content.title
 
         except requests.exceptions.Timeout:
             print(f"Download timed out. Please check the link : {self.link}")
@@ -1,13 +1,13 @@
 import asyncio
 from colorama import Fore, init
 
-import requests
 import subprocess
 import sys
 import importlib
 import logging
 
 from gpt_researcher.utils.workers import WorkerPool
+from gpt_researcher.utils.logging_config import get_json_handler
 
 from . import (
     ArxivScraper,
@@ -19,6 +19,9 @@ from . import (
     TavilyExtract,
     FireCrawl,
 )
+from .fetcher import AsyncFetcher
+from .pymupdf.extraction import MAX_PDF_PAGES
+from .http_cache import CachedSession, HTTPCache
 
 
 class Scraper:
@@ -26,15 +29,37 @@ class Scraper:
     Scraper class to extract the content from the links
     """
 
-    def __init__(self, urls, user_agent, scraper, worker_pool: WorkerPool):
+    def __init__(
+        self,
+        urls,
+        user_agent,
+        scraper,
+        worker_pool: WorkerPool,
+        http_cache: HTTPCache | None = None,
+        fetcher: AsyncFetcher | None = None,
+        query: str | None = None,
+        pdf_max_pages: int = MAX_PDF_PAGES,
+    ):
         """
         Initialize the Scraper class.
         Args:
             urls:
+            http_cache: Optional shared HTTP cache used by the scrapers' session
+            fetcher: Optional async fetcher for scrapers that download on the event loop
+            query: Optional research query, used to pick the relevant pages of long PDFs
+            pdf_max_pages: Number of pages extracted from each PDF
         """
         self.urls = urls
-        self.session = requests.Session()
+        self.query = query
+        self.pdf_max_pages = pdf_max_pages
+        self.session = CachedSession(http_cache, host_scheduler=worker_pool.hosts)
         self.session.headers.update({"User-Agent": user_agent})
+        self.fetcher = fetcher or AsyncFetcher(
+            user_agent,
+            http_cache=http_cache,
+            host_scheduler=worker_pool.hosts,
+            client_sessions=worker_pool.client_sessions,
+        )
         self.scraper = scraper
         if self.scraper == "tavily_extract":
             self._check_pkg(self.scraper)
@@ -52,8 +77,46 @@ class Scraper:
         )
 
         res = [content for content in contents if content["raw_content"] is not None]
+        self._log_cache_stats()
         return res
 
+    async def run_iter(self):
+        """
+        Extracts the content from the links, yielding each page as soon as it is scraped
+        instead of waiting for the slowest link
+        """
+        tasks = [
+            asyncio.create_task(self.extract_data_from_url(url, self.session))
+            for url in self.urls
+        ]
+        try:
+            for task in asyncio.as_completed(tasks):
+                content = await task
+                if content["raw_content"] is not None:
+                    yield content
+        finally:
+            # The consumer may stop early; don't leave scrapes running in the background
+            for task in tasks:
+                task.cancel()
+            self._log_cache_stats()
+
+    def _log_cache_stats(self) -> None:
+        """
+        Reports the HTTP cache hits and misses of this scraping run to the research log
+        """
+        if self.session.http_cache is None:
+            return
+        stats = {
+            outcome: count + self.fetcher.cache_stats[outcome]
+            for outcome, count in self.session.cache_stats.items()
+        }
+        logging.getLogger("research").info(
+            f"HTTP cache: {stats['hits']} hits, {stats['revalidated']} revalidated, {stats['misses']} misses"
+        )
+        json_handler = get_json_handler()
+        if json_handler:
+            json_handler.log_event("http_cache", dict(stats))
+
     def _check_pkg(self, scrapper_name: str) -> None:
         """
         Checks and ensures required Python packages are available for scrapers that need
@@ -91,10 +154,18 @@ class Scraper:
         """
         Extracts the data from the link with logging
         """
-        async with self.worker_pool.throttle():
+        async with self.worker_pool.throttle(link):
             try:
                 Scraper = self.get_scraper(link)
                 scraper = Scraper(link, session)
+                if hasattr(scraper, "fetcher"):
+                    scraper.fetcher = self.fetcher
+                if hasattr(scraper, "parse_executor"):
+                    scraper.parse_executor = self.worker_pool.process_executor
+                if hasattr(scraper, "query"):
+                    scraper.query = self.query
+                if hasattr(scraper, "max_pages"):
+                    scraper.max_pages = self.pdf_max_pages
 
                 # Get scraper name
                 scraper_name = scraper.__class__.__name__
@@ -1,4 +1,5 @@
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, UnicodeDammit
+from lxml import etree, html as lxml_html
 from urllib.parse import urljoin, urlparse, parse_qs
 import logging
 import hashlib
@@ -16,26 +17,10 @@ def get_relevant_images(soup: BeautifulSoup, url: str) -> list:
         for img in all_images:
             img_src = urljoin(url, img['src'])
             if img_src.startswith(('http://', 'https://')):
-                score = 0
-                # Check for relevant classes
-                if any(cls in img.get('class', []) for cls in ['header', 'featured', 'hero', 'thumbnail', 'main', 'content']):
-                    score = 4  # Higher score
-                # Check for size attributes
-                elif img.get('width') and img.get('height'):
-                    width = parse_dimension(img['width'])
-                    height = parse_dimension(img['height'])
-                    if width and height:
-                        if width >= 2000 and height >= 1000:
-                            score = 3  # Medium score (very large images)
-                        elif width >= 1600 or height >= 800:
-                            score = 2  # Lower score
-                        elif width >= 800 or height >= 500:
-                            score = 1  # Lowest score
-                        elif width >= 500 or height >= 300:
-                            score = 0  # Lowest score
-                        else:
-                            continue  # Skip small images
-                
+                score = score_image(img.get('class', []), img.get('width'), img.get('height'))
+                if score is None:
+                    continue  # Skip small images
+
                 image_urls.append({'url': img_src, 'score': score})
         
         # Sort images by score (highest first)
@@ -47,6 +32,28 @@ def get_relevant_images(soup: BeautifulSoup, url: str) -> list:
         logging.error(f"Error in get_relevant_images: {e}")
         return []
 
+def score_image(classes: list, width: str | None, height: str | None) -> int | None:
+    """Score an image by its classes and declared size, None for images too small to keep"""
+    # Check for relevant classes
+    if any(cls in classes for cls in ['header', 'featured', 'hero', 'thumbnail', 'main', 'content']):
+        return 4  # Higher score
+    # Check for size attributes
+    if width and height:
+        width = parse_dimension(width)
+        height = parse_dimension(height)
+        if width and height:
+            if width >= 2000 and height >= 1000:
+                return 3  # Medium score (very large images)
+            elif width >= 1600 or height >= 800:
+                return 2  # Lower score
+            elif width >= 800 or height >= 500:
+                return 1  # Lowest score
+            elif width >= 500 or height >= 300:
+                return 0  # Lowest score
+            else:
+                return None
+    return 0
+
 def parse_dimension(value: str) -> int:
     """Parse dimension value, handling px units"""
     if value.lower().endswith('px'):
@@ -121,4 +128,72 @@ def get_text_from_soup(soup: BeautifulSoup) -> str:
     text = soup.get_text(strip=True, separator="\n")
     # Remove excess whitespace
     text = re.sub(r"\s{2,}", " ", text)
-    return text
\ No newline at end of file
+    return text
+
+
+_REMOVED_TAGS = frozenset(["script", "style", "footer", "header", "nav", "menu", "sidebar", "svg"])
+_DISALLOWED_CLASSES = frozenset(["nav", "menu", "sidebar", "footer"])
+# BeautifulSoup's get_text skips the strings of these tags
+_TEXTLESS_TAGS = frozenset(["template", "rt", "rp"])
+_HTML_PARSER = lxml_html.HTMLParser(encoding="utf-8")
+
+
+def parse_html(html: bytes, url: str, encoding: str | None = None) -> tuple[str, list[tuple[str, int]], str]:
+    """
+    Single-pass equivalent of clean_soup + get_text_from_soup + get_relevant_images + extract_title.
+
+    The lxml tree is walked once: removed tags and tags with disallowed classes are skipped
+    along with their subtree while text, the first title and scored images are collected.
+    Only plain strings and tuples are returned so the result is cheap to pickle when the
+    page is parsed in a worker process; `expand_images` turns the images back into dicts.
+
+    Returns:
+        tuple: The cleaned text, up to 10 (image url, score) pairs ordered by score, and the title.
+    """
+    markup = UnicodeDammit(html, [encoding] if encoding else [], is_html=True).unicode_markup
+    try:
+        root = lxml_html.document_fromstring(markup.encode("utf-8"), parser=_HTML_PARSER)
+    except (etree.ParserError, ValueError):
+        return "", [], ""
+
+    texts = []
+    images = []
+    title = None
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, str):
+            texts.append(node)
+            continue
+
+        # The tail follows the element's subtree and is kept even when the element is removed
+        if node.tail and node.tail.strip():
+            stack.append(node.tail.strip())
+        tag = node.tag
+        if not isinstance(tag, str):
+            continue  # comments and processing instructions
+        classes = node.get("class", "").split()
+        if tag in _REMOVED_TAGS or tag in _TEXTLESS_TAGS or not _DISALLOWED_CLASSES.isdisjoint(classes):
+            continue
+
+        if tag == "img":
+            src = node.get("src")
+            img_src = urljoin(url, src) if src is not None else ""
+            if img_src.startswith(("http://", "https://")):
+                score = score_image(classes, node.get("width"), node.get("height"))
+                if score is not None:
+                    images.append((img_src, score))
+        elif tag == "title" and title is None:
+            title = node.text if len(node) == 0 else ""
+
+        if node.text and node.text.strip():
+            texts.append(node.text.strip())
+        stack.extend(reversed(node))
+
+    text = re.sub(r"\s{2,}", " ", "\n".join(texts))
+    images.sort(key=lambda image: image[1], reverse=True)
+    return text, images[:10], title or ""
+
+
+def expand_images(images: list[tuple[str, int]]) -> list[dict]:
+    return [{"url": image_url, "score": score} for image_url, score in images]
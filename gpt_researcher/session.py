@@ -0,0 +1,61 @@
+from .actions import get_retrievers
+from .config import Config
+from .llm_provider.rate_limiter import configure_rate_limits
+from .memory import Memory
+from .scraper.fetcher import ClientSessions
+from .utils.cache import get_cache
+from .utils.workers import WorkerPool
+
+
+class ResearchSession:
+    """
+    Resources shared by a researcher and the researchers it spawns, such as the subtopics
+    of a detailed report or the queries of a deep research: the config, the retrievers,
+    the embeddings client and the scraper worker pool with its HTTP connections. Sharing
+    them keeps the number of threads and connections bounded however many sub-researchers
+    a report creates.
+
+    LLM clients and caches are already shared process-wide.
+    """
+
+    def __init__(self, cfg: Config, headers: dict | None = None):
+        self.cfg = cfg
+        self.headers = headers or {}
+        configure_rate_limits(
+            requests_per_minute=cfg.llm_requests_per_minute,
+            tokens_per_minute=cfg.llm_tokens_per_minute,
+            max_concurrency=cfg.llm_max_concurrency,
+        )
+        self.retrievers = get_retrievers(self.headers, cfg)
+        self.memory = Memory(
+            cfg.embedding_provider,
+            cfg.embedding_model,
+            cache=get_cache(
+                cfg.embedding_cache,
+                "embeddings",
+                cache_dir=cfg.cache_dir,
+                max_entries=cfg.embedding_cache_size,
+            ),
+            **cfg.embedding_kwargs
+        )
+        self.worker_pool = WorkerPool(
+            cfg.max_scraper_workers,
+            parse_processes=cfg.scraper_parse_processes,
+            host_concurrency=cfg.scraper_host_concurrency,
+            host_delay=cfg.scraper_host_delay,
+            respect_robots=cfg.scraper_respect_robots,
+            client_sessions=ClientSessions(),
+        )
+
+    @classmethod
+    def from_config_path(cls, config_path: str | None = None, headers: dict | None = None) -> "ResearchSession":
+        return cls(Config(config_path), headers)
+
+    def close(self) -> None:
+        """Release the worker threads. Researchers using the session can't scrape afterwards."""
+        self.worker_pool.executor.shutdown(wait=False, cancel_futures=True)
+
+    async def aclose(self) -> None:
+        """Same as `close`, also closing the HTTP connections opened on the running event loop."""
+        await self.worker_pool.client_sessions.close()
+        self.close()
@@ -1,7 +1,7 @@
-from gpt_researcher.utils.workers import WorkerPool
+from typing import AsyncIterator
 
 from ..actions.utils import stream_output
-from ..actions.web_scraping import scrape_urls
+from ..actions.web_scraping import iter_scrape_urls
 from ..scraper.utils import get_image_hash
 
 
@@ -10,18 +10,33 @@ class BrowserManager:
 
     def __init__(self, researcher):
         self.researcher = researcher
-        self.worker_pool = WorkerPool(researcher.cfg.max_scraper_workers)
+        # Shared by the researchers of a session, so sub-researchers don't each start their own threads
+        self.worker_pool = researcher.session.worker_pool
 
-    async def browse_urls(self, urls: list[str]) -> list[dict]:
+    async def browse_urls(self, urls: list[str], query: str | None = None) -> list[dict]:
         """
         Scrape content from a list of URLs.
 
         Args:
             urls (list[str]): list of URLs to scrape.
+            query (str, optional): the query the URLs are scraped for.
 
         Returns:
             list[dict]: list of scraped content results.
         """
+        return [page async for page in self.browse_urls_iter(urls, query)]
+
+    async def browse_urls_iter(self, urls: list[str], query: str | None = None) -> AsyncIterator[dict]:
+        """
+        Scrape content from a list of URLs, yielding each page as soon as it is scraped.
+
+        Args:
+            urls (list[str]): list of URLs to scrape.
+            query (str, optional): the query the URLs are scraped for, used to pick the relevant pages of long PDFs.
+
+        Yields:
+            dict: scraped content of one URL.
+        """
         if self.researcher.verbose:
             await stream_output(
                 "logs",
@@ -30,10 +45,14 @@ class BrowserManager:
                 self.researcher.websocket,
             )
 
-        scraped_content, images = await scrape_urls(
-            urls, self.researcher.cfg, self.worker_pool
-        )
-        self.researcher.add_research_sources(scraped_content)
+        scraped_count = 0
+        images = []
+        async for page in iter_scrape_urls(urls, self.researcher.cfg, self.worker_pool, query):
+            self.researcher.add_research_sources([page])
+            images.extend(page.get("image_urls", []))
+            scraped_count += 1
+            yield page
+
         new_images = self.select_top_images(images, k=4)  # Select top 4 images
         self.researcher.add_research_images(new_images)
 
@@ -41,7 +60,7 @@ class BrowserManager:
             await stream_output(
                 "logs",
                 "scraping_content",
-                f"📄 Scraped {len(scraped_content)} pages of content",
+                f"📄 Scraped {scraped_count} pages of content",
                 self.researcher.websocket,
             )
             await stream_output(
@@ -59,8 +78,6 @@ class BrowserManager:
                 self.researcher.websocket,
             )
 
-        return scraped_content
-
     def select_top_images(self, images: list[dict], k: int = 2) -> list[str]:
         """
         Select most relevant images and remove duplicates based on image content.
@@ -1,8 +1,11 @@
 import asyncio
-from typing import List, Dict, Optional, Set
+import os
+from typing import AsyncIterable, List, Dict, Optional, Set
 
-from ..context.compression import ContextCompressor, WrittenContentCompressor, VectorstoreCompressor
+from ..context.compression import WrittenContentCompressor, VectorstoreCompressor
+from ..context.chunk_index import ChunkIndex
 from ..actions.utils import stream_output
+from ..utils.costs import aestimate_embedding_cost
 
 
 class ContextManager:
@@ -10,6 +13,8 @@ class ContextManager:
 
     def __init__(self, researcher):
         self.researcher = researcher
+        self.chunk_index = ChunkIndex(self.researcher.memory.get_embeddings())
+        self.similarity_threshold = float(os.environ.get("SIMILARITY_THRESHOLD", 0.35))
 
     async def get_similar_content_by_query(self, query, pages):
         if self.researcher.verbose:
@@ -20,13 +25,66 @@ class ContextManager:
                 self.researcher.websocket,
             )
 
-        context_compressor = ContextCompressor(
-            documents=pages, embeddings=self.researcher.memory.get_embeddings()
+        # Pages shared between sub-queries are only split and embedded the first time
+        await self.__add_pages(pages)
+        return await self.chunk_index.async_get_context(
+            query=query, pages=pages, max_results=10, threshold=self.similarity_threshold
         )
-        return await context_compressor.async_get_context(
-            query=query, max_results=10, cost_callback=self.researcher.add_costs
-        )
-        
+
+    async def index_pages(self, pages: AsyncIterable[Dict]) -> List[Dict]:
+        """
+        Chunk and embed pages while they are still being scraped.
+
+        Pages that arrive while an embedding batch is in flight are embedded together in the
+        next batch, so network I/O and embedding overlap without one request per page.
+
+        Args:
+            pages (AsyncIterable[Dict]): Scraped pages, e.g. from BrowserManager.browse_urls_iter.
+
+        Returns:
+            List[Dict]: All the pages received, ready for get_similar_content_by_query.
+        """
+        received = []
+        queue: asyncio.Queue = asyncio.Queue()
+
+        async def embed_batches():
+            finished = False
+            while not finished:
+                batch = [await queue.get()]
+                while not queue.empty():
+                    batch.append(queue.get_nowait())
+                if batch[-1] is None:
+                    batch.pop()
+                    finished = True
+                if batch:
+                    await self.__add_pages(batch)
+
+        consumer = asyncio.create_task(embed_batches())
+        try:
+            async for page in pages:
+                received.append(page)
+                queue.put_nowait(page)
+        finally:
+            queue.put_nowait(None)
+            await consumer
+        return received
+
+    async def __add_pages(self, pages: List[Dict]) -> None:
+        new_chunks = await self.chunk_index.add_pages(pages)
+        if new_chunks:
+            self.researcher.add_costs(await aestimate_embedding_cost(
+                model=self.researcher.cfg.embedding_model,
+                docs=[chunk.page_content for chunk in new_chunks],
+                provider=self.researcher.cfg.embedding_provider,
+            ))
+            if self.researcher.verbose:
+                await stream_output(
+                    "logs",
+                    "indexed_pages",
+                    f"🧩 Indexed {len(pages)} new pages ({len(new_chunks)} chunks)",
+                    self.researcher.websocket,
+                )
+
     async def get_similar_content_by_query_with_vectorstore(self, query, filter): 
         if self.researcher.verbose:
             await stream_output(
@@ -47,34 +105,34 @@ class ContextManager:
     ) -> List[str]:
         all_queries = [current_subtopic] + draft_section_titles
 
-        async def process_query(query: str) -> Set[str]:
-            return set(await self.__get_similar_written_contents_by_query(query, written_contents))
-
-        results = await asyncio.gather(*[process_query(query) for query in all_queries])
-        relevant_contents = set().union(*results)
+        results = await self.__get_similar_written_contents_by_queries(all_queries, written_contents)
+        relevant_contents = set().union(*[set(result) for result in results])
         relevant_contents = list(relevant_contents)[:max_results]
 
         return relevant_contents
 
-    async def __get_similar_written_contents_by_query(self,
-                                                      query: str,
-                                                      written_contents: List[Dict],
-                                                      similarity_threshold: float = 0.5,
-                                                      max_results: int = 10
-                                                      ) -> List[str]:
+    async def __get_similar_written_contents_by_queries(self,
+                                                        queries: List[str],
+                                                        written_contents: List[Dict],
+                                                        similarity_threshold: float = 0.5,
+                                                        max_results: int = 10
+                                                        ) -> List[List[str]]:
         if self.researcher.verbose:
-            await stream_output(
-                "logs",
-                "fetching_relevant_written_content",
-                f"🔎 Getting relevant written content based on query: {query}...",
-                self.researcher.websocket,
-            )
+            for query in queries:
+                await stream_output(
+                    "logs",
+                    "fetching_relevant_written_content",
+                    f"🔎 Getting relevant written content based on query: {query}...",
+                    self.researcher.websocket,
+                )
 
         written_content_compressor = WrittenContentCompressor(
             documents=written_contents,
             embeddings=self.researcher.memory.get_embeddings(),
-            similarity_threshold=similarity_threshold
+            similarity_threshold=similarity_threshold,
+            embedding_model=self.researcher.cfg.embedding_model,
+            embedding_provider=self.researcher.cfg.embedding_provider,
         )
-        return await written_content_compressor.async_get_context(
-            query=query, max_results=max_results, cost_callback=self.researcher.add_costs
+        return await written_content_compressor.async_get_contexts(
+            queries=queries, max_results=max_results, cost_callback=self.researcher.add_costs
         )
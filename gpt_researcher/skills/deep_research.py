@@ -1,10 +1,13 @@
 from typing import List, Dict, Any, Optional, Set
 import asyncio
+import heapq
+import itertools
 import logging
 import time
 from datetime import datetime, timedelta
 
 from gpt_researcher.llm_provider.generic.base import ReasoningEfforts
+from gpt_researcher.llm_provider.rate_limiter import Priority
 from ..utils.llm import create_chat_completion
 from ..utils.enum import ReportType, ReportSource, Tone
 from ..actions.query_processing import get_search_results
@@ -45,6 +48,30 @@ class ResearchProgress:
         self.completed_queries = 0
 
 
+class ResearchBudget:
+    """Query, time and cost limits of a deep research; a limit of 0 means unlimited."""
+
+    def __init__(self, max_queries: int = 0, time_limit: float = 0, cost_limit: float = 0, initial_costs: float = 0.0):
+        self.max_queries = max_queries
+        self.time_limit = time_limit
+        self.cost_limit = cost_limit
+        self.initial_costs = initial_costs
+        self.started = time.monotonic()
+        self.queries = 0
+
+    def remaining_time(self) -> Optional[float]:
+        if not self.time_limit:
+            return None
+        return max(0.0, self.started + self.time_limit - time.monotonic())
+
+    def exhausted(self, costs: float = 0.0) -> bool:
+        return bool(
+            (self.max_queries and self.queries >= self.max_queries)
+            or (self.time_limit and self.remaining_time() <= 0)
+            or (self.cost_limit and costs - self.initial_costs >= self.cost_limit)
+        )
+
+
 class DeepResearchSkill:
     def __init__(self, researcher):
         self.researcher = researcher
@@ -73,7 +100,9 @@ class DeepResearchSkill:
             llm_provider=self.researcher.cfg.strategic_llm_provider,
             model=self.researcher.cfg.strategic_llm_model,
             reasoning_effort=ReasoningEfforts.Medium.value,
-            temperature=0.4
+            temperature=0.4,
+            priority=Priority.LOW,
+            cost_callback=self.researcher.add_costs,
         )
 
         lines = response.split('\n')
@@ -123,7 +152,9 @@ Format each question on a new line starting with 'Question: '"""}
             llm_provider=self.researcher.cfg.strategic_llm_provider,
             model=self.researcher.cfg.strategic_llm_model,
             reasoning_effort=ReasoningEfforts.High.value,
-            temperature=0.4
+            temperature=0.4,
+            priority=Priority.LOW,
+            cost_callback=self.researcher.add_costs,
         )
 
         questions = [q.replace('Question:', '').strip()
@@ -145,7 +176,8 @@ Format each question on a new line starting with 'Question: '"""}
             model=self.researcher.cfg.strategic_llm_model,
             temperature=0.4,
             reasoning_effort=ReasoningEfforts.High.value,
-            max_tokens=1000
+            max_tokens=1000,
+            cost_callback=self.researcher.add_costs,
         )
 
         lines = response.split('\n')
@@ -193,7 +225,15 @@ Format each question on a new line starting with 'Question: '"""}
             visited_urls: Set[str] = None,
             on_progress=None
     ) -> Dict[str, Any]:
-        """Conduct deep iterative research"""
+        """
+        Conduct deep iterative research.
+
+        Queries are run from a work queue by at most `concurrency_limit` workers. As soon as
+        a query completes, its follow-up queries are queued one level deeper, so a slow query
+        only delays its own branch. Shallower queries are picked first. The research stops
+        early once the query, time or cost budget is spent; queries still running when the
+        time budget runs out are cancelled.
+        """
         if learnings is None:
             learnings = []
         if citations is None:
@@ -206,121 +246,133 @@ Format each question on a new line starting with 'Question: '"""}
         if on_progress:
             on_progress(progress)
 
-        # Generate search queries
-        serp_queries = await self.generate_search_queries(query, num_queries=breadth)
-        progress.total_queries = len(serp_queries)
-
         all_learnings = learnings.copy()
         all_citations = citations.copy()
         all_visited_urls = visited_urls.copy()
         all_context = []
         all_sources = []
 
-        # Process queries with concurrency limit
-        semaphore = asyncio.Semaphore(self.concurrency_limit)
+        budget = ResearchBudget(
+            max_queries=getattr(self.researcher.cfg, 'deep_research_max_queries', 0),
+            time_limit=getattr(self.researcher.cfg, 'deep_research_time_limit', 0),
+            cost_limit=getattr(self.researcher.cfg, 'deep_research_cost_limit', 0),
+            initial_costs=self.researcher.get_costs(),
+        )
+        queue: List[tuple] = []
+        order = itertools.count()
+
+        def enqueue(serp_queries: List[Dict[str, str]], level: int, level_breadth: int) -> None:
+            for serp_query in serp_queries:
+                heapq.heappush(queue, (level, next(order), serp_query, level_breadth))
+            progress.total_queries += len(serp_queries)
+
+        async def process_query(serp_query: Dict[str, str], level: int, level_breadth: int) -> Optional[Dict[str, Any]]:
+            try:
+                progress.current_query = serp_query['query']
+                progress.current_depth = max(progress.current_depth, level)
+                if on_progress:
+                    on_progress(progress)
+
+                from .. import GPTResearcher
+                researcher = GPTResearcher(
+                    query=serp_query['query'],
+                    report_type=ReportType.ResearchReport.value,
+                    report_source=ReportSource.Web.value,
+                    tone=self.tone,
+                    websocket=self.websocket,
+                    headers=self.headers,
+                    session=self.researcher.session,
+                )
 
-        async def process_query(serp_query: Dict[str, str]) -> Optional[Dict[str, Any]]:
-            async with semaphore:
                 try:
-                    progress.current_query = serp_query['query']
-                    if on_progress:
-                        on_progress(progress)
-
-                    from .. import GPTResearcher
-                    researcher = GPTResearcher(
-                        query=serp_query['query'],
-                        report_type=ReportType.ResearchReport.value,
-                        report_source=ReportSource.Web.value,
-                        tone=self.tone,
-                        websocket=self.websocket,
-                        config_path=self.config_path,
-                        headers=self.headers,
-                        visited_urls=self.visited_urls
-                    )
-
                     # Conduct research
                     context = await researcher.conduct_research()
+                finally:
+                    self.researcher.add_costs(researcher.get_costs())
 
-                    # Get results and visited URLs
-                    visited = researcher.visited_urls
-                    sources = researcher.research_sources
+                # Get results and visited URLs
+                visited = researcher.visited_urls
+                sources = researcher.research_sources
 
-                    # Process results to extract learnings and citations
-                    results = await self.process_research_results(
-                        query=serp_query['query'],
-                        context=context
-                    )
+                # Process results to extract learnings and citations
+                results = await self.process_research_results(
+                    query=serp_query['query'],
+                    context=context
+                )
 
-                    # Update progress
-                    progress.completed_queries += 1
-                    progress.current_breadth += 1
-                    if on_progress:
-                        on_progress(progress)
-
-                    return {
-                        'learnings': results['learnings'],
-                        'visited_urls': list(visited),
-                        'followUpQuestions': results['followUpQuestions'],
-                        'researchGoal': serp_query['researchGoal'],
-                        'citations': results['citations'],
-                        'context': context if context else "",
-                        'sources': sources if sources else []
-                    }
-
-                except Exception as e:
-                    logger.error(f"Error processing query '{serp_query['query']}': {str(e)}")
-                    return None
-
-        # Process queries concurrently with limit
-        tasks = [process_query(query) for query in serp_queries]
-        results = await asyncio.gather(*tasks)
-        results = [r for r in results if r is not None]
-
-        # Update breadth progress based on successful queries
-        progress.current_breadth = len(results)
-        if on_progress:
-            on_progress(progress)
+                # Queue the follow-up queries one level deeper
+                follow_up_breadth = max(2, level_breadth // 2)
+                follow_up_queries = []
+                if level < depth and not budget.exhausted(self.researcher.get_costs()):
+                    next_query = f"""
+                    Previous research goal: {serp_query.get('researchGoal', '')}
+                    Follow-up questions: {' '.join(results['followUpQuestions'])}
+                    """
+                    follow_up_queries = await self.generate_search_queries(
+                        next_query, num_queries=follow_up_breadth
+                    )
 
-        # Collect all results
-        for result in results:
-            all_learnings.extend(result['learnings'])
-            all_visited_urls.update(result['visited_urls'])
-            all_citations.update(result['citations'])
-            if result['context']:
-                all_context.append(result['context'])
-            if result['sources']:
-                all_sources.extend(result['sources'])
-
-            # Continue deeper if needed
-            if depth > 1:
-                new_breadth = max(2, breadth // 2)
-                new_depth = depth - 1
-                progress.current_depth += 1
-
-                # Create next query from research goal and follow-up questions
-                next_query = f"""
-                Previous research goal: {result['researchGoal']}
-                Follow-up questions: {' '.join(result['followUpQuestions'])}
-                """
-
-                # Recursive research
-                deeper_results = await self.deep_research(
-                    query=next_query,
-                    breadth=new_breadth,
-                    depth=new_depth,
-                    learnings=all_learnings,
-                    citations=all_citations,
-                    visited_urls=all_visited_urls,
-                    on_progress=on_progress
+                # Update progress
+                progress.completed_queries += 1
+                progress.current_breadth += 1
+                if on_progress:
+                    on_progress(progress)
+
+                return {
+                    'learnings': results['learnings'],
+                    'visited_urls': list(visited),
+                    'citations': results['citations'],
+                    'context': context if context else "",
+                    'sources': sources if sources else [],
+                    'followUpQueries': follow_up_queries,
+                    'level': level,
+                    'breadth': follow_up_breadth,
+                }
+
+            except Exception as e:
+                logger.error(f"Error processing query '{serp_query['query']}': {str(e)}")
+                return None
+
+        enqueue(await self.generate_search_queries(query, num_queries=breadth), 1, breadth)
+
+        running: Set[asyncio.Task] = set()
+        try:
+            while queue or running:
+                while queue and len(running) < self.concurrency_limit \
+                        and not budget.exhausted(self.researcher.get_costs()):
+                    level, _, serp_query, level_breadth = heapq.heappop(queue)
+                    budget.queries += 1
+                    running.add(asyncio.create_task(process_query(serp_query, level, level_breadth)))
+                if not running:
+                    break
+
+                done, running = await asyncio.wait(
+                    running, timeout=budget.remaining_time(), return_when=asyncio.FIRST_COMPLETED
                 )
-
-                all_learnings = deeper_results['learnings']
-                all_visited_urls.update(deeper_results['visited_urls'])
-                all_citations.update(deeper_results['citations'])
-                if deeper_results.get('context'):
-                    all_context.extend(deeper_results['context'])
-                if deeper_results.get('sources'):
-                    all_sources.extend(deeper_results['sources'])
+                if not done:
+                    logger.info(f"Deep research time budget spent, cancelling {len(running)} running queries")
+                    break
+
+                for task in done:
+                    result = task.result()
+                    if result is None:
+                        continue
+                    all_learnings.extend(result['learnings'])
+                    all_visited_urls.update(result['visited_urls'])
+                    all_citations.update(result['citations'])
+                    if result['context']:
+                        all_context.append(result['context'])
+                    if result['sources']:
+                        all_sources.extend(result['sources'])
+                    if result['followUpQueries']:
+                        enqueue(result['followUpQueries'], result['level'] + 1, result['breadth'])
+        finally:
+            for task in running:
+                task.cancel()
+            await asyncio.gather(*running, return_exceptions=True)
+
+        if queue:
+            logger.info(f"Deep research budget spent, skipped {len(queue)} queued queries")
 
         # Update class tracking
         self.context.extend(all_context)
@@ -1,10 +1,12 @@
 import asyncio
-import random
 import logging
 import os
 from ..actions.utils import stream_output
 from ..actions.query_processing import plan_research_outline, get_search_results
 from ..document import DocumentLoader, OnlineDocumentLoader, LangChainDocumentLoader
+from ..document.index import get_document_index
+from ..retrievers.utils import reciprocal_rank_fusion
+from ..scraper.http_cache import get_http_cache
 from ..utils.enum import ReportSource
 from ..utils.logging_config import get_json_handler
 
@@ -98,7 +100,11 @@ class ResearchConductor:
 
         elif self.researcher.report_source == ReportSource.Local.value:
             self.logger.info("Using local search")
-            document_data = await DocumentLoader(self.researcher.cfg.doc_path).load()
+            document_data = await DocumentLoader(
+                self.researcher.cfg.doc_path,
+                parse_executor=self.researcher.session.worker_pool.process_executor,
+                index=get_document_index(self.researcher.cfg),
+            ).load()
             self.logger.info(f"Loaded {len(document_data)} documents")
             if self.researcher.vector_store:
                 self.researcher.vector_store.load(document_data)
@@ -108,9 +114,17 @@ class ResearchConductor:
         # Hybrid search including both local documents and web sources
         elif self.researcher.report_source == ReportSource.Hybrid.value:
             if self.researcher.document_urls:
-                document_data = await OnlineDocumentLoader(self.researcher.document_urls).load()
+                document_data = await OnlineDocumentLoader(
+                    self.researcher.document_urls,
+                    http_cache=get_http_cache(self.researcher.cfg),
+                    client_sessions=self.researcher.session.worker_pool.client_sessions,
+                ).load()
             else:
-                document_data = await DocumentLoader(self.researcher.cfg.doc_path).load()
+                document_data = await DocumentLoader(
+                    self.researcher.cfg.doc_path,
+                    parse_executor=self.researcher.session.worker_pool.process_executor,
+                    index=get_document_index(self.researcher.cfg),
+                ).load()
             if self.researcher.vector_store:
                 self.researcher.vector_store.load(document_data)
             docs_context = await self._get_context_by_web_search(self.researcher.query, document_data, self.researcher.query_domains)
@@ -164,10 +178,13 @@ class ResearchConductor:
         """Scrapes and compresses the context from the given urls"""
         self.logger.info(f"Getting context from URLs: {urls}")
         
-        new_search_urls = await self._get_new_urls(urls)
+        # Source urls were asked for explicitly, so they are scraped even if another researcher already has
+        new_search_urls = await self._get_new_urls(urls, skip_shared=False)
         self.logger.info(f"New URLs to process: {new_search_urls}")
 
-        scraped_content = await self.researcher.scraper_manager.browse_urls(new_search_urls)
+        scraped_content = await self.researcher.context_manager.index_pages(
+            self.researcher.scraper_manager.browse_urls_iter(new_search_urls, self.researcher.query)
+        )
         self.logger.info(f"Scraped content from {len(scraped_content)} URLs")
 
         if self.researcher.vector_store:
@@ -283,7 +300,10 @@ class ResearchConductor:
 
         try:
             if not scraped_data:
-                scraped_data = await self._scrape_data_by_urls(sub_query, query_domains)
+                # Pages are chunked and embedded as they arrive instead of after the slowest url
+                scraped_data = await self.researcher.context_manager.index_pages(
+                    self._scrape_data_by_urls_iter(sub_query, query_domains)
+                )
                 self.logger.info(f"Scraped data size: {len(scraped_data)}")
 
             content = await self.researcher.context_manager.get_similar_content_by_query(sub_query, scraped_data)
@@ -328,53 +348,74 @@ class ResearchConductor:
 
         return context
 
-    async def _get_new_urls(self, url_set_input):
+    async def _get_new_urls(self, url_set_input, skip_shared: bool = True):
         """Gets the new urls from the given url set.
-        Args: url_set_input (set[str]): The url set to get the new urls from
+        Args:
+            url_set_input (set[str]): The url set to get the new urls from
+            skip_shared (bool): Whether to also skip the urls in the researcher's shared_urls
         Returns: list[str]: The new urls from the given url set
         """
 
+        shared_urls = self.researcher.shared_urls if skip_shared else None
         new_urls = []
         for url in url_set_input:
-            if url not in self.researcher.visited_urls:
-                self.researcher.visited_urls.add(url)
-                new_urls.append(url)
-                if self.researcher.verbose:
-                    await stream_output(
-                        "logs",
-                        "added_source_url",
-                        f"✅ Added source url to research: {url}\n",
-                        self.researcher.websocket,
-                        True,
-                        url,
-                    )
+            if url in self.researcher.visited_urls or (shared_urls is not None and url in shared_urls):
+                continue
+            # The check and both adds run with no await in between, so concurrent researchers can share the set
+            self.researcher.visited_urls.add(url)
+            if shared_urls is not None:
+                shared_urls.add(url)
+            new_urls.append(url)
+            if self.researcher.verbose:
+                await stream_output(
+                    "logs",
+                    "added_source_url",
+                    f"✅ Added source url to research: {url}\n",
+                    self.researcher.websocket,
+                    True,
+                    url,
+                )
 
         return new_urls
 
     async def _search_relevant_source_urls(self, query, query_domains: list | None = None):
-        new_search_urls = []
         if query_domains is None:
             query_domains = []
 
-        # Iterate through all retrievers
-        for retriever_class in self.researcher.retrievers:
-            # Instantiate the retriever with the sub-query
-            retriever = retriever_class(query, query_domains=query_domains)
-
-            # Perform the search using the current retriever
-            search_results = await asyncio.to_thread(
-                retriever.search, max_results=self.researcher.cfg.max_search_results_per_query
-            )
+        # Query all retrievers concurrently, so the slowest one bounds the latency
+        search_results = await asyncio.gather(
+            *[
+                self._search_with_retriever(retriever_class, query, query_domains)
+                for retriever_class in self.researcher.retrievers
+            ]
+        )
 
-            # Collect new URLs from search results
-            search_urls = [url.get("href") for url in search_results]
-            new_search_urls.extend(search_urls)
+        # Merge the rankings, so pages found by several retrievers are scraped first
+        ranked_urls = reciprocal_rank_fusion(
+            [[result.get("href") for result in results] for results in search_results]
+        )
 
         # Get unique URLs
-        new_search_urls = await self._get_new_urls(new_search_urls)
-        random.shuffle(new_search_urls)
+        return await self._get_new_urls(ranked_urls)
 
-        return new_search_urls
+    async def _search_with_retriever(self, retriever_class, query, query_domains: list) -> list:
+        """Runs one retriever within the configured timeout, returning no results on failure."""
+        # Instantiate the retriever with the sub-query
+        retriever = retriever_class(query, query_domains=query_domains)
+        try:
+            return await asyncio.wait_for(
+                asyncio.to_thread(
+                    retriever.search, max_results=self.researcher.cfg.max_search_results_per_query
+                ),
+                timeout=self.researcher.cfg.retriever_timeout,
+            ) or []
+        except asyncio.TimeoutError:
+            self.logger.warning(
+                f"{retriever_class.__name__} did not answer within {self.researcher.cfg.retriever_timeout}s for '{query}'"
+            )
+        except Exception as e:
+            self.logger.error(f"{retriever_class.__name__} search failed for '{query}': {e}")
+        return []
 
     async def _scrape_data_by_urls(self, sub_query, query_domains: list | None = None):
         """
@@ -386,6 +427,12 @@ class ResearchConductor:
         Returns:
             list: A list of scraped content results.
         """
+        return [page async for page in self._scrape_data_by_urls_iter(sub_query, query_domains)]
+
+    async def _scrape_data_by_urls_iter(self, sub_query, query_domains: list | None = None):
+        """
+        Same as `_scrape_data_by_urls`, but yields each page as soon as it is scraped.
+        """
         if query_domains is None:
             query_domains = []
 
@@ -401,9 +448,10 @@ class ResearchConductor:
             )
 
         # Scrape the new URLs
-        scraped_content = await self.researcher.scraper_manager.browse_urls(new_search_urls)
+        scraped_content = []
+        async for page in self.researcher.scraper_manager.browse_urls_iter(new_search_urls, sub_query):
+            scraped_content.append(page)
+            yield page
 
         if self.researcher.vector_store:
             self.researcher.vector_store.load(scraped_content)
-
-        return scraped_content
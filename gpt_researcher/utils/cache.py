@@ -0,0 +1,295 @@
+"""
+Byte-valued key/value caches shared across researchers in the same process.
+"""
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Iterable
+
+
+class BaseCache(ABC):
+    """Key/value cache storing raw bytes with optional per-entry TTL."""
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+
+    @abstractmethod
+    def mget(self, keys: list[str]) -> list[bytes | None]:
+        """Return the cached values for `keys`, None for misses."""
+
+    @abstractmethod
+    def mset(self, items: Iterable[tuple[str, bytes]], ttl: float | None = None) -> None:
+        """Store `items`, expiring them after `ttl` seconds if given."""
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        """Remove `key` from the cache."""
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Remove every entry from the cache."""
+
+    def get(self, key: str) -> bytes | None:
+        return self.mget([key])[0]
+
+    def set(self, key: str, value: bytes, ttl: float | None = None) -> None:
+        self.mset([(key, value)], ttl=ttl)
+
+    def get_stats(self) -> dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses}
+
+    def _record(self, values: list[bytes | None]) -> list[bytes | None]:
+        found = sum(value is not None for value in values)
+        self.hits += found
+        self.misses += len(values) - found
+        return values
+
+
+class MemoryCache(BaseCache):
+    """In-process LRU cache bounded by entry count and, optionally, total bytes."""
+
+    def __init__(self, max_entries: int | None = 10000, max_bytes: int | None = None):
+        super().__init__()
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[str, tuple[bytes, float | None]] = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def mget(self, keys: list[str]) -> list[bytes | None]:
+        now = time.time()
+        values = []
+        with self._lock:
+            for key in keys:
+                entry = self._entries.get(key)
+                if entry is None:
+                    values.append(None)
+                    continue
+                value, expires_at = entry
+                if expires_at is not None and expires_at <= now:
+                    self._pop(key)
+                    values.append(None)
+                    continue
+                self._entries.move_to_end(key)
+                values.append(value)
+        return self._record(values)
+
+    def mset(self, items: Iterable[tuple[str, bytes]], ttl: float | None = None) -> None:
+        expires_at = time.time() + ttl if ttl else None
+        with self._lock:
+            for key, value in items:
+                self._pop(key)
+                self._entries[key] = (value, expires_at)
+                self._size += len(value)
+            self._evict()
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._pop(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def _pop(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._size -= len(entry[0])
+
+    def _evict(self) -> None:
+        while self._entries and (
+            (self.max_entries and len(self._entries) > self.max_entries)
+            or (self.max_bytes and self._size > self.max_bytes)
+        ):
+            _, (value, _) = self._entries.popitem(last=False)
+            self._size -= len(value)
+
+
+class SQLiteCache(BaseCache):
+    """On-disk cache backed by a single SQLite file, evicting least recently used entries."""
+
+    def __init__(self, path: str, max_entries: int | None = None, max_bytes: int | None = None):
+        super().__init__()
+        self.path = path
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache ("
+            "key TEXT PRIMARY KEY, value BLOB NOT NULL, size INTEGER NOT NULL, "
+            "expires_at REAL, accessed_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS cache_accessed_at ON cache (accessed_at)")
+
+    def mget(self, keys: list[str]) -> list[bytes | None]:
+        if not keys:
+            return []
+        now = time.time()
+        found: dict[str, bytes] = {}
+        with self._lock:
+            # Stay well below SQLite's bound-parameter limit
+            for start in range(0, len(keys), 500):
+                batch = keys[start:start + 500]
+                placeholders = ",".join("?" * len(batch))
+                rows = self._conn.execute(
+                    f"SELECT key, value, expires_at FROM cache WHERE key IN ({placeholders})",
+                    batch,
+                ).fetchall()
+                for key, value, expires_at in rows:
+                    if expires_at is None or expires_at > now:
+                        found[key] = value
+            if found:
+                self._conn.execute("BEGIN")
+                self._conn.executemany(
+                    "UPDATE cache SET accessed_at = ? WHERE key = ?",
+                    [(now, key) for key in found],
+                )
+                self._conn.execute("COMMIT")
+        return self._record([found.get(key) for key in keys])
+
+    def mset(self, items: Iterable[tuple[str, bytes]], ttl: float | None = None) -> None:
+        now = time.time()
+        expires_at = now + ttl if ttl else None
+        rows = [(key, value, len(value), expires_at, now) for key, value in items]
+        if not rows:
+            return
+        with self._lock:
+            self._conn.execute("BEGIN")
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO cache (key, value, size, expires_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                rows,
+            )
+            self._conn.execute("COMMIT")
+            self._evict(now)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM cache")
+
+    def _evict(self, now: float) -> None:
+        self._conn.execute("DELETE FROM cache WHERE expires_at IS NOT NULL AND expires_at <= ?", (now,))
+        if self.max_entries:
+            (count,) = self._conn.execute("SELECT COUNT(*) FROM cache").fetchone()
+            if count > self.max_entries:
+                self._conn.execute(
+                    "DELETE FROM cache WHERE key IN "
+                    "(SELECT key FROM cache ORDER BY accessed_at LIMIT ?)",
+                    (count - self.max_entries,),
+                )
+        if self.max_bytes:
+            (total,) = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM cache").fetchone()
+            if total > self.max_bytes:
+                excess = total - self.max_bytes
+                stale = []
+                cursor = self._conn.execute("SELECT key, size FROM cache ORDER BY accessed_at")
+                for key, size in cursor:
+                    stale.append((key,))
+                    excess -= size
+                    if excess <= 0:
+                        break
+                cursor.close()
+                self._conn.executemany("DELETE FROM cache WHERE key = ?", stale)
+
+
+class RedisCache(BaseCache):
+    """
+    Cache stored in Redis or any server speaking its protocol (Valkey, KeyDB, Dragonfly, ...).
+
+    Keys are prefixed with the namespace so several caches can share one database; eviction
+    is left to the server's `maxmemory-policy`.
+    """
+
+    def __init__(self, url: str, namespace: str):
+        super().__init__()
+        try:
+            import redis
+        except ImportError:
+            raise ImportError("Unable to import redis. Please install with `pip install -U redis`")
+        self.prefix = f"gpt_researcher:{namespace}:"
+        self._client = redis.Redis.from_url(url)
+
+    def mget(self, keys: list[str]) -> list[bytes | None]:
+        if not keys:
+            return []
+        return self._record(self._client.mget([self.prefix + key for key in keys]))
+
+    def mset(self, items: Iterable[tuple[str, bytes]], ttl: float | None = None) -> None:
+        pipeline = self._client.pipeline(transaction=False)
+        for key, value in items:
+            pipeline.set(self.prefix + key, value, px=int(ttl * 1000) if ttl else None)
+        pipeline.execute()
+
+    def delete(self, key: str) -> None:
+        self._client.delete(self.prefix + key)
+
+    def clear(self) -> None:
+        keys = list(self._client.scan_iter(match=self.prefix + "*", count=1000))
+        for start in range(0, len(keys), 1000):
+            self._client.delete(*keys[start:start + 1000])
+
+
+_CACHES: dict[tuple, BaseCache] = {}
+_CACHES_LOCK = threading.Lock()
+
+
+def get_cache(
+    backend: str | None,
+    namespace: str,
+    cache_dir: str | None = None,
+    max_entries: int | None = None,
+    max_bytes: int | None = None,
+    url: str | None = None,
+) -> BaseCache | None:
+    """
+    Get the process-wide cache for a namespace, creating it on first use.
+
+    Args:
+        backend (str): "memory", "sqlite", "redis" or "none" to disable caching.
+        namespace (str): Name of the cache, e.g. "embeddings". Also used as the SQLite file name.
+        cache_dir (str): Directory for on-disk backends.
+        max_entries (int): Maximum number of entries before least recently used ones are evicted.
+        max_bytes (int): Maximum total size of cached values in bytes.
+        url (str): Server URL for the "redis" backend, e.g. "redis://localhost:6379/0".
+
+    Returns:
+        BaseCache | None: The shared cache instance, or None when caching is disabled.
+    """
+    backend = (backend or "none").lower()
+    if backend == "none":
+        return None
+
+    key = (backend, namespace, os.path.abspath(cache_dir) if cache_dir else None, url)
+    with _CACHES_LOCK:
+        cache = _CACHES.get(key)
+        if cache is not None:
+            return cache
+
+        match backend:
+            case "memory":
+                cache = MemoryCache(max_entries=max_entries, max_bytes=max_bytes)
+            case "sqlite":
+                path = os.path.join(cache_dir or "cache", f"{namespace}.sqlite3")
+                cache = SQLiteCache(path, max_entries=max_entries, max_bytes=max_bytes)
+            case "redis":
+                cache = RedisCache(url or "redis://localhost:6379/0", namespace)
+            case _:
+                raise ValueError(
+                    f"Unsupported cache backend '{backend}'. Supported backends are: memory, sqlite, redis, none"
+                )
+
+        _CACHES[key] = cache
+        return cache
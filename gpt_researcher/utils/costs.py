@@ -1,3 +1,10 @@
+import asyncio
+import hashlib
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Iterable
+
 import tiktoken
 
 # Per OpenAI Pricing Page: https://openai.com/api/pricing/
@@ -7,19 +14,162 @@ OUTPUT_COST_PER_TOKEN = 0.000015
 IMAGE_INFERENCE_COST = 0.003825
 EMBEDDING_COST = 0.02 / 1000000 # Assumes new ada-3-small
 
+# USD per million (input, output) tokens, matched by the longest model name prefix.
+# Unknown models are priced with INPUT_COST_PER_TOKEN and OUTPUT_COST_PER_TOKEN.
+MODEL_PRICES = {
+    "gpt-4o-mini": (0.15, 0.60),
+    "gpt-4o": (2.50, 10.00),
+    "gpt-4.1-nano": (0.10, 0.40),
+    "gpt-4.1-mini": (0.40, 1.60),
+    "gpt-4.1": (2.00, 8.00),
+    "gpt-4-turbo": (10.00, 30.00),
+    "gpt-4": (30.00, 60.00),
+    "gpt-3.5-turbo": (0.50, 1.50),
+    "o1-mini": (1.10, 4.40),
+    "o1": (15.00, 60.00),
+    "o3-mini": (1.10, 4.40),
+    "o3": (2.00, 8.00),
+    "o4-mini": (1.10, 4.40),
+    "claude-3-5-haiku": (0.80, 4.00),
+    "claude-3-5-sonnet": (3.00, 15.00),
+    "claude-3-7-sonnet": (3.00, 15.00),
+    "claude-3-opus": (15.00, 75.00),
+    "gemini-1.5-flash": (0.075, 0.30),
+    "gemini-1.5-pro": (1.25, 5.00),
+    "gemini-2.0-flash": (0.10, 0.40),
+    "deepseek-chat": (0.27, 1.10),
+    "deepseek-reasoner": (0.55, 2.19),
+}
+# USD per million tokens
+EMBEDDING_PRICES = {
+    "text-embedding-3-small": 0.02,
+    "text-embedding-3-large": 0.13,
+    "text-embedding-ada-002": 0.10,
+}
+# Embedding providers running on the researcher's own machine
+LOCAL_EMBEDDING_PROVIDERS = {"ollama", "huggingface"}
+
+# Texts longer than this many characters are tokenized off the event loop
+OFFLOAD_THRESHOLD = 20000
+# Number of document token counts memoized
+DOCUMENT_TOKEN_CACHE_SIZE = 8192
+
+
+@lru_cache(maxsize=None)
+def _get_encoding(name: str) -> tiktoken.Encoding:
+    return tiktoken.get_encoding(name)
+
+
+@lru_cache(maxsize=None)
+def _encoding_for_model(model: str) -> tiktoken.Encoding:
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        return _get_encoding(ENCODING_MODEL)
+
+
+def count_tokens(text: str) -> int:
+    """Estimate the number of tokens in `text` with the OpenAI tokenizer."""
+    return len(_get_encoding(ENCODING_MODEL).encode(text))
+
+
+async def acount_tokens(text: str) -> int:
+    """count_tokens, run in a worker thread for long texts so the event loop isn't blocked."""
+    if len(text) > OFFLOAD_THRESHOLD:
+        return await asyncio.to_thread(count_tokens, text)
+    return count_tokens(text)
+
+
+# Documents are re-embedded by every compression of the same context, so their counts are memoized.
+# They are keyed by a digest of the text, so the cache doesn't keep large documents alive.
+_document_tokens: OrderedDict[bytes, int] = OrderedDict()
+_document_tokens_lock = threading.Lock()
+
+
+def _count_document_tokens(model: str, text: str) -> int:
+    key = hashlib.blake2b(f"{model}\0{text}".encode("utf-8"), digest_size=16).digest()
+    with _document_tokens_lock:
+        count = _document_tokens.get(key)
+        if count is not None:
+            _document_tokens.move_to_end(key)
+            return count
+    count = len(_encoding_for_model(model).encode(text))
+    with _document_tokens_lock:
+        _document_tokens[key] = count
+        if len(_document_tokens) > DOCUMENT_TOKEN_CACHE_SIZE:
+            _document_tokens.popitem(last=False)
+    return count
+
+
+def _model_prices(model: str | None) -> tuple[float, float]:
+    # Provider-qualified names such as "deepseek/deepseek-reasoner" are priced by the model part
+    name = (model or "").rsplit("/", 1)[-1].lower()
+    prefix = max((prefix for prefix in MODEL_PRICES if name.startswith(prefix)), key=len, default=None)
+    if prefix is None:
+        return INPUT_COST_PER_TOKEN, OUTPUT_COST_PER_TOKEN
+    input_price, output_price = MODEL_PRICES[prefix]
+    return input_price / 1000000, output_price / 1000000
+
+
+def _llm_cost(model: str | None, input_tokens: int, output_tokens: int) -> float:
+    input_price, output_price = _model_prices(model)
+    return input_tokens * input_price + output_tokens * output_price
+
 
 # Cost estimation is via OpenAI libraries and models. May vary for other models
-def estimate_llm_cost(input_content: str, output_content: str) -> float:
-    encoding = tiktoken.get_encoding(ENCODING_MODEL)
-    input_tokens = encoding.encode(input_content)
-    output_tokens = encoding.encode(output_content)
-    input_costs = len(input_tokens) * INPUT_COST_PER_TOKEN
-    output_costs = len(output_tokens) * OUTPUT_COST_PER_TOKEN
-    return input_costs + output_costs
+def estimate_llm_cost(
+    input_content: str,
+    output_content: str,
+    model: str | None = None,
+    usage: dict[str, Any] | None = None,
+) -> float:
+    """
+    Estimate the cost of an LLM call.
+
+    Args:
+        input_content (str): The prompt sent.
+        output_content (str): The response received.
+        model (str, optional): The model used, for its prices in MODEL_PRICES.
+        usage (dict, optional): Token usage reported by the provider (`input_tokens`, `output_tokens`),
+            used instead of counting tokens.
+
+    Returns:
+        float: The estimated cost in USD.
+    """
+    if usage:
+        return _llm_cost(model, usage.get("input_tokens", 0), usage.get("output_tokens", 0))
+    return _llm_cost(model, count_tokens(input_content), count_tokens(output_content))
+
+
+async def aestimate_llm_cost(
+    input_content: str,
+    output_content: str,
+    model: str | None = None,
+    usage: dict[str, Any] | None = None,
+) -> float:
+    """estimate_llm_cost, tokenizing long texts in a worker thread."""
+    if usage:
+        return estimate_llm_cost(input_content, output_content, model, usage)
+    input_tokens, output_tokens = await asyncio.gather(acount_tokens(input_content), acount_tokens(output_content))
+    return _llm_cost(model, input_tokens, output_tokens)
+
 
+def estimate_embedding_cost(model, docs: Iterable, provider: str | None = None) -> float:
+    """
+    Estimate the cost of embedding `docs` with `model` (the configured EMBEDDING model and provider).
+    Models missing from EMBEDDING_PRICES are priced as text-embedding-3-small; local providers are free.
+    """
+    if provider in LOCAL_EMBEDDING_PROVIDERS:
+        return 0.0
+    # Provider-qualified names such as "openai/text-embedding-3-large" are priced by the model part
+    name = (model or "").rsplit("/", 1)[-1].lower()
+    total_tokens = sum(_count_document_tokens(model, str(doc)) for doc in docs)
+    return total_tokens * EMBEDDING_PRICES.get(name, EMBEDDING_COST * 1000000) / 1000000
 
-def estimate_embedding_cost(model, docs):
-    encoding = tiktoken.encoding_for_model(model)
-    total_tokens = sum(len(encoding.encode(str(doc))) for doc in docs)
-    return total_tokens * EMBEDDING_COST
 
+async def aestimate_embedding_cost(model, docs: Iterable, provider: str | None = None) -> float:
+    """estimate_embedding_cost, run in a worker thread when the documents are long."""
+    docs = [str(doc) for doc in docs]
+    if sum(len(doc) for doc in docs) > OFFLOAD_THRESHOLD:
+        return await asyncio.to_thread(estimate_embedding_cost, model, docs, provider)
+    return estimate_embedding_cost(model, docs, provider)
@@ -0,0 +1,157 @@
+import asyncio
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Any
+
+
+def empty_research_log(timestamp: str | None = None) -> dict[str, Any]:
+    """The summary structure of a research log before any event."""
+    return {
+        "timestamp": timestamp or datetime.now().isoformat(),
+        "events": [],
+        "content": {
+            "query": "",
+            "sources": [],
+            "context": [],
+            "report": "",
+            "costs": 0.0
+        }
+    }
+
+
+class EventLog:
+    """
+    Append-only JSON Lines log of research events and content updates.
+
+    Records are buffered in memory and written by a background flush shortly after being
+    added, so logging never touches the disk on the caller's path; outside an event loop
+    they are written immediately. The file is fsynced at most every `fsync_interval`
+    seconds. The summary that readers expect, `{"timestamp", "events": [...], "content": {...}}`,
+    is kept up to date in memory; `compact()` writes it out as JSON.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        summary_path: str | None = None,
+        flush_interval: float = 0.5,
+        fsync_interval: float = 5.0,
+        max_buffer: int = 256,
+    ):
+        self.path = path
+        self.summary_path = summary_path
+        self.flush_interval = flush_interval
+        self.fsync_interval = fsync_interval
+        self.max_buffer = max_buffer
+        self.timestamp = datetime.now().isoformat()
+        self._buffer: list[str] = []
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._file = None
+        self._last_fsync = time.monotonic()
+        self._flush_task: asyncio.Task | None = None
+        self._summary = self._load(path, self.timestamp)
+
+    def log_event(self, event_type: str, data: dict) -> None:
+        self._append({"timestamp": datetime.now().isoformat(), "type": event_type, "data": data})
+
+    def update_content(self, content: dict) -> None:
+        self._append({"content": content})
+
+    def _append(self, record: dict) -> None:
+        line = json.dumps(record, default=str)
+        with self._lock:
+            _fold(self._summary, json.loads(line))
+            self._buffer.append(line)
+            full = len(self._buffer) >= self.max_buffer
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self.flush()
+            return
+        if full:
+            loop.run_in_executor(None, self.flush)
+        elif self._flush_task is None or self._flush_task.done():
+            self._flush_task = loop.create_task(self._flush_later())
+
+    async def _flush_later(self) -> None:
+        await asyncio.sleep(self.flush_interval)
+        await asyncio.to_thread(self.flush)
+
+    def flush(self, fsync: bool = False) -> None:
+        """Write the buffered records, fsyncing if asked or if `fsync_interval` has passed."""
+        with self._write_lock:
+            with self._lock:
+                lines, self._buffer = self._buffer, []
+            if lines:
+                if self._file is None:
+                    os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+                    self._file = open(self.path, "a", encoding="utf-8")
+                self._file.write("\n".join(lines) + "\n")
+                self._file.flush()
+            if self._file is not None and (fsync or time.monotonic() - self._last_fsync >= self.fsync_interval):
+                os.fsync(self._file.fileno())
+                self._last_fsync = time.monotonic()
+
+    def read(self) -> dict[str, Any]:
+        """The summary of everything logged so far."""
+        with self._lock:
+            return {
+                **self._summary,
+                "events": list(self._summary["events"]),
+                "content": dict(self._summary["content"]),
+            }
+
+    @staticmethod
+    def _load(path: str, timestamp: str) -> dict[str, Any]:
+        """Fold records already in the file, when appending to an existing log."""
+        summary = empty_research_log(timestamp)
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        _fold(summary, json.loads(line))
+        return summary
+
+    def compact(self) -> dict[str, Any]:
+        """Write the summary JSON to `summary_path` (atomically) and return it."""
+        self.flush()
+        summary = self.read()
+        if self.summary_path:
+            write_json_atomic(self.summary_path, summary)
+        return summary
+
+    async def acompact(self) -> dict[str, Any]:
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+        return await asyncio.to_thread(self.compact)
+
+    def close(self) -> None:
+        self.flush(fsync=True)
+        with self._write_lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    async def aclose(self) -> dict[str, Any]:
+        """Compact the log and close the file at the end of a run."""
+        summary = await self.acompact()
+        await asyncio.to_thread(self.close)
+        return summary
+
+
+def _fold(summary: dict[str, Any], record: dict) -> None:
+    if "content" in record:
+        summary["content"].update(record["content"])
+    else:
+        summary["events"].append(record)
+
+
+def write_json_atomic(path: str, data: Any) -> None:
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, default=str)
+    os.replace(tmp_path, path)
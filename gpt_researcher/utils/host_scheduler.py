@@ -0,0 +1,190 @@
+import asyncio
+import logging
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse
+from urllib.robotparser import RobotFileParser
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+# Backoff after a 429 or 503 response without Retry-After, doubled on each one
+BACKOFF_BASE = 1.0
+MAX_BACKOFF = 60.0
+# Longest robots.txt crawl delay honored
+MAX_CRAWL_DELAY = 30.0
+ROBOTS_TIMEOUT = 5
+# Responses asking the client to slow down
+THROTTLE_STATUSES = {429, 503}
+
+
+class _Host:
+    def __init__(self):
+        self.active = 0
+        self.waiters: deque[asyncio.Future] = deque()
+        self.next_start = 0.0
+        self.backoff = 0.0
+        self.crawl_delay = 0.0
+        self.robots: asyncio.Task | None = None
+
+
+class HostScheduler:
+    """
+    Hands out up to `max_workers` slots for requests, with at most `per_host_concurrency`
+    at a time per host (0 for no per-host limit) and starts on the same host spaced by
+    `per_host_delay` seconds, or the host's robots.txt crawl delay when `respect_robots` is set.
+
+    Waiting requests are queued per host and served round-robin across hosts, so the
+    requests to one throttled host wait on their own while the free slots go to others.
+    Hosts that answer 429 or 503 are backed off, following Retry-After when given;
+    report responses with `report`.
+    """
+
+    def __init__(
+        self,
+        max_workers: int,
+        per_host_concurrency: int = 2,
+        per_host_delay: float = 0.0,
+        respect_robots: bool = False,
+    ):
+        self.max_workers = max_workers
+        self.per_host_concurrency = per_host_concurrency
+        self.per_host_delay = per_host_delay
+        self.respect_robots = respect_robots
+        self._hosts: dict[str, _Host] = {}
+        self._ring: deque[str] = deque()
+        self._active = 0
+        self._timer: asyncio.TimerHandle | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    @asynccontextmanager
+    async def slot(self, url: str):
+        name = get_host(url)
+        host = self._hosts.setdefault(name, _Host())
+        self._loop = asyncio.get_running_loop()
+        if self.respect_robots and name:
+            await self._load_crawl_delay(name, host)
+
+        waiter = self._loop.create_future()
+        host.waiters.append(waiter)
+        if name not in self._ring:
+            self._ring.append(name)
+        self._dispatch()
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                self._release(host)
+            elif waiter in host.waiters:
+                host.waiters.remove(waiter)
+            raise
+        try:
+            yield
+        finally:
+            self._release(host)
+
+    def report(self, url: str, status: int, retry_after: str | None = None) -> None:
+        """Record a response status for `url`'s host; safe to call from worker threads."""
+        host = self._hosts.get(get_host(url))
+        if host is None or self._loop is None:
+            return
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is self._loop:
+            self._apply(host, status, retry_after)
+        elif not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._apply, host, status, retry_after)
+
+    def _apply(self, host: _Host, status: int, retry_after: str | None) -> None:
+        if status in THROTTLE_STATUSES:
+            delay = _parse_retry_after(retry_after)
+            if delay is None:
+                delay = max(host.backoff * 2, BACKOFF_BASE)
+            host.backoff = min(delay, MAX_BACKOFF)
+            host.next_start = max(host.next_start, time.monotonic() + host.backoff)
+            logger.info(f"Got {status}, backing off host for {host.backoff:.1f}s")
+        elif status < 400 and host.backoff:
+            host.backoff = host.backoff / 2 if host.backoff > BACKOFF_BASE else 0.0
+
+    def _release(self, host: _Host) -> None:
+        host.active -= 1
+        self._active -= 1
+        self._dispatch()
+
+    def _dispatch(self) -> None:
+        """Give free slots to waiting requests, one host after the other."""
+        now = time.monotonic()
+        wake_at = None
+        remaining = len(self._ring)
+        while self._ring and remaining > 0 and self._active < self.max_workers:
+            remaining -= 1
+            name = self._ring.popleft()
+            host = self._hosts[name]
+            while host.waiters and host.waiters[0].done():
+                host.waiters.popleft()
+            if not host.waiters:
+                continue
+            self._ring.append(name)
+            if 0 < self.per_host_concurrency <= host.active:
+                continue
+            if now < host.next_start:
+                wake_at = host.next_start if wake_at is None else min(wake_at, host.next_start)
+                continue
+
+            host.active += 1
+            self._active += 1
+            host.next_start = now + max(self.per_host_delay, host.crawl_delay, host.backoff)
+            host.waiters.popleft().set_result(None)
+            remaining = len(self._ring)
+
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if wake_at is not None and self._active < self.max_workers:
+            self._timer = self._loop.call_later(wake_at - now, self._dispatch)
+
+    async def _load_crawl_delay(self, name: str, host: _Host) -> None:
+        if host.robots is None:
+            host.robots = asyncio.ensure_future(asyncio.to_thread(fetch_crawl_delay, name))
+        host.crawl_delay = await asyncio.shield(host.robots)
+
+
+def get_host(url: str) -> str:
+    return urlparse(url).netloc.lower()
+
+
+def fetch_crawl_delay(host: str) -> float:
+    """The robots.txt crawl delay (or request rate) of `host` in seconds, 0 when there's none."""
+    try:
+        response = requests.get(f"https://{host}/robots.txt", timeout=ROBOTS_TIMEOUT)
+        if response.status_code != 200:
+            return 0.0
+        parser = RobotFileParser()
+        parser.parse(response.text.splitlines())
+    except Exception as e:
+        logger.debug(f"Failed to read robots.txt of {host}: {e}")
+        return 0.0
+
+    delay = parser.crawl_delay("*")
+    rate = parser.request_rate("*")
+    if delay is None and rate is not None and rate.requests:
+        delay = rate.seconds / rate.requests
+    return min(float(delay or 0), MAX_CRAWL_DELAY)
+
+
+def _parse_retry_after(value: str | None) -> float | None:
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
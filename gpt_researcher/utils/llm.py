@@ -1,23 +1,80 @@
 # libraries
 from __future__ import annotations
 
-import logging
+from functools import partial
 from typing import Any
 
 from langchain.output_parsers import PydanticOutputParser
 from langchain.prompts import PromptTemplate
 
 from gpt_researcher.llm_provider.generic.base import NO_SUPPORT_TEMPERATURE_MODELS, SUPPORT_REASONING_EFFORT_MODELS, ReasoningEfforts
+from gpt_researcher.llm_provider.rate_limiter import Priority, get_rate_limiter
+from gpt_researcher.llm_provider.resilience import call_with_failover
 
 from ..prompts import generate_subtopics_prompt
-from .costs import estimate_llm_cost
+from .costs import acount_tokens, aestimate_llm_cost
+from .llm_cache import LLMResponseCache, get_llm_cache
 from .validators import Subtopics
 import os
 
+LLM_TIERS = ("strategic", "smart", "fast")
+
 
 def get_llm(llm_provider, **kwargs):
-    from gpt_researcher.llm_provider import GenericLLMProvider
-    return GenericLLMProvider.from_provider(llm_provider, **kwargs)
+    from gpt_researcher.llm_provider.registry import get_provider
+    return get_provider(llm_provider, **kwargs)
+
+
+def _provider_kwargs(
+        model: str,
+        temperature: float | None,
+        max_tokens: int | None,
+        llm_provider: str | None,
+        llm_kwargs: dict[str, Any] | None,
+        reasoning_effort: str | None,
+) -> dict[str, Any]:
+    if model is None:
+        raise ValueError("Model cannot be None")
+    if max_tokens is not None and max_tokens > 16001:
+        raise ValueError(
+            f"Max tokens cannot be more than 16,000, but got {max_tokens}")
+
+    kwargs = {
+        'model': model,
+        **(llm_kwargs or {})
+    }
+
+    if model in SUPPORT_REASONING_EFFORT_MODELS:
+        kwargs['reasoning_effort'] = reasoning_effort
+
+    if model not in NO_SUPPORT_TEMPERATURE_MODELS:
+        kwargs['temperature'] = temperature
+        kwargs['max_tokens'] = max_tokens
+
+    if llm_provider == "openai":
+        base_url = os.environ.get("OPENAI_BASE_URL", None)
+        if base_url:
+            kwargs['openai_api_base'] = base_url
+    return kwargs
+
+
+def llm_fallbacks(cfg, tier: str) -> list[dict[str, Any]]:
+    """
+    Fallbacks for a call made with the `tier` LLM ("strategic", "smart" or "fast"),
+    following the chain STRATEGIC_LLM -> SMART_LLM -> FAST_LLM.
+
+    Returns:
+        list[dict[str, Any]]: Overrides for `create_chat_completion(fallbacks=...)`.
+    """
+    tiers = LLM_TIERS[LLM_TIERS.index(tier) + 1:]
+    return [
+        {
+            "llm_provider": getattr(cfg, f"{name}_llm_provider"),
+            "model": getattr(cfg, f"{name}_llm_model"),
+            "max_tokens": getattr(cfg, f"{name}_token_limit"),
+        }
+        for name in tiers
+    ]
 
 
 async def create_chat_completion(
@@ -30,7 +87,11 @@ async def create_chat_completion(
         websocket: Any | None = None,
         llm_kwargs: dict[str, Any] | None = None,
         cost_callback: callable = None,
-        reasoning_effort: str | None = ReasoningEfforts.Medium.value
+        reasoning_effort: str | None = ReasoningEfforts.Medium.value,
+        cache: LLMResponseCache | None = None,
+        cache_query: str | None = None,
+        fallbacks: list[dict[str, Any]] | None = None,
+        priority: Priority = Priority.NORMAL,
 ) -> str:
     """Create a chat completion using the OpenAI API
     Args:
@@ -44,50 +105,70 @@ async def create_chat_completion(
         llm_kwargs (dict[str, Any], optional): Additional LLM keyword arguments. Defaults to None.
         cost_callback: Callback function for updating cost.
         reasoning_effort (str, optional): Reasoning effort for OpenAI's reasoning models. Defaults to 'low'.
+        cache (LLMResponseCache, optional): Response cache to consult first. Ignored when streaming.
+        cache_query (str, optional): The user query inside `messages`, for near-duplicate cache lookups.
+        fallbacks (list[dict[str, Any]], optional): Alternatives tried in order when the call fails,
+            each overriding some of `model`, `llm_provider`, `temperature`, `max_tokens` and
+            `reasoning_effort`. See `llm_fallbacks`. Non-streamed calls that are unusually slow
+            are also hedged with the first fallback on another model.
+        priority (Priority, optional): Rate limiter lane. Report writing should use Priority.HIGH and
+            planning calls Priority.LOW. Defaults to Priority.NORMAL.
     Returns:
         str: The response from the chat completion.
     """
-    # validate input
-    if model is None:
-        raise ValueError("Model cannot be None")
-    if max_tokens is not None and max_tokens > 16001:
-        raise ValueError(
-            f"Max tokens cannot be more than 16,000, but got {max_tokens}")
-
-    # Get the provider from supported providers
-    kwargs = {
-        'model': model,
-        **(llm_kwargs or {})
-    }
-
-    if model in SUPPORT_REASONING_EFFORT_MODELS:
-        kwargs['reasoning_effort'] = reasoning_effort
-
-    if model not in NO_SUPPORT_TEMPERATURE_MODELS:
-        kwargs['temperature'] = temperature
-        kwargs['max_tokens'] = max_tokens
-
-    if llm_provider == "openai":
-        base_url = os.environ.get("OPENAI_BASE_URL", None)
-        if base_url:
-            kwargs['openai_api_base'] = base_url
-
-    provider = get_llm(llm_provider, **kwargs)
-    response = ""
-    # create response
-    for _ in range(10):  # maximum of 10 attempts
-        response = await provider.get_chat_response(
-            messages, stream, websocket
-        )
+    targets = []
+    for override in [{}, *(fallbacks or [])]:
+        target = {
+            "model": model,
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+            "llm_provider": llm_provider,
+            "reasoning_effort": reasoning_effort,
+            **override,
+        }
+        provider_kwargs = _provider_kwargs(llm_kwargs=llm_kwargs, **target)
+        if (target["llm_provider"], provider_kwargs) not in targets:
+            targets.append((target["llm_provider"], provider_kwargs))
+
+    # Streamed responses are shown to the user as they are generated, so they are never cached
+    if stream:
+        cache = None
+    if cache is not None:
+        response = await cache.aget({"llm_provider": llm_provider, **targets[0][1]}, messages, query=cache_query)
+        if response is not None:
+            return response
+
+    async def complete(provider_name: str, kwargs: dict[str, Any]) -> tuple[str, dict[str, Any]]:
+        provider = get_llm(provider_name, **kwargs)
+        limiter = get_rate_limiter(f"{provider_name}:{kwargs['model']}")
+        if limiter is None:
+            response, usage = await provider.get_chat_response_with_usage(
+                messages, stream, websocket
+            )
+        else:
+            tokens = await acount_tokens(str(messages)) + (kwargs.get("max_tokens") or 0) if limiter.counts_tokens else 0
+            async with limiter.slot(tokens, priority):
+                response, usage = await provider.get_chat_response_with_usage(
+                    messages, stream, websocket
+                )
 
         if cost_callback:
-            llm_costs = estimate_llm_cost(str(messages), response)
+            llm_costs = await aestimate_llm_cost(str(messages), response, model=kwargs["model"], usage=usage)
             cost_callback(llm_costs)
+        return response, {"llm_provider": provider_name, **kwargs}
 
-        return response
+    # The settings of whichever target answered, which may be a fallback or hedge rather than the first one
+    response, settings = await call_with_failover(
+        [(f"{name}:{kwargs['model']}", partial(complete, name, kwargs)) for name, kwargs in targets],
+        # A streamed response can't be raced against another one writing to the same output. Streams
+        # are only retried or failed over until their first output is sent (see StreamInterruptedError).
+        hedge=not stream,
+    )
 
-    logging.error(f"Failed to get response from {llm_provider} API")
-    raise RuntimeError(f"Failed to get response from {llm_provider} API")
+    if cache is not None and response:
+        await cache.aset(settings, messages, response, query=cache_query)
+
+    return response
 
 
 async def construct_subtopics(task: str, data: str, config, subtopics: list = []) -> list:
@@ -113,29 +194,27 @@ async def construct_subtopics(task: str, data: str, config, subtopics: list = []
                 "format_instructions": parser.get_format_instructions()},
         )
 
-        kwargs = {
-            'model': config.smart_llm_model,
-            **(config.llm_kwargs or {})
-        }
-
-        if config.smart_llm_model in SUPPORT_REASONING_EFFORT_MODELS:
-            kwargs['reasoning_effort'] = ReasoningEfforts.High.value
-        else:
-            kwargs['temperature'] = config.temperature
-            kwargs['max_tokens'] = config.smart_token_limit
-
-        provider = get_llm(config.smart_llm_provider, **kwargs)
-
-        model = provider.llm
-
-        chain = prompt | model | parser
+        # Rendered and sent through create_chat_completion so it runs asynchronously and can be cached
+        response = await create_chat_completion(
+            model=config.smart_llm_model,
+            messages=[{"role": "user", "content": prompt.format(
+                task=task,
+                data=data,
+                subtopics=subtopics,
+                max_subtopics=config.max_subtopics,
+            )}],
+            temperature=config.temperature,
+            max_tokens=config.smart_token_limit,
+            llm_provider=config.smart_llm_provider,
+            llm_kwargs=config.llm_kwargs,
+            reasoning_effort=ReasoningEfforts.High.value,
+            cache=get_llm_cache(config),
+            cache_query=task,
+            fallbacks=llm_fallbacks(config, "smart"),
+            priority=Priority.LOW,
+        )
 
-        output = chain.invoke({
-            "task": task,
-            "data": data,
-            "subtopics": subtopics,
-            "max_subtopics": config.max_subtopics
-        })
+        output = parser.parse(response)
 
         return output
 
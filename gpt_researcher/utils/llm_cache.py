@@ -0,0 +1,137 @@
+"""
+Response cache for the planning LLM calls (agent choice, sub-queries, subtopics, draft titles).
+"""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import threading
+from collections import deque
+from typing import Any
+
+import numpy as np
+
+from ..context.similarity import normalize, top_k_similar
+from .cache import BaseCache, get_cache
+
+
+class LLMResponseCache:
+    """
+    Caches chat completions by provider, model, sampling settings and messages.
+
+    With `embeddings` and a `similarity_threshold`, a call that passes `query` can also be
+    answered by a previous call whose prompt was identical apart from a near-duplicate query
+    (e.g. "impact of AI on jobs" vs "the impact of AI on jobs"). Prompts whose surrounding
+    text differs, such as ones embedding different search results, never match semantically.
+    """
+
+    def __init__(
+        self,
+        cache: BaseCache,
+        ttl: float | None = 86400,
+        embeddings=None,
+        similarity_threshold: float = 0.0,
+        max_semantic_entries: int = 1000,
+    ):
+        self.cache = cache
+        self.ttl = ttl
+        self.embeddings = embeddings if similarity_threshold > 0 else None
+        self.similarity_threshold = similarity_threshold
+        # Per prompt template: the queries seen with it, as (exact key, unit vector) pairs
+        self._semantic: dict[str, deque] = {}
+        self._semantic_entries = deque()
+        self.max_semantic_entries = max_semantic_entries
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _hash(*parts: Any) -> str:
+        return hashlib.sha256(json.dumps(parts, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+    def _template_key(self, settings: dict, messages: list[dict[str, str]], query: str) -> str:
+        template = [
+            {**message, "content": str(message.get("content", "")).replace(query, "\0query\0")}
+            for message in messages
+        ]
+        return self._hash(settings, template)
+
+    async def aget(self, settings: dict, messages: list[dict[str, str]], query: str | None = None) -> str | None:
+        """
+        Look up a cached response.
+
+        Args:
+            settings (dict): Provider, model and sampling parameters of the call.
+            messages (list[dict[str, str]]): The chat messages.
+            query (str, optional): The user query inserted into the prompt, enabling semantic lookup.
+
+        Returns:
+            str | None: The cached response, or None on a miss.
+        """
+        value = await asyncio.to_thread(self.cache.get, self._hash(settings, messages))
+        if value is None and self.embeddings is not None and query:
+            key = await self._find_similar(self._template_key(settings, messages, query), query)
+            if key is not None:
+                value = await asyncio.to_thread(self.cache.get, key)
+        return value.decode("utf-8") if value is not None else None
+
+    async def aset(self, settings: dict, messages: list[dict[str, str]], response: str, query: str | None = None) -> None:
+        key = self._hash(settings, messages)
+        await asyncio.to_thread(self.cache.set, key, response.encode("utf-8"), self.ttl)
+        if self.embeddings is not None and query:
+            vector = normalize([await self.embeddings.aembed_query(query)])[0]
+            self._remember(self._template_key(settings, messages, query), key, vector)
+
+    async def _find_similar(self, template_key: str, query: str) -> str | None:
+        with self._lock:
+            entries = list(self._semantic.get(template_key, ()))
+        if not entries:
+            return None
+        query_vector = normalize([await self.embeddings.aembed_query(query)])
+        (matches,) = top_k_similar(
+            query_vector, np.vstack([vector for _, vector in entries]), 1, self.similarity_threshold
+        )
+        return entries[matches[0][0]][0] if matches else None
+
+    def _remember(self, template_key: str, key: str, vector: np.ndarray) -> None:
+        with self._lock:
+            self._semantic.setdefault(template_key, deque()).append((key, vector))
+            self._semantic_entries.append(template_key)
+            while len(self._semantic_entries) > self.max_semantic_entries:
+                oldest = self._semantic_entries.popleft()
+                self._semantic[oldest].popleft()
+                if not self._semantic[oldest]:
+                    del self._semantic[oldest]
+
+
+_LLM_CACHES: dict[int, LLMResponseCache] = {}
+
+
+def get_llm_cache(cfg) -> LLMResponseCache | None:
+    """Get the process-wide LLM response cache described by the config, or None when it is disabled."""
+    cache = get_cache(
+        cfg.llm_cache, "llm", cache_dir=cfg.cache_dir, max_entries=cfg.llm_cache_size, url=cfg.llm_cache_url or None
+    )
+    if cache is None:
+        return None
+    llm_cache = _LLM_CACHES.get(id(cache))
+    if llm_cache is None:
+        embeddings = None
+        if cfg.llm_cache_similarity > 0:
+            from ..memory import Memory
+
+            embeddings = Memory(
+                cfg.embedding_provider,
+                cfg.embedding_model,
+                cache=get_cache(cfg.embedding_cache, "embeddings", cache_dir=cfg.cache_dir,
+                                max_entries=cfg.embedding_cache_size),
+                **cfg.embedding_kwargs,
+            ).get_embeddings()
+        llm_cache = LLMResponseCache(
+            cache,
+            ttl=cfg.llm_cache_ttl,
+            embeddings=embeddings,
+            similarity_threshold=cfg.llm_cache_similarity,
+            max_semantic_entries=cfg.llm_cache_size,
+        )
+        _LLM_CACHES[id(cache)] = llm_cache
+    return llm_cache
@@ -1,39 +1,41 @@
+import atexit
 import logging
-import json
 import os
 from datetime import datetime
 from pathlib import Path
 
+from .event_log import EventLog
+
+
 class JSONResearchHandler:
+    """
+    Research events and content, appended to `<json_file minus .json>.jsonl` and compacted
+    into `json_file` by `close()`, which runs at exit at the latest.
+    """
+
     def __init__(self, json_file):
         self.json_file = json_file
-        self.research_data = {
-            "timestamp": datetime.now().isoformat(),
-            "events": [],
-            "content": {
-                "query": "",
-                "sources": [],
-                "context": [],
-                "report": "",
-                "costs": 0.0
-            }
-        }
+        self.event_log = EventLog(f"{os.path.splitext(str(json_file))[0]}.jsonl", summary_path=str(json_file))
+        atexit.register(self.close)
+
+    @property
+    def research_data(self) -> dict:
+        return self.event_log.read()
 
     def log_event(self, event_type: str, data: dict):
-        self.research_data["events"].append({
-            "timestamp": datetime.now().isoformat(),
-            "type": event_type,
-            "data": data
-        })
-        self._save_json()
+        self.event_log.log_event(event_type, data)
 
     def update_content(self, key: str, value):
-        self.research_data["content"][key] = value
-        self._save_json()
+        self.event_log.update_content({key: value})
+
+    def compact(self) -> dict:
+        """Write the summary JSON of everything logged so far."""
+        return self.event_log.compact()
 
-    def _save_json(self):
-        with open(self.json_file, 'w') as f:
-            json.dump(self.research_data, f, indent=2)
+    def close(self) -> dict:
+        summary = self.compact()
+        self.event_log.close()
+        return summary
 
 def setup_research_logging():
     # Create logs directory if it doesn't exist
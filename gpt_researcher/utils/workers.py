@@ -1,15 +1,92 @@
 import asyncio
-from concurrent.futures import ThreadPoolExecutor
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from contextlib import asynccontextmanager
+from typing import Any, Callable
+
+from .host_scheduler import HostScheduler
+
+logger = logging.getLogger(__name__)
+
+_PROCESS_POOLS: dict[int, ProcessPoolExecutor] = {}
+_PROCESS_POOLS_LOCK = threading.Lock()
+
+
+def get_process_pool(max_workers: int) -> ProcessPoolExecutor | None:
+    """
+    Get the process pool shared by every research in this process, or None when `max_workers` is 0.
+
+    Workers are spawned rather than forked since the event loop and thread pools of the
+    parent must not be copied into them.
+    """
+    if max_workers <= 0:
+        return None
+    with _PROCESS_POOLS_LOCK:
+        pool = _PROCESS_POOLS.get(max_workers)
+        if pool is None:
+            pool = ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context("spawn"))
+            _PROCESS_POOLS[max_workers] = pool
+        return pool
+
+
+def discard_process_pool(pool: Executor) -> None:
+    """Drop a broken process pool, so that the next `get_process_pool` call starts a new one."""
+    with _PROCESS_POOLS_LOCK:
+        for max_workers, cached in list(_PROCESS_POOLS.items()):
+            if cached is pool:
+                del _PROCESS_POOLS[max_workers]
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+async def run_in_executor(executor: Executor | None, func: Callable[..., Any], *args: Any) -> Any:
+    """
+    Run `func(*args)` in `executor`, or in a thread without one.
+
+    A process pool is broken for good once one of its workers dies (e.g. killed for using
+    too much memory). It is then discarded and this call runs in a thread instead.
+    """
+    loop = asyncio.get_running_loop()
+    if executor is not None:
+        try:
+            return await loop.run_in_executor(executor, func, *args)
+        except BrokenProcessPool as e:
+            logger.warning(f"Process pool broken, running {func.__name__} in a thread: {e}")
+            discard_process_pool(executor)
+    return await loop.run_in_executor(None, func, *args)
 
 
 class WorkerPool:
-    def __init__(self, max_workers: int):
+    def __init__(
+        self,
+        max_workers: int,
+        parse_processes: int = 0,
+        host_concurrency: int = 2,
+        host_delay: float = 0.0,
+        respect_robots: bool = False,
+        client_sessions=None,
+    ):
         self.max_workers = max_workers
+        self.parse_processes = parse_processes
         self.executor = ThreadPoolExecutor(max_workers=max_workers)
-        self.semaphore = asyncio.Semaphore(max_workers)
+        self.hosts = HostScheduler(
+            max_workers,
+            per_host_concurrency=host_concurrency,
+            per_host_delay=host_delay,
+            respect_robots=respect_robots,
+        )
+        # HTTP connections of the async fetchers scraping for this pool (see scraper.fetcher.ClientSessions)
+        self.client_sessions = client_sessions
+
+    @property
+    def process_executor(self) -> ProcessPoolExecutor | None:
+        """The shared process pool for parsing, replaced by a new one if it broke."""
+        return get_process_pool(self.parse_processes)
 
     @asynccontextmanager
-    async def throttle(self):
-        async with self.semaphore:
+    async def throttle(self, url: str = ""):
+        """Wait for a worker slot to scrape `url`, within the per-host limits."""
+        async with self.hosts.slot(url):
             yield
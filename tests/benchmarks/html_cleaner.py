@@ -0,0 +1,96 @@
+"""
+Benchmark: single-pass parse_html vs. the BeautifulSoup clean_soup/get_text_from_soup/
+get_relevant_images/extract_title pipeline, over the saved pages in html_corpus/.
+
+Each implementation runs in a fresh process so the reported peak RSS growth is not
+polluted by the other one (lxml allocates outside of the Python heap, so tracemalloc
+would miss most of it).
+
+Usage:
+    python -m tests.benchmarks.html_cleaner --repeat 20
+    python -m tests.benchmarks.html_cleaner --corpus ~/saved_pages
+"""
+import argparse
+import multiprocessing
+import resource
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from bs4 import BeautifulSoup
+
+from gpt_researcher.scraper.utils import (
+    clean_soup,
+    extract_title,
+    get_relevant_images,
+    get_text_from_soup,
+    parse_html,
+)
+
+CORPUS_DIR = Path(__file__).parent / "html_corpus"
+PAGE_URL = "https://example.com/section/page.html"
+
+
+def legacy_parse(html: bytes, url: str):
+    soup = BeautifulSoup(html, "lxml")
+    soup = clean_soup(soup)
+    images = [(image["url"], image["score"]) for image in get_relevant_images(soup, url)]
+    return get_text_from_soup(soup), images, str(extract_title(soup) or "")
+
+
+IMPLEMENTATIONS = {
+    "BeautifulSoup pipeline": legacy_parse,
+    "parse_html single pass": parse_html,
+}
+
+
+def load_corpus(corpus: Path) -> list[bytes]:
+    pages = [path.read_bytes() for path in sorted(corpus.glob("*.htm*"))]
+    if not pages:
+        raise SystemExit(f"No .html files found in {corpus}")
+    return pages
+
+
+def run(name: str, pages: list[bytes], repeat: int) -> tuple[float, int]:
+    parse = IMPLEMENTATIONS[name]
+    parse(pages[0], PAGE_URL)  # warm up imports and parser state
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for html in pages:
+            parse(html, PAGE_URL)
+    seconds = time.perf_counter() - start
+    rss_growth_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - rss_before
+    return seconds, rss_growth_kb
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corpus", type=Path, default=CORPUS_DIR)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    pages = load_corpus(args.corpus)
+    mismatches = [
+        index for index, html in enumerate(pages)
+        if legacy_parse(html, PAGE_URL) != parse_html(html, PAGE_URL)
+    ]
+
+    total_pages = len(pages) * args.repeat
+    total_mb = sum(map(len, pages)) * args.repeat / 1024 / 1024
+    print(f"{len(pages)} pages x {args.repeat} repeats ({total_mb:.1f} MB of HTML)")
+    if mismatches:
+        print(f"warning: outputs differ for {len(mismatches)} page(s): {mismatches}")
+
+    context = multiprocessing.get_context("spawn")
+    for name in IMPLEMENTATIONS:
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+            seconds, rss_growth_kb = pool.submit(run, name, pages, args.repeat).result()
+        print(
+            f"{name:<26} {total_pages / seconds:9.1f} pages/s  "
+            f"{total_mb / seconds:7.2f} MB/s  peak RSS +{rss_growth_kb / 1024:.1f} MB"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Micro-benchmark: native SimilarityFilter vs. langchain's EmbeddingsFilter pipeline.
+
+Embeddings are precomputed random vectors so only the similarity stage is measured.
+
+Usage:
+    python -m tests.benchmarks.similarity_filter --chunks 20000 --queries 8
+"""
+import argparse
+import asyncio
+import time
+
+import numpy as np
+from langchain.retrievers.document_compressors import EmbeddingsFilter
+from langchain.schema import Document
+from langchain_core.embeddings import Embeddings
+
+from gpt_researcher.context.similarity import SimilarityFilter
+
+
+class LookupEmbeddings(Embeddings):
+    """Returns precomputed vectors for known texts."""
+
+    def __init__(self, vectors: dict[str, list[float]]):
+        self.vectors = vectors
+
+    def embed_documents(self, texts):
+        return [self.vectors[text] for text in texts]
+
+    def embed_query(self, text):
+        return self.vectors[text]
+
+
+def build_corpus(n_chunks: int, n_queries: int, dim: int):
+    rng = np.random.default_rng(0)
+    chunk_texts = [f"chunk {i}" for i in range(n_chunks)]
+    queries = [f"query {i}" for i in range(n_queries)]
+    vectors = rng.standard_normal((n_chunks + n_queries, dim)).astype(np.float32)
+    lookup = dict(zip(chunk_texts + queries, vectors.tolist()))
+    documents = [Document(page_content=text) for text in chunk_texts]
+    return LookupEmbeddings(lookup), documents, queries
+
+
+def run_langchain(embeddings, documents, queries, k, threshold):
+    relevance_filter = EmbeddingsFilter(embeddings=embeddings, similarity_threshold=threshold, k=k)
+    return [relevance_filter.compress_documents(documents, query) for query in queries]
+
+
+def run_native(embeddings, documents, queries, k, threshold):
+    relevance_filter = SimilarityFilter(embeddings, similarity_threshold=threshold, k=k)
+    return asyncio.run(relevance_filter.afilter(queries, documents))
+
+
+def timed(fn, *args, repeat: int):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--chunks", type=int, default=10000)
+    parser.add_argument("--queries", type=int, default=8)
+    parser.add_argument("--dim", type=int, default=1536)
+    parser.add_argument("--k", type=int, default=20)
+    parser.add_argument("--threshold", type=float, default=0.0)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    embeddings, documents, queries = build_corpus(args.chunks, args.queries, args.dim)
+    params = (embeddings, documents, queries, args.k, args.threshold)
+
+    results = {
+        "langchain EmbeddingsFilter": timed(run_langchain, *params, repeat=args.repeat),
+        "SimilarityFilter": timed(run_native, *params, repeat=args.repeat),
+    }
+
+    print(f"{args.chunks} chunks x {args.queries} queries, dim={args.dim}, k={args.k}")
+    for name, seconds in results.items():
+        throughput = args.chunks * args.queries / seconds
+        print(f"{name:<28} {seconds * 1000:9.1f} ms  {throughput:14,.0f} chunk-queries/s")
+
+
+if __name__ == "__main__":
+    main()
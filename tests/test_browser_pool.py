@@ -0,0 +1,199 @@
+import asyncio
+import threading
+
+import pytest
+
+from gpt_researcher.scraper.browser.nodriver_scraper import NoDriverScraper
+from gpt_researcher.scraper.browser.pool import CookieJar, DriverPool
+
+
+class FakeTab:
+    def __init__(self, url):
+        self.urls = [url]
+        self.closed = False
+
+    async def get(self, url):
+        self.urls.append(url)
+        return self
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeBrowserDriver:
+    def __init__(self):
+        self.tabs = []
+        self.stopped = False
+
+    async def get(self, url, new_tab=False, new_window=False):
+        tab = FakeTab(url)
+        self.tabs.append(tab)
+        return tab
+
+    async def stop(self):
+        self.stopped = True
+
+
+@pytest.fixture
+def drivers(monkeypatch):
+    started = []
+
+    async def start_driver(headless=False):
+        started.append(FakeBrowserDriver())
+        return started[-1]
+
+    monkeypatch.setattr(NoDriverScraper, "pools", {})
+    monkeypatch.setattr(NoDriverScraper, "cookie_jar", CookieJar())
+    monkeypatch.setattr(NoDriverScraper, "start_driver", start_driver)
+    monkeypatch.setattr(NoDriverScraper, "max_browsers", 1)
+    monkeypatch.setattr(NoDriverScraper, "max_tabs_per_browser", 2)
+    return started
+
+
+async def scrape(url):
+    browser = await NoDriverScraper.get_browser()
+    page = await browser.get(url)
+    await asyncio.sleep(0.01)
+    await browser.close_page(page)
+    await NoDriverScraper.release_browser(browser)
+    return page
+
+
+@pytest.mark.asyncio
+async def test_browser_is_kept_warm_and_tabs_are_reused(drivers):
+    pages = await asyncio.gather(*(scrape(f"https://example{i}.com") for i in range(4)))
+
+    assert len(drivers) == 1
+    assert not drivers[0].stopped
+    # At most two tabs at a time, reused for the next pages
+    assert len(drivers[0].tabs) == 2
+    assert len({id(page) for page in pages}) == 2
+    assert sorted(url for tab in drivers[0].tabs for url in tab.urls if url != "about:blank") == \
+        [f"https://example{i}.com" for i in range(4)]
+    assert not any(tab.closed for tab in drivers[0].tabs)
+
+
+@pytest.mark.asyncio
+async def test_browser_is_recycled_after_max_pages(drivers, monkeypatch):
+    monkeypatch.setattr(NoDriverScraper, "max_pages_per_browser", 2)
+
+    for i in range(3):
+        await scrape(f"https://example{i}.com")
+
+    assert len(drivers) == 2
+    assert drivers[0].stopped and not drivers[1].stopped
+    assert len(NoDriverScraper.get_pool().browsers) == 1
+
+
+@pytest.mark.asyncio
+async def test_idle_browser_is_stopped(drivers, monkeypatch):
+    monkeypatch.setattr(NoDriverScraper, "idle_timeout", 0.02)
+
+    await scrape("https://example.com")
+    await asyncio.sleep(0.05)
+
+    assert drivers[0].stopped
+    assert not NoDriverScraper.get_pool().browsers
+
+
+@pytest.mark.asyncio
+async def test_browser_with_a_lost_connection_is_replaced(drivers):
+    browser = await NoDriverScraper.get_browser()
+    browser.record_error(ConnectionResetError("websocket closed"))
+    await NoDriverScraper.release_browser(browser)
+
+    await scrape("https://example.com")
+
+    assert len(drivers) == 2
+    assert drivers[0].stopped and not drivers[1].stopped
+
+
+def test_browsers_of_a_closed_loop_are_killed_not_reused(drivers, monkeypatch):
+    killed = []
+    monkeypatch.setattr(NoDriverScraper.Browser, "kill", lambda browser: killed.append(browser.driver))
+
+    asyncio.run(scrape("https://example.com"))
+    asyncio.run(scrape("https://example.org"))
+
+    assert len(drivers) == 2
+    assert killed == [drivers[0]]
+    assert len(NoDriverScraper.pools) == 1
+
+
+class FakeSeleniumDriver:
+    def __init__(self):
+        self.alive = True
+        self.quit_called = False
+
+    @property
+    def current_url(self):
+        if not self.alive:
+            raise ConnectionError("driver is gone")
+        return "about:blank"
+
+    def quit(self):
+        self.quit_called = True
+
+
+def test_driver_pool_reuses_healthy_drivers_and_replaces_others():
+    pool = DriverPool(max_drivers=1, max_pages=3)
+    created = []
+
+    def create():
+        created.append(FakeSeleniumDriver())
+        return created[-1]
+
+    with pool.lease("chrome", create) as first:
+        pass
+    with pool.lease("chrome", create) as second:
+        pass
+    assert second is first
+
+    first.alive = False
+    with pool.lease("chrome", create) as third:
+        pass
+    assert third is not first and first.quit_called
+
+    # The replacement is retired after max_pages
+    for _ in range(2):
+        with pool.lease("chrome", create):
+            pass
+    assert third.quit_called
+    assert len(created) == 2
+
+
+def test_driver_pool_waits_for_a_free_driver():
+    pool = DriverPool(max_drivers=1)
+    release = threading.Event()
+    leased = []
+
+    def hold():
+        with pool.lease("chrome", FakeSeleniumDriver) as driver:
+            leased.append(driver)
+            release.wait()
+
+    holder = threading.Thread(target=hold)
+    holder.start()
+    while not leased:
+        pass
+    waiter = threading.Thread(target=hold)
+    waiter.start()
+    waiter.join(0.05)
+    assert len(leased) == 1
+
+    release.set()
+    holder.join()
+    waiter.join()
+    assert leased[0] is leased[1]
+
+
+def test_cookie_jar_matches_parent_domains():
+    jar = CookieJar()
+    jar.update([
+        {"name": "a", "value": "1", "domain": ".google.com", "path": "/"},
+        {"name": "b", "value": "2", "domain": "example.com", "path": "/"},
+    ])
+    jar.update([{"name": "a", "value": "3", "domain": ".google.com", "path": "/"}])
+
+    assert jar.for_domain("www.google.com") == [{"name": "a", "value": "3", "domain": ".google.com", "path": "/"}]
+    assert len(jar) == 2
@@ -0,0 +1,88 @@
+import asyncio
+import time
+
+from langchain_core.embeddings import Embeddings
+
+from gpt_researcher.memory.embedding_cache import CachedEmbeddings
+from gpt_researcher.memory.embeddings import embeddings_cache_namespace
+from gpt_researcher.utils.cache import MemoryCache, SQLiteCache, get_cache
+
+
+class CountingEmbeddings(Embeddings):
+    def __init__(self):
+        self.embedded = []
+
+    def embed_documents(self, texts):
+        self.embedded.extend(texts)
+        return [[float(len(text)), 1.0] for text in texts]
+
+    def embed_query(self, text):
+        self.embedded.append(text)
+        return [float(len(text)), 0.0]
+
+
+def test_memory_cache_evicts_least_recently_used():
+    cache = MemoryCache(max_entries=2)
+    cache.set("a", b"1")
+    cache.set("b", b"2")
+    cache.get("a")
+    cache.set("c", b"3")
+
+    assert cache.mget(["a", "b", "c"]) == [b"1", None, b"3"]
+
+
+def test_memory_cache_expires_entries():
+    cache = MemoryCache()
+    cache.set("a", b"1", ttl=0.01)
+    time.sleep(0.02)
+
+    assert cache.get("a") is None
+
+
+def test_sqlite_cache_persists_and_caps_size(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    cache = SQLiteCache(path, max_bytes=4)
+    cache.set("a", b"11")
+    time.sleep(0.01)
+    cache.set("b", b"22")
+    time.sleep(0.01)
+    cache.set("c", b"33")
+
+    reopened = SQLiteCache(path)
+    assert reopened.mget(["a", "b", "c"]) == [None, b"22", b"33"]
+
+
+def test_get_cache_shares_instances(tmp_path):
+    assert get_cache("none", "test") is None
+    assert get_cache("memory", "test") is get_cache("memory", "test")
+    assert get_cache("sqlite", "test", cache_dir=str(tmp_path)) is not get_cache("memory", "test")
+
+
+def test_cached_embeddings_only_embeds_new_texts():
+    underlying = CountingEmbeddings()
+    embeddings = CachedEmbeddings(underlying, MemoryCache(), namespace="test:model")
+
+    first = embeddings.embed_documents(["alpha", "beta", "alpha"])
+    second = asyncio.run(embeddings.aembed_documents(["beta", "gamma"]))
+
+    assert first == [[5.0, 1.0], [4.0, 1.0], [5.0, 1.0]]
+    assert second == [[4.0, 1.0], [5.0, 1.0]]
+    assert underlying.embedded == ["alpha", "beta", "gamma"]
+
+    # Queries are cached separately from documents with the same text
+    assert embeddings.embed_query("alpha") == [5.0, 0.0]
+    assert embeddings.embed_query("alpha") == [5.0, 0.0]
+    assert underlying.embedded == ["alpha", "beta", "gamma", "alpha"]
+
+
+def test_embeddings_cache_namespace_covers_kwargs_that_change_the_vectors():
+    plain = embeddings_cache_namespace("openai", "text-embedding-3-large", {})
+    small = embeddings_cache_namespace("openai", "text-embedding-3-large", {"dimensions": 256})
+
+    assert plain == "openai:text-embedding-3-large"
+    assert small != plain
+    assert small != embeddings_cache_namespace("openai", "text-embedding-3-large", {"dimensions": 1024})
+    # Credentials and transport settings don't change the vectors
+    assert embeddings_cache_namespace(
+        "openai", "text-embedding-3-large", {"dimensions": 256, "openai_api_key": "sk-test", "max_retries": 5}
+    ) == small
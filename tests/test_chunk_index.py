@@ -0,0 +1,106 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from langchain_core.embeddings import Embeddings
+
+from gpt_researcher.context.chunk_index import ChunkIndex
+from gpt_researcher.context.similarity import normalize, top_k_similar
+from gpt_researcher.skills.context_manager import ContextManager
+
+
+class KeywordEmbeddings(Embeddings):
+    """Embeds text as keyword counts so similarity is predictable."""
+
+    keywords = ["python", "rust", "cooking"]
+
+    def __init__(self):
+        self.calls = 0
+
+    def embed_documents(self, texts):
+        self.calls += 1
+        return [self.embed_query(text) for text in texts]
+
+    def embed_query(self, text):
+        return [float(text.lower().count(keyword)) for keyword in self.keywords]
+
+
+PAGES = [
+    {"url": "https://a.com", "title": "A", "raw_content": "Python python python tips."},
+    {"url": "https://b.com", "title": "B", "raw_content": "Rust ownership and rust traits."},
+    {"url": "https://c.com", "title": "C", "raw_content": "Cooking pasta at home."},
+]
+
+
+@pytest.mark.asyncio
+async def test_pages_are_embedded_once():
+    embeddings = KeywordEmbeddings()
+    index = ChunkIndex(embeddings)
+
+    first = await index.add_pages(PAGES)
+    second = await index.add_pages(PAGES[:2])
+
+    assert len(first) == 3
+    assert second == []
+    assert embeddings.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_search_ranks_and_restricts_to_given_pages():
+    index = ChunkIndex(KeywordEmbeddings())
+    await index.add_pages(PAGES)
+
+    results = await index.search("rust", PAGES, k=2, threshold=0.5)
+    assert [doc.metadata["source"] for doc in results] == ["https://b.com"]
+
+    results = await index.search("rust", [PAGES[0], PAGES[2]], k=2, threshold=0.5)
+    assert results == []
+
+
+def test_top_k_similar_scores_a_batch_of_queries():
+    chunks = normalize([[1.0, 0.0], [0.6, 0.8], [0.0, 1.0]])
+    queries = normalize([[1.0, 0.0], [0.0, 1.0]])
+
+    matches = top_k_similar(queries, chunks, k=2, threshold=0.5)
+
+    assert [[row for row, _ in query_matches] for query_matches in matches] == [[0, 1], [2, 1]]
+    assert matches[0][0][1] == pytest.approx(1.0)
+
+
+@pytest.mark.asyncio
+async def test_index_pages_embeds_while_scraping(monkeypatch):
+    priced = []
+
+    async def fake_embedding_cost(model, docs, provider=None):
+        priced.append((provider, model))
+        return 0.0
+
+    monkeypatch.setattr("gpt_researcher.skills.context_manager.aestimate_embedding_cost", fake_embedding_cost)
+    embeddings = KeywordEmbeddings()
+    researcher = SimpleNamespace(
+        cfg=SimpleNamespace(embedding_provider="openai", embedding_model="text-embedding-3-large"),
+        memory=SimpleNamespace(get_embeddings=lambda: embeddings),
+        verbose=False,
+        websocket=None,
+        add_costs=lambda cost: None,
+    )
+    context_manager = ContextManager(researcher)
+    events = []
+
+    async def scrape():
+        yield PAGES[0]
+        await asyncio.sleep(0.05)
+        events.append(("scraped", embeddings.calls))
+        yield PAGES[1]
+        yield PAGES[2]
+
+    pages = await context_manager.index_pages(scrape())
+
+    assert pages == PAGES
+    # The first page was embedded while the others were still being scraped,
+    # and the two pages that arrived together were embedded in one batch
+    assert events == [("scraped", 1)]
+    assert embeddings.calls == 2
+    # Embeddings are priced for the configured model
+    assert priced == [("openai", "text-embedding-3-large")] * 2
+    assert await context_manager.get_similar_content_by_query("rust", pages)
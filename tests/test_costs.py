@@ -0,0 +1,85 @@
+import threading
+
+import pytest
+
+from gpt_researcher.utils import costs
+
+
+class FakeEncoding:
+    """Counts encodes and treats every word as a token."""
+
+    def __init__(self):
+        self.encoded = 0
+
+    def encode(self, text):
+        self.encoded += 1
+        return text.split()
+
+
+@pytest.fixture
+def encoding(monkeypatch):
+    fake = FakeEncoding()
+    monkeypatch.setattr(costs, "_get_encoding", lambda name: fake)
+    monkeypatch.setattr(costs, "_encoding_for_model", lambda model: fake)
+    costs._document_tokens.clear()
+    yield fake
+    costs._document_tokens.clear()
+
+
+def test_provider_usage_and_model_prices_are_preferred(encoding):
+    usage = {"input_tokens": 1000000, "output_tokens": 100000}
+
+    assert costs.estimate_llm_cost("prompt", "answer", model="gpt-4o-mini", usage=usage) == pytest.approx(0.15 + 0.06)
+    assert costs.estimate_llm_cost("prompt", "answer", model="deepseek/deepseek-reasoner", usage=usage) == \
+        pytest.approx(0.55 + 0.219)
+    assert costs.estimate_llm_cost("prompt", "answer", model="unknown-model", usage=usage) == pytest.approx(5 + 1.5)
+    assert encoding.encoded == 0
+
+
+@pytest.mark.asyncio
+async def test_long_texts_are_tokenized_off_the_event_loop(encoding, monkeypatch):
+    threads = []
+
+    def count_tokens(text):
+        threads.append(threading.current_thread())
+        return len(text.split())
+
+    monkeypatch.setattr(costs, "count_tokens", count_tokens)
+    long_prompt = "word " * costs.OFFLOAD_THRESHOLD
+
+    cost = await costs.aestimate_llm_cost(long_prompt, "short answer", model="gpt-4o")
+
+    assert cost == pytest.approx((costs.OFFLOAD_THRESHOLD * 2.5 + 2 * 10) / 1000000)
+    assert sorted(thread is threading.main_thread() for thread in threads) == [False, True]
+
+
+def test_embedding_token_counts_are_memoized(encoding):
+    docs = ["first chunk", "second chunk here"]
+
+    cost = costs.estimate_embedding_cost("text-embedding-3-small", docs)
+    costs.estimate_embedding_cost("text-embedding-3-small", docs)
+
+    assert cost == pytest.approx(5 * 0.02 / 1000000)
+    assert encoding.encoded == 2
+
+
+def test_memoized_token_counts_dont_keep_the_texts(encoding, monkeypatch):
+    monkeypatch.setattr(costs, "DOCUMENT_TOKEN_CACHE_SIZE", 2)
+    docs = ["word " * 1000, "first", "second"]
+
+    costs.estimate_embedding_cost("text-embedding-3-small", docs)
+
+    assert len(costs._document_tokens) == 2
+    assert all(len(key) == 16 for key in costs._document_tokens)
+    # The least recently used count was evicted
+    costs.estimate_embedding_cost("text-embedding-3-small", docs[:1])
+    assert encoding.encoded == 4
+
+
+def test_embeddings_are_priced_for_the_configured_model(encoding):
+    docs = ["one two three four"]
+
+    assert costs.estimate_embedding_cost("text-embedding-3-large", docs, provider="openai") == \
+        pytest.approx(4 * 0.13 / 1000000)
+    assert costs.estimate_embedding_cost("openai/text-embedding-ada-002", docs) == pytest.approx(4 * 0.10 / 1000000)
+    assert costs.estimate_embedding_cost("nomic-embed-text", docs, provider="ollama") == 0.0
@@ -0,0 +1,109 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+import gpt_researcher
+from gpt_researcher.skills.deep_research import DeepResearchSkill
+
+DELAYS = {"slow": 0.3}
+STARTED = []
+CANCELLED = []
+
+
+class FakeResearcher:
+    def __init__(self, query, **kwargs):
+        self.query = query
+        self.visited_urls = {f"https://example.com/{query}"}
+        self.research_sources = []
+
+    async def conduct_research(self):
+        STARTED.append(self.query)
+        try:
+            await asyncio.sleep(DELAYS.get(self.query, 0.05))
+        except asyncio.CancelledError:
+            CANCELLED.append(self.query)
+            raise
+        return f"context for {self.query}"
+
+    def get_costs(self):
+        return 0.5
+
+
+class Parent:
+    def __init__(self, **cfg):
+        self.cfg = SimpleNamespace(deep_research_concurrency=2, **cfg)
+        self.websocket = None
+        self.tone = None
+        self.headers = {}
+        self.visited_urls = set()
+        self.session = None
+        self.costs = 0.0
+
+    def get_costs(self):
+        return self.costs
+
+    def add_costs(self, cost):
+        self.costs += cost
+
+
+@pytest.fixture
+def skill(monkeypatch):
+    monkeypatch.setattr(gpt_researcher, "GPTResearcher", FakeResearcher)
+    STARTED.clear()
+    CANCELLED.clear()
+
+    def make(**cfg):
+        skill = DeepResearchSkill(Parent(**cfg))
+
+        async def generate_search_queries(query, num_queries=3):
+            if query == "root":
+                names = ["slow", "fast"]
+            else:
+                parent = query.split("goal:")[1].split()[0]
+                names = [f"{parent}.{i}" for i in range(num_queries)]
+            return [{"query": name, "researchGoal": name} for name in names][:num_queries]
+
+        async def process_research_results(query, context):
+            return {"learnings": [f"learned {query}"], "followUpQuestions": [], "citations": {}}
+
+        skill.generate_search_queries = generate_search_queries
+        skill.process_research_results = process_research_results
+        return skill
+
+    return make
+
+
+@pytest.mark.asyncio
+async def test_follow_ups_start_without_waiting_for_the_level(skill):
+    results = await skill().deep_research("root", 2, 2)
+
+    # Both follow-ups of "fast" ran while "slow" was still being researched
+    assert STARTED.index("fast.1") < len(STARTED) - 2
+    assert STARTED[-2:] == ["slow.0", "slow.1"]
+    assert sorted(results["learnings"]) == sorted(f"learned {query}" for query in STARTED)
+    assert len(results["context"]) == 6
+
+
+@pytest.mark.asyncio
+async def test_query_and_cost_budgets_stop_the_research(skill):
+    await skill(deep_research_max_queries=3).deep_research("root", 2, 3)
+    assert len(STARTED) == 3
+
+    STARTED.clear()
+    limited = skill(deep_research_cost_limit=1.0)
+    await limited.deep_research("root", 2, 3)
+    assert len(STARTED) == 3
+    assert limited.researcher.get_costs() == 1.5
+
+
+@pytest.mark.asyncio
+async def test_time_budget_cancels_running_queries(skill, monkeypatch):
+    # Without the time budget, "slow" would outlast the wait_for below
+    monkeypatch.setitem(DELAYS, "slow", 60)
+
+    results = await asyncio.wait_for(skill(deep_research_time_limit=0.5).deep_research("root", 2, 2), 10)
+
+    assert "slow" in CANCELLED
+    assert "learned slow" not in results["learnings"]
+    assert "learned fast" in results["learnings"]
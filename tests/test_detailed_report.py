@@ -0,0 +1,133 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from backend.report_type.detailed_report.detailed_report import DetailedReport
+from gpt_researcher.skills.researcher import ResearchConductor
+
+
+class FakeAssistant:
+    running = 0
+    max_running = 0
+    finished = []
+
+    def __init__(self, task, waits_for=None, done=None):
+        self.task = task
+        self.waits_for = waits_for
+        self.done = done
+
+    async def conduct_research(self):
+        FakeAssistant.running += 1
+        FakeAssistant.max_running = max(FakeAssistant.max_running, FakeAssistant.running)
+        try:
+            await asyncio.sleep(0.01)
+            if self.waits_for is not None:
+                await self.waits_for.wait()
+        finally:
+            FakeAssistant.running -= 1
+        FakeAssistant.finished.append(self.task)
+        if self.done is not None:
+            self.done.set()
+
+
+def make_report(concurrency=2):
+    FakeAssistant.running = FakeAssistant.max_running = 0
+    FakeAssistant.finished = []
+    report = DetailedReport.__new__(DetailedReport)
+    report.gpt_researcher = SimpleNamespace(cfg=SimpleNamespace(subtopic_concurrency=concurrency))
+    report.existing_headers = []
+    return report
+
+
+@pytest.mark.asyncio
+async def test_subtopics_are_researched_concurrently_and_written_in_order():
+    report = make_report()
+    b_done = asyncio.Event()
+    # "a" can only finish once "b" did, which requires researching them at the same time
+    assistants = {"a": {"waits_for": b_done}, "b": {"done": b_done}, "c": {}, "d": {}}
+    written = []
+
+    report._create_subtopic_assistant = lambda subtopic, shared_urls=None: FakeAssistant(
+        subtopic["task"], **assistants[subtopic["task"]]
+    )
+
+    async def write(subtopic, assistant):
+        # Each section sees the headers of the ones written before it
+        assert [headers["subtopic task"] for headers in report.existing_headers] == written
+        written.append(assistant.task)
+        report.existing_headers.append({"subtopic task": assistant.task, "headers": []})
+        return {"topic": subtopic, "report": f"# {assistant.task}"}
+
+    report._write_subtopic_report = write
+
+    reports, body = await asyncio.wait_for(
+        report._generate_subtopic_reports([{"task": task} for task in assistants]), 5
+    )
+
+    assert FakeAssistant.finished.index("b") < FakeAssistant.finished.index("a")
+    assert written == ["a", "b", "c", "d"]
+    assert body == "\n\n\n# a\n\n\n# b\n\n\n# c\n\n\n# d"
+    assert FakeAssistant.max_running == 2
+
+
+@pytest.mark.asyncio
+async def test_failed_report_cancels_and_awaits_the_remaining_research():
+    report = make_report()
+    never = asyncio.Event()
+    report._create_subtopic_assistant = lambda subtopic, shared_urls=None: FakeAssistant(
+        subtopic["task"], waits_for=never if subtopic["task"] != "a" else None
+    )
+
+    async def write(subtopic, assistant):
+        raise RuntimeError("LLM unavailable")
+
+    report._write_subtopic_report = write
+
+    with pytest.raises(RuntimeError):
+        await report._generate_subtopic_reports([{"task": task} for task in "abc"])
+
+    # The research still running was cancelled and has finished unwinding
+    assert FakeAssistant.running == 0
+
+
+class FakeContextManager:
+    async def index_pages(self, pages):
+        return [page async for page in pages]
+
+    async def get_similar_content_by_query(self, query, pages):
+        return [page["url"] for page in pages]
+
+
+class FakeScraperManager:
+    async def browse_urls_iter(self, urls, query):
+        for url in urls:
+            yield {"url": url, "raw_content": url}
+
+
+def make_conductor(shared_urls):
+    return ResearchConductor(SimpleNamespace(
+        query="subtopic",
+        visited_urls=set(),
+        shared_urls=shared_urls,
+        verbose=False,
+        websocket=None,
+        vector_store=None,
+        context_manager=FakeContextManager(),
+        scraper_manager=FakeScraperManager(),
+    ))
+
+
+@pytest.mark.asyncio
+async def test_subtopics_share_web_results_but_each_scrape_source_urls():
+    shared_urls = set()
+    first, second = make_conductor(shared_urls), make_conductor(shared_urls)
+
+    assert await first._get_context_by_urls(["https://source"]) == ["https://source"]
+    assert await first._get_new_urls(["https://a", "https://b"]) == ["https://a", "https://b"]
+
+    # The source urls are scraped again for the second subtopic, web results the first scraped are not
+    assert await second._get_context_by_urls(["https://source"]) == ["https://source"]
+    assert await second._get_new_urls(["https://b", "https://c"]) == ["https://c"]
+    assert shared_urls == {"https://a", "https://b", "https://c"}
+    assert second.researcher.visited_urls == {"https://source", "https://c"}
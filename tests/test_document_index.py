@@ -0,0 +1,92 @@
+import os
+
+import pytest
+from langchain_core.documents import Document
+
+from gpt_researcher.document import DocumentLoader
+from gpt_researcher.document.index import LocalDocumentIndex
+
+
+@pytest.fixture
+def corpus(tmp_path):
+    docs = tmp_path / "docs"
+    (docs / "notes").mkdir(parents=True)
+    (docs / "a.txt").write_text("alpha")
+    (docs / "notes" / "b.txt").write_text("beta")
+    return docs
+
+
+@pytest.fixture
+def index(tmp_path):
+    return LocalDocumentIndex(str(tmp_path / "cache" / "documents.sqlite"))
+
+
+@pytest.fixture
+def parsed(monkeypatch):
+    calls = []
+
+    async def load_text(self, file_path, file_extension):
+        calls.append(os.path.basename(file_path))
+        with open(file_path) as f:
+            return [Document(page_content=f.read(), metadata={"source": file_path})]
+
+    monkeypatch.setattr(DocumentLoader, "_load_document", load_text)
+    return calls
+
+
+def contents(docs):
+    return sorted((doc["url"], doc["raw_content"]) for doc in docs)
+
+
+@pytest.mark.asyncio
+async def test_only_changed_files_are_parsed_again(corpus, index, parsed):
+    first = await DocumentLoader(str(corpus), index=index).load()
+    assert contents(first) == [("a.txt", "alpha"), ("b.txt", "beta")]
+    assert sorted(parsed) == ["a.txt", "b.txt"]
+
+    parsed.clear()
+    (corpus / "a.txt").write_text("alpha, revised")
+    (corpus / "c.txt").write_text("gamma")
+    second = await DocumentLoader(str(corpus), index=index).load()
+
+    assert sorted(parsed) == ["a.txt", "c.txt"]
+    assert contents(second) == [("a.txt", "alpha, revised"), ("b.txt", "beta"), ("c.txt", "gamma")]
+
+
+@pytest.mark.asyncio
+async def test_touched_file_with_same_content_is_not_parsed(corpus, index, parsed):
+    await DocumentLoader(str(corpus), index=index).load()
+    parsed.clear()
+
+    path = corpus / "a.txt"
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    docs = await DocumentLoader(str(corpus), index=index).load()
+
+    assert parsed == []
+    assert contents(docs) == [("a.txt", "alpha"), ("b.txt", "beta")]
+
+
+@pytest.mark.asyncio
+async def test_removed_files_are_dropped(corpus, index, parsed):
+    await DocumentLoader(str(corpus), index=index).load()
+
+    (corpus / "notes" / "b.txt").unlink()
+    docs = await DocumentLoader(str(corpus), index=index).load()
+
+    assert contents(docs) == [("a.txt", "alpha")]
+    assert index.stats["removed"] == 1
+    (count,) = index._conn.execute("SELECT COUNT(*) FROM documents").fetchone()
+    assert count == 1
+
+
+@pytest.mark.asyncio
+async def test_index_persists_across_instances(corpus, tmp_path, parsed):
+    path = str(tmp_path / "cache" / "documents.sqlite")
+    await DocumentLoader(str(corpus), index=LocalDocumentIndex(path)).load()
+    parsed.clear()
+
+    docs = await DocumentLoader(str(corpus), index=LocalDocumentIndex(path)).load()
+
+    assert parsed == []
+    assert contents(docs) == [("a.txt", "alpha"), ("b.txt", "beta")]
@@ -0,0 +1,120 @@
+import json
+import os
+
+import pytest
+
+from gpt_researcher.utils.event_log import EventLog
+
+
+@pytest.mark.asyncio
+async def test_events_are_buffered_appended_and_compacted(tmp_path):
+    log = EventLog(str(tmp_path / "run.jsonl"), summary_path=str(tmp_path / "run.json"), flush_interval=60)
+
+    log.update_content({"query": "test query"})
+    for i in range(3):
+        log.log_event("event", {"step": i})
+    log.update_content({"report": "final report"})
+
+    # Nothing is written on the caller's path
+    assert not os.path.exists(tmp_path / "run.jsonl")
+
+    await log.aclose()
+
+    with open(tmp_path / "run.jsonl") as f:
+        assert len(f.readlines()) == 5
+    with open(tmp_path / "run.json") as f:
+        summary = json.load(f)
+    assert [event["data"]["step"] for event in summary["events"]] == [0, 1, 2]
+    assert summary["content"]["query"] == "test query"
+    assert summary["content"]["report"] == "final report"
+    assert summary["content"]["sources"] == []
+
+
+def test_events_are_written_immediately_outside_an_event_loop(tmp_path):
+    log = EventLog(str(tmp_path / "run.jsonl"))
+
+    log.log_event("sub_query", {"query": "q"})
+
+    with open(tmp_path / "run.jsonl") as f:
+        assert json.loads(f.readline())["type"] == "sub_query"
+    log.close()
+
+
+def test_summary_is_kept_in_memory(tmp_path):
+    log = EventLog(str(tmp_path / "run.jsonl"))
+    log.update_content({"query": "q"})
+    log.log_event("sub_query", {"query": "q1"})
+    os.remove(tmp_path / "run.jsonl")
+
+    summary = log.read()
+
+    assert summary["content"]["query"] == "q"
+    assert [event["type"] for event in summary["events"]] == ["sub_query"]
+    log.close()
+
+
+def test_appending_to_an_existing_log_keeps_its_records(tmp_path):
+    path = str(tmp_path / "run.jsonl")
+    first = EventLog(path)
+    first.update_content({"query": "q"})
+    first.close()
+
+    second = EventLog(path)
+    second.update_content({"report": "r"})
+
+    assert second.read()["content"] == {**first.read()["content"], "report": "r"}
+    second.close()
+
+
+@pytest.mark.asyncio
+async def test_run_agent_writes_the_summary_when_the_run_fails(tmp_path, monkeypatch):
+    from backend.server import websocket_manager
+
+    class FailingReport:
+        def __init__(self, websocket, **kwargs):
+            self.websocket = websocket
+
+        async def run(self):
+            await self.websocket.send_json({"type": "logs", "output": "started"})
+            raise RuntimeError("search API down")
+
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(websocket_manager, "BasicReport", FailingReport)
+
+    with pytest.raises(RuntimeError):
+        await websocket_manager.run_agent("task", "research_report", "web", [], [], None, None)
+
+    (log_file,) = (tmp_path / "outputs").glob("*.json")
+    with open(log_file) as f:
+        assert json.load(f)["events"][0]["data"]["output"] == "started"
+
+
+@pytest.mark.asyncio
+async def test_run_agent_logs_to_the_handler_it_is_given(tmp_path, monkeypatch):
+    from backend.server import websocket_manager
+    from backend.server.server_utils import CustomLogsHandler
+
+    class Report:
+        def __init__(self, websocket, **kwargs):
+            self.websocket = websocket
+
+        async def run(self):
+            await self.websocket.send_json({"type": "logs", "output": "step"})
+            await self.websocket.send_json({"type": "report", "output": "the report"})
+            return "the report"
+
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(websocket_manager, "BasicReport", Report)
+
+    logs_handler = CustomLogsHandler(None, "task")
+    await websocket_manager.run_agent(
+        "task", "research_report", "web", [], [], None, None, logs_handler=logs_handler
+    )
+    await logs_handler.close()
+
+    # One log per task, holding the events of the run
+    (log_file,) = (tmp_path / "outputs").glob("*.json")
+    with open(log_file) as f:
+        summary = json.load(f)
+    assert [event["data"]["output"] for event in summary["events"]] == ["step"]
+    assert summary["content"]["output"] == "the report"
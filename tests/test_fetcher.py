@@ -0,0 +1,107 @@
+import os
+import threading
+from concurrent.futures.process import BrokenProcessPool
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import pytest
+
+from gpt_researcher.scraper import BeautifulSoupScraper
+from gpt_researcher.scraper.fetcher import AsyncFetcher, close_client_sessions
+from gpt_researcher.scraper.http_cache import HTTPCache
+from gpt_researcher.utils.cache import MemoryCache
+from gpt_researcher.utils.workers import get_process_pool
+
+PAGE = (
+    "<html><head><title>Fetched</title><script>var x = 1;</script></head>"
+    "<body><p>" + "asynchronous scraping " * 20 + "</p></body></html>"
+).encode("utf-8")
+
+
+class PageHandler(BaseHTTPRequestHandler):
+    requests_seen = 0
+
+    def do_GET(self):
+        PageHandler.requests_seen += 1
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(PAGE)))
+        self.end_headers()
+        self.wfile.write(PAGE)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server_url():
+    PageHandler.requests_seen = 0
+    server = HTTPServer(("127.0.0.1", 0), PageHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}/page"
+    server.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_fetch_uses_http_cache(server_url):
+    fetcher = AsyncFetcher("test-agent", http_cache=HTTPCache(MemoryCache(), ttl=60))
+
+    first = await fetcher.fetch(server_url)
+    second = await fetcher.fetch(server_url)
+    await close_client_sessions()
+
+    assert first.content == second.content == PAGE
+    assert second.encoding == "utf-8"
+    assert PageHandler.requests_seen == 1
+    assert fetcher.cache_stats == {"hits": 1, "revalidated": 0, "misses": 1}
+
+
+@pytest.mark.asyncio
+async def test_fetch_cuts_off_large_bodies(server_url):
+    fetcher = AsyncFetcher(max_bytes=100)
+
+    response = await fetcher.fetch(server_url)
+    await close_client_sessions()
+
+    assert response.truncated
+    assert response.content == PAGE[:100]
+
+
+@pytest.mark.asyncio
+async def test_beautiful_soup_scrape_async(server_url):
+    scraper = BeautifulSoupScraper(server_url, fetcher=AsyncFetcher())
+
+    content, _, title = await scraper.scrape_async()
+    await close_client_sessions()
+
+    assert title == "Fetched"
+    assert "asynchronous scraping" in content
+    assert "var x" not in content
+
+
+@pytest.mark.asyncio
+async def test_beautiful_soup_parses_in_process_pool(server_url):
+    scraper = BeautifulSoupScraper(server_url, fetcher=AsyncFetcher(), parse_executor=get_process_pool(1))
+
+    content, image_urls, title = await scraper.scrape_async()
+    await close_client_sessions()
+
+    assert title == "Fetched"
+    assert "asynchronous scraping" in content
+    assert image_urls == []
+
+
+@pytest.mark.asyncio
+async def test_broken_process_pool_is_replaced_and_parsing_falls_back_to_a_thread(server_url):
+    pool = get_process_pool(1)
+    # A worker dying, e.g. killed for using too much memory, breaks the pool for good
+    with pytest.raises(BrokenProcessPool):
+        pool.submit(os._exit, 1).result()
+
+    scraper = BeautifulSoupScraper(server_url, fetcher=AsyncFetcher(), parse_executor=pool)
+    content, _, title = await scraper.scrape_async()
+    await close_client_sessions()
+
+    assert title == "Fetched"
+    assert "asynchronous scraping" in content
+    assert get_process_pool(1) is not pool
@@ -0,0 +1,87 @@
+import asyncio
+
+import pytest
+
+from gpt_researcher.utils.host_scheduler import HostScheduler
+
+
+async def request(scheduler, url, started, duration=0.05):
+    async with scheduler.slot(url):
+        started.append((url, asyncio.get_running_loop().time()))
+        await asyncio.sleep(duration)
+
+
+@pytest.mark.asyncio
+async def test_slow_host_does_not_hold_the_workers():
+    scheduler = HostScheduler(max_workers=2, per_host_concurrency=1)
+    started = []
+    urls = [f"https://slow.com/{i}" for i in range(4)] + ["https://a.com/", "https://b.com/"]
+
+    await asyncio.gather(*(request(scheduler, url, started, 0.1 if "slow" in url else 0.01) for url in urls))
+
+    order = [url for url, _ in started]
+    # The other hosts get the second worker while slow.com is served one page at a time
+    assert order[:3] == ["https://slow.com/0", "https://a.com/", "https://b.com/"]
+    assert sorted(order) == sorted(urls)
+
+
+@pytest.mark.asyncio
+async def test_starts_on_a_host_are_spaced_by_the_delay():
+    scheduler = HostScheduler(max_workers=4, per_host_concurrency=4, per_host_delay=0.1)
+    started = []
+
+    await asyncio.gather(*(request(scheduler, url, started) for url in
+                           ["https://a.com/1", "https://a.com/2", "https://b.com/1"]))
+
+    times = dict(started)
+    assert times["https://a.com/2"] - times["https://a.com/1"] >= 0.09
+    assert times["https://b.com/1"] - times["https://a.com/1"] < 0.05
+
+
+@pytest.mark.asyncio
+async def test_throttled_host_is_backed_off():
+    scheduler = HostScheduler(max_workers=4)
+    started = []
+
+    async with scheduler.slot("https://a.com/1"):
+        scheduler.report("https://a.com/1", 429, retry_after="0.2")
+    start = asyncio.get_running_loop().time()
+    await asyncio.gather(request(scheduler, "https://a.com/2", started), request(scheduler, "https://b.com/", started))
+
+    times = dict(started)
+    assert times["https://a.com/2"] - start >= 0.19
+    assert times["https://b.com/"] - start < 0.05
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_releases_nothing():
+    scheduler = HostScheduler(max_workers=1)
+    started = []
+
+    holder = asyncio.create_task(request(scheduler, "https://a.com/1", started, 0.05))
+    await asyncio.sleep(0)
+    waiter = asyncio.create_task(request(scheduler, "https://b.com/1", started))
+    await asyncio.sleep(0.01)
+    waiter.cancel()
+    await holder
+
+    await request(scheduler, "https://c.com/1", started)
+    assert [url for url, _ in started] == ["https://a.com/1", "https://c.com/1"]
+    assert scheduler._active == 0
+
+
+@pytest.mark.asyncio
+async def test_zero_per_host_concurrency_means_unlimited():
+    scheduler = HostScheduler(max_workers=3, per_host_concurrency=0)
+    all_started = asyncio.Event()
+    started = []
+
+    async def wait_for_others(url):
+        async with scheduler.slot(url):
+            started.append(url)
+            if len(started) == 3:
+                all_started.set()
+            await all_started.wait()
+
+    # Only completes if the three requests to a.com run at the same time
+    await asyncio.wait_for(asyncio.gather(*(wait_for_others(f"https://a.com/{i}") for i in range(3))), 5)
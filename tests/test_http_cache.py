@@ -0,0 +1,62 @@
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import pytest
+
+from gpt_researcher.scraper.http_cache import CachedSession, HTTPCache
+from gpt_researcher.utils.cache import MemoryCache
+
+
+class PageHandler(BaseHTTPRequestHandler):
+    requests_seen = []
+
+    def do_GET(self):
+        PageHandler.requests_seen.append(dict(self.headers))
+        if self.headers.get("If-None-Match") == '"v1"':
+            self.send_response(304)
+            self.end_headers()
+            return
+        body = b"<html><title>Cached</title><p>hello</p></html>"
+        self.send_response(200)
+        self.send_header("ETag", '"v1"')
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server_url():
+    PageHandler.requests_seen = []
+    server = HTTPServer(("127.0.0.1", 0), PageHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}/page"
+    server.shutdown()
+
+
+def test_fresh_responses_are_served_from_cache(server_url):
+    session = CachedSession(HTTPCache(MemoryCache(), ttl=60))
+
+    first = session.get(server_url, timeout=4)
+    second = session.get(server_url, timeout=4)
+
+    assert second.content == first.content
+    assert second.encoding == "utf-8"
+    assert len(PageHandler.requests_seen) == 1
+    assert session.cache_stats == {"hits": 1, "revalidated": 0, "misses": 1}
+
+
+def test_stale_responses_are_revalidated(server_url):
+    session = CachedSession(HTTPCache(MemoryCache(), ttl=0))
+
+    first = session.get(server_url, timeout=4)
+    second = session.get(server_url, timeout=4)
+
+    assert second.status_code == 200
+    assert second.content == first.content
+    assert PageHandler.requests_seen[1]["If-None-Match"] == '"v1"'
+    assert session.cache_stats == {"hits": 0, "revalidated": 1, "misses": 1}
@@ -0,0 +1,103 @@
+import pytest
+
+from gpt_researcher.utils import llm
+from gpt_researcher.utils.cache import MemoryCache
+from gpt_researcher.utils.llm_cache import LLMResponseCache
+
+
+class FakeProvider:
+    def __init__(self):
+        self.calls = 0
+
+    async def get_chat_response_with_usage(self, messages, stream, websocket=None):
+        self.calls += 1
+        return f"response {self.calls}", None
+
+
+class FakeEmbeddings:
+    """Embeds a query as word counts over a tiny vocabulary, ignoring 'the'."""
+
+    vocabulary = ["impact", "ai", "jobs", "climate", "of", "on"]
+
+    async def aembed_query(self, text):
+        words = text.lower().split()
+        return [float(words.count(word)) for word in self.vocabulary]
+
+
+@pytest.fixture
+def provider(monkeypatch):
+    fake = FakeProvider()
+    monkeypatch.setattr(llm, "get_llm", lambda llm_provider, **kwargs: fake)
+    return fake
+
+
+def messages(query, context="Plan the research."):
+    return [{"role": "system", "content": context}, {"role": "user", "content": f"Task: {query}"}]
+
+
+@pytest.mark.asyncio
+async def test_identical_calls_are_answered_from_cache(provider):
+    cache = LLMResponseCache(MemoryCache())
+
+    first = await llm.create_chat_completion(messages("ai"), model="gpt-4o", llm_provider="openai", cache=cache)
+    again = await llm.create_chat_completion(messages("ai"), model="gpt-4o", llm_provider="openai", cache=cache)
+    await llm.create_chat_completion(messages("ai"), model="gpt-4o", temperature=0.9, llm_provider="openai", cache=cache)
+
+    assert again == first
+    assert provider.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_streamed_calls_bypass_cache(provider):
+    cache = LLMResponseCache(MemoryCache())
+
+    for _ in range(2):
+        await llm.create_chat_completion(messages("ai"), model="gpt-4o", llm_provider="openai", stream=True, cache=cache)
+
+    assert provider.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_near_duplicate_queries_match_only_within_the_same_prompt(provider):
+    cache = LLMResponseCache(MemoryCache(), embeddings=FakeEmbeddings(), similarity_threshold=0.97)
+
+    async def complete(query, context="Plan the research."):
+        return await llm.create_chat_completion(
+            messages(query, context), model="gpt-4o", llm_provider="openai", cache=cache, cache_query=query
+        )
+
+    first = await complete("impact of ai on jobs")
+
+    assert await complete("the impact of ai on jobs") == first
+    assert await complete("impact of climate on jobs") != first
+    assert await complete("the impact of ai on jobs", context="Use these search results: ...") != first
+    assert provider.calls == 3
+
+
+@pytest.mark.asyncio
+async def test_fallback_answers_are_cached_under_the_fallback_model(monkeypatch):
+    requested = []
+
+    class Provider:
+        def __init__(self, model):
+            self.model = model
+
+        async def get_chat_response_with_usage(self, messages, stream, websocket=None):
+            requested.append(self.model)
+            if self.model == "gpt-4o" and len(requested) == 1:
+                raise ValueError("bad request")
+            return f"{self.model} response", None
+
+    monkeypatch.setattr(llm, "get_llm", lambda llm_provider, **kwargs: Provider(kwargs["model"]))
+    cache = LLMResponseCache(MemoryCache())
+
+    async def complete(model, fallbacks=None):
+        return await llm.create_chat_completion(
+            messages("ai"), model=model, llm_provider="openai", cache=cache, fallbacks=fallbacks
+        )
+
+    assert await complete("gpt-4o", fallbacks=[{"model": "gpt-4o-mini"}]) == "gpt-4o-mini response"
+    # The primary model answers for itself next time, while the fallback's answer serves calls made to it
+    assert await complete("gpt-4o") == "gpt-4o response"
+    assert await complete("gpt-4o-mini") == "gpt-4o-mini response"
+    assert requested == ["gpt-4o", "gpt-4o-mini", "gpt-4o"]
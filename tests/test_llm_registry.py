@@ -0,0 +1,26 @@
+import asyncio
+
+import pytest
+
+from gpt_researcher.llm_provider.registry import close_providers, get_provider
+
+
+@pytest.mark.asyncio
+async def test_providers_are_reused_for_identical_settings():
+    first = get_provider("openai", model="gpt-4o-mini", temperature=0.4, api_key="test")
+    again = get_provider("openai", temperature=0.4, model="gpt-4o-mini", api_key="test")
+    other = get_provider("openai", model="gpt-4o-mini", temperature=0.7, api_key="test")
+
+    assert again is first
+    assert other is not first
+
+    await close_providers()
+    assert get_provider("openai", model="gpt-4o-mini", temperature=0.4, api_key="test") is not first
+    await close_providers()
+
+
+def test_providers_are_not_shared_between_event_loops():
+    async def provider():
+        return get_provider("openai", model="gpt-4o-mini", api_key="test")
+
+    assert asyncio.run(provider()) is not asyncio.run(provider())
@@ -0,0 +1,191 @@
+import asyncio
+import time
+
+import pytest
+
+from gpt_researcher.llm_provider import resilience
+from gpt_researcher.llm_provider.generic.base import GenericLLMProvider
+from gpt_researcher.llm_provider.resilience import (
+    StreamInterruptedError,
+    call_with_failover,
+    get_latency_tracker,
+)
+from gpt_researcher.utils import llm
+
+
+class RateLimitError(Exception):
+    status_code = 429
+
+
+class BadRequestError(Exception):
+    status_code = 400
+
+
+class ServiceUnavailableError(Exception):
+    status_code = 503
+
+
+@pytest.fixture(autouse=True)
+def fresh_state(monkeypatch):
+    monkeypatch.setattr(resilience, "_BREAKERS", {})
+    monkeypatch.setattr(resilience, "_LATENCIES", {})
+    monkeypatch.setattr(resilience, "backoff_delay", lambda attempt: 0)
+
+
+def scripted(*outcomes, delay=0.0):
+    """A call returning or raising the given outcomes in turn, recording each call."""
+    calls = []
+
+    async def call():
+        outcome = outcomes[min(len(calls), len(outcomes) - 1)]
+        calls.append(outcome)
+        await asyncio.sleep(delay)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    call.calls = calls
+    return call
+
+
+@pytest.mark.asyncio
+async def test_transient_errors_are_retried_and_others_fail_over():
+    flaky = scripted(RateLimitError(), RateLimitError(), "ok")
+    assert await call_with_failover([("a:flaky", flaky)]) == "ok"
+    assert len(flaky.calls) == 3
+
+    broken, fallback = scripted(BadRequestError()), scripted("fallback")
+    assert await call_with_failover([("a:broken", broken), ("b:fallback", fallback)]) == "fallback"
+    assert len(broken.calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_circuit_opens_after_repeated_failed_calls():
+    down, fallback = scripted(ServiceUnavailableError()), scripted("fallback")
+    targets = [("a:down", down), ("b:fallback", fallback)]
+
+    # Each call counts once, however many times it was retried
+    for _ in range(resilience.CIRCUIT_FAILURE_THRESHOLD):
+        assert await call_with_failover(targets) == "fallback"
+    calls = len(down.calls)
+    assert calls == resilience.CIRCUIT_FAILURE_THRESHOLD * (resilience.MAX_RETRIES + 1)
+
+    # Skipped while there is a fallback, still tried when there is none
+    assert await call_with_failover(targets) == "fallback"
+    assert len(down.calls) == calls
+    with pytest.raises(ServiceUnavailableError):
+        await call_with_failover([("a:down", down)], max_retries=0)
+    assert len(down.calls) == calls + 1
+
+
+@pytest.mark.asyncio
+async def test_rate_limits_do_not_open_the_circuit():
+    limited, fallback = scripted(RateLimitError()), scripted("fallback")
+    targets = [("a:limited", limited), ("b:fallback", fallback)]
+
+    for _ in range(resilience.CIRCUIT_FAILURE_THRESHOLD + 1):
+        assert await call_with_failover(targets) == "fallback"
+
+    assert resilience.get_circuit_breaker("a:limited").closed
+    assert len(limited.calls) == (resilience.CIRCUIT_FAILURE_THRESHOLD + 1) * (resilience.MAX_RETRIES + 1)
+
+
+@pytest.mark.asyncio
+async def test_slow_calls_are_hedged_with_the_next_provider():
+    for _ in range(resilience.HEDGE_MIN_SAMPLES):
+        get_latency_tracker("a:slow").record(0.01)
+    slow, fast = scripted("slow", delay=1), scripted("fast")
+
+    start = time.perf_counter()
+    assert await call_with_failover([("a:slow", slow), ("b:fast", fast)]) == "fast"
+    assert time.perf_counter() - start < 0.5
+
+    # Streamed calls are never hedged
+    slow = scripted("slow", delay=0.1)
+    assert await call_with_failover([("a:slow", slow), ("b:fast", fast)], hedge=False) == "slow"
+
+
+@pytest.mark.asyncio
+async def test_create_chat_completion_follows_fallback_chain(monkeypatch):
+    requested = []
+
+    class Provider:
+        def __init__(self, model):
+            self.model = model
+
+        async def get_chat_response_with_usage(self, messages, stream, websocket=None):
+            requested.append(self.model)
+            if self.model != "fast-model":
+                raise BadRequestError(self.model)
+            return "sub-queries", None
+
+    monkeypatch.setattr(llm, "get_llm", lambda llm_provider, **kwargs: Provider(kwargs["model"]))
+
+    response = await llm.create_chat_completion(
+        [{"role": "user", "content": "plan"}],
+        model="strategic-model",
+        llm_provider="openai",
+        fallbacks=[{"llm_provider": "openai", "model": "smart-model"}, {"llm_provider": "openai", "model": "fast-model"}],
+    )
+
+    assert response == "sub-queries"
+    assert requested == ["strategic-model", "smart-model", "fast-model"]
+
+
+class FakeStreamingLLM:
+    def __init__(self, model, chunks, fail_after):
+        self.model = model
+        self.chunks = chunks
+        self.fail_after = fail_after
+
+    async def astream(self, messages):
+        for i, content in enumerate(self.chunks):
+            if i == self.fail_after:
+                raise RateLimitError(self.model)
+            yield type("Chunk", (), {"content": content, "usage_metadata": None})()
+
+
+class FakeWebSocket:
+    def __init__(self):
+        self.sent = []
+
+    async def send_json(self, data):
+        self.sent.append(data["output"])
+
+
+async def stream_with_fallback(monkeypatch, fail_after):
+    requested = []
+
+    def get_llm(llm_provider, **kwargs):
+        requested.append(kwargs["model"])
+        failing = kwargs["model"] == "primary"
+        return GenericLLMProvider(FakeStreamingLLM(
+            kwargs["model"], [f"{kwargs['model']} 1\n", f"{kwargs['model']} 2\n"], fail_after if failing else None
+        ))
+
+    monkeypatch.setattr(llm, "get_llm", get_llm)
+    websocket = FakeWebSocket()
+    response = await llm.create_chat_completion(
+        [{"role": "user", "content": "write"}],
+        model="primary",
+        llm_provider="openai",
+        stream=True,
+        websocket=websocket,
+        fallbacks=[{"model": "fallback"}],
+    )
+    return response, requested, websocket.sent
+
+
+@pytest.mark.asyncio
+async def test_stream_fails_over_before_any_output(monkeypatch):
+    response, requested, sent = await stream_with_fallback(monkeypatch, fail_after=0)
+
+    assert response == "fallback 1\nfallback 2\n"
+    assert sent == ["fallback 1\n", "fallback 2\n"]
+    assert requested[-1] == "fallback"
+
+
+@pytest.mark.asyncio
+async def test_stream_is_not_repeated_after_output_was_sent(monkeypatch):
+    with pytest.raises(StreamInterruptedError):
+        await stream_with_fallback(monkeypatch, fail_after=1)
@@ -27,7 +27,10 @@ async def test_custom_logs_handler():
     
     # Verify websocket was called with correct data
     mock_websocket.send_json.assert_called_once_with(test_data)
-    
+
+    # Events are appended as JSON Lines and compacted into the log file at the end of the run
+    await handler.close()
+
     # Verify log file contents
     with open(handler.log_file, 'r') as f:
         log_data = json.load(f)
@@ -52,7 +55,9 @@ async def test_content_update():
     await handler.send_json(content_data)
     
     mock_websocket.send_json.assert_called_once_with(content_data)
-    
+
+    await handler.close()
+
     # Verify log file contents
     with open(handler.log_file, 'r') as f:
         log_data = json.load(f)
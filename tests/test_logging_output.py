@@ -43,7 +43,8 @@ async def test_log_output_file():
     
     # 3. Run research
     await researcher.conduct_research()
-    
+    await logs_handler.close()
+
     # 4. Verify events were captured
     logger.info(f"Events captured: {len(websocket.events)}")
     assert len(websocket.events) > 0, "No events were captured"
@@ -58,6 +59,6 @@ async def test_log_output_file():
         assert len(data.get('events', [])) > 0, "No events in output file" 
 
     # Clean up the output files
-    for output_file in output_files:
+    for output_file in output_files + list(output_dir.glob(f"task_*{research_id}*.jsonl")):
         output_file.unlink()
         logger.info(f"Deleted output file: {output_file}")
\ No newline at end of file
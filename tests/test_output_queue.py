@@ -0,0 +1,60 @@
+import asyncio
+
+import pytest
+
+from backend.server.output_queue import QueuedWebSocket
+
+
+class GatedWebSocket:
+    """A client that receives nothing until `gate` is set."""
+
+    def __init__(self):
+        self.gate = asyncio.Event()
+        self.sent = []
+
+    async def send_json(self, data):
+        await self.gate.wait()
+        self.sent.append(data)
+
+    async def receive_text(self):
+        return "ping"
+
+
+@pytest.mark.asyncio
+async def test_slow_client_does_not_stall_producer_and_report_chunks_coalesce():
+    websocket = GatedWebSocket()
+    output = QueuedWebSocket(websocket)
+
+    for i in range(50):
+        await output.send_json({"type": "report", "output": f"{i} "})
+    # The producer is done while the client hasn't received anything yet
+    assert websocket.sent == []
+
+    websocket.gate.set()
+    await output.aclose()
+
+    assert "".join(message["output"] for message in websocket.sent) == "".join(f"{i} " for i in range(50))
+    assert len(websocket.sent) < 5
+    assert await output.receive_text() == "ping"
+
+
+@pytest.mark.asyncio
+async def test_logs_are_merged_then_dropped_under_backpressure():
+    websocket = GatedWebSocket()
+    output = QueuedWebSocket(websocket, max_size=4, merge_ratio=0.5)
+
+    # The first message is being sent (slowly) and the rest queue up behind it
+    await output.send_json({"type": "logs", "content": "start", "output": "start", "metadata": None})
+    await asyncio.sleep(0)
+    for key in ["a", "b", "b", "c", "d", "e"]:
+        await output.send_json({"type": "logs", "content": key, "output": key, "metadata": None})
+    sent_error = asyncio.create_task(output.send_json({"type": "logs", "content": "error", "output": "boom"}))
+    await asyncio.sleep(0.01)
+
+    assert output.stats["merged"] == 1
+    assert output.stats["dropped"] == 1
+    # Essential messages wait for room instead of being dropped
+    assert not sent_error.done()
+
+    sent_error.cancel()
+    await output.aclose(timeout=0)
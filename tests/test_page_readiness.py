@@ -0,0 +1,58 @@
+import asyncio
+import json
+
+import pytest
+
+from gpt_researcher.scraper.browser import readiness
+from gpt_researcher.scraper.browser.readiness import ReadinessProfiles, wait_until_ready
+
+
+class FakePage:
+    """A page whose text keeps growing until `settles_after` seconds."""
+
+    def __init__(self, settles_after):
+        self.settles_after = settles_after
+        self.start = asyncio.get_running_loop().time()
+
+    async def evaluate(self, expression):
+        now = asyncio.get_running_loop().time() - self.start
+        settled = now >= self.settles_after
+        return json.dumps({
+            "readyState": "complete" if settled else "interactive",
+            "textLength": 1000 if settled else int(now * 1000) + 1,
+            "sinceMutation": now - self.settles_after if settled else 0,
+            "sinceResponse": now,
+        })
+
+
+@pytest.mark.asyncio
+async def test_ready_as_soon_as_the_page_settles():
+    state = await wait_until_ready(FakePage(0.05), timeout=1, quiet_period=0.05, poll_interval=0.01)
+
+    assert state["ready"]
+    assert state["textLength"] == 1000
+    assert 0.1 <= state["elapsed"] < 0.3
+
+
+@pytest.mark.asyncio
+async def test_gives_up_after_the_timeout():
+    state = await wait_until_ready(FakePage(10), timeout=0.1, quiet_period=0.05, poll_interval=0.01)
+
+    assert not state["ready"]
+    assert state["elapsed"] == pytest.approx(0.1, abs=0.05)
+
+
+def test_profiles_learn_ready_time_and_skip_useless_scrolling():
+    profiles = ReadinessProfiles(smoothing=0.5)
+    assert profiles.get("example.com").timeout() == readiness.MAX_READY_TIMEOUT
+
+    for _ in range(3):
+        assert profiles.get("example.com").should_scroll()
+        profiles.record("example.com", 1.0, scroll_gain=0.0)
+    profiles.record("example.com", 2.0)
+
+    profile = profiles.get("example.com")
+    assert profile.ready_time == pytest.approx(1.5)
+    assert profile.timeout() == pytest.approx(4.5)
+    assert not profile.should_scroll()
+    assert profiles.get("lazy.com").should_scroll()
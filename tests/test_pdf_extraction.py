@@ -0,0 +1,78 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pymupdf
+import pytest
+
+from gpt_researcher.document import DocumentLoader
+from gpt_researcher.scraper.arxiv import arxiv as arxiv_scraper
+from gpt_researcher.scraper.arxiv.arxiv import ArxivScraper
+from gpt_researcher.scraper.pymupdf import extraction
+from gpt_researcher.scraper.pymupdf.extraction import extract_pdf
+
+
+def make_pdf(texts, title="Test paper") -> bytes:
+    doc = pymupdf.open()
+    for text in texts:
+        doc.new_page().insert_text((72, 72), text)
+    doc.set_metadata({"title": title})
+    return doc.tobytes()
+
+
+PAGES = [f"page {i} about nothing in particular" for i in range(40)]
+PAGES[25] = "page 25 about quantum error correction and quantum codes"
+PAGES[31] = "page 31 mentions quantum once"
+PAGES[36] = "page 36 about quantum error correction, beyond the pages scanned"
+
+
+def test_extracts_the_page_budget_from_memory():
+    content = extract_pdf(make_pdf(PAGES), max_pages=3)
+
+    assert content.title == "Test paper"
+    assert content.page_count == 40
+    assert [page.number for page in content.pages] == [0, 1, 2]
+    assert content.text.startswith("page 0 about nothing")
+
+
+def test_query_selects_leading_and_relevant_pages():
+    content = extract_pdf(make_pdf(PAGES), max_pages=8, query="quantum error correction")
+
+    # 32 pages are scanned; the first two are always kept
+    assert [page.number for page in content.pages] == [0, 1, 2, 3, 4, 5, 25, 31]
+
+
+def test_large_extractions_are_split_across_workers(monkeypatch):
+    monkeypatch.setattr(extraction, "PARALLEL_MIN_PAGES", 8)
+    data = make_pdf(PAGES)
+
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        parallel = extract_pdf(data, max_pages=None, executor=executor)
+
+    assert [page.text for page in parallel.pages] == [page.text for page in extract_pdf(data, max_pages=None).pages]
+    assert len(parallel.pages) == 40
+
+
+@pytest.mark.asyncio
+async def test_document_loader_loads_every_pdf_page(tmp_path):
+    (tmp_path / "paper.pdf").write_bytes(make_pdf(PAGES[:12]))
+
+    docs = await DocumentLoader(str(tmp_path)).load()
+
+    assert len(docs) == 12
+    assert {doc["url"] for doc in docs} == {"paper.pdf"}
+
+
+class FakeArxivClient:
+    searches = []
+
+    def results(self, search):
+        self.searches.append(search.id_list)
+        return iter([])
+
+
+def test_arxiv_link_without_a_paper_fails_like_other_scrapes(monkeypatch):
+    monkeypatch.setattr(arxiv_scraper.arxiv, "Client", FakeArxivClient)
+
+    result = ArxivScraper("https://arxiv.org/abs/2101.00001v2?context=cs#top").scrape()
+
+    assert result == ("", [], "")
+    assert FakeArxivClient.searches == [["2101.00001"]]
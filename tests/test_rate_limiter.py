@@ -0,0 +1,73 @@
+import asyncio
+import time
+
+import pytest
+
+from gpt_researcher.llm_provider.rate_limiter import Priority, RateLimiter, configure_rate_limits, get_rate_limiter
+
+
+@pytest.mark.asyncio
+async def test_token_budget_delays_calls_once_exhausted():
+    limiter = RateLimiter(tokens_per_minute=6000)
+
+    start = time.perf_counter()
+    async with limiter.slot(6000):
+        pass
+    async with limiter.slot(30):
+        pass
+
+    assert 0.2 < time.perf_counter() - start < 1
+
+
+@pytest.mark.asyncio
+async def test_higher_priority_calls_go_first():
+    limiter = RateLimiter(max_concurrency=1)
+    order = []
+
+    async def call(name, priority):
+        async with limiter.slot(priority=priority):
+            order.append(name)
+            await asyncio.sleep(0.01)
+
+    async with limiter.slot():
+        planning = [asyncio.create_task(call(f"plan {i}", Priority.LOW)) for i in range(3)]
+        await asyncio.sleep(0.01)
+        report = asyncio.create_task(call("report", Priority.HIGH))
+        await asyncio.sleep(0.01)
+
+    await asyncio.gather(report, *planning)
+    assert order[0] == "report"
+
+
+def test_limiters_are_shared_per_model_only_when_configured():
+    assert get_rate_limiter("openai:gpt-4o") is None
+
+    configure_rate_limits(requests_per_minute=100)
+    try:
+        limiter = get_rate_limiter("openai:gpt-4o")
+        assert get_rate_limiter("openai:gpt-4o") is limiter
+        assert get_rate_limiter("openai:gpt-4o-mini") is not limiter
+    finally:
+        configure_rate_limits()
+
+
+@pytest.mark.asyncio
+async def test_reconfiguring_keeps_calls_in_flight():
+    try:
+        configure_rate_limits(max_concurrency=1)
+        limiter = get_rate_limiter("openai:gpt-4o")
+
+        async def call():
+            async with limiter.slot():
+                return limiter.in_flight
+
+        async with limiter.slot():
+            # Another session starting with different limits
+            configure_rate_limits(max_concurrency=1, requests_per_minute=100)
+            assert get_rate_limiter("openai:gpt-4o") is limiter
+            waiter = asyncio.create_task(call())
+            await asyncio.sleep(0.1)
+            assert not waiter.done()
+        assert await asyncio.wait_for(waiter, 1) == 1
+    finally:
+        configure_rate_limits()
@@ -0,0 +1,64 @@
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from gpt_researcher.retrievers.utils import normalize_url, reciprocal_rank_fusion
+from gpt_researcher.skills.researcher import ResearchConductor
+
+
+def test_normalize_url_ignores_trivial_differences():
+    assert normalize_url("https://www.Example.com:443/docs/?b=2&a=1&utm_source=x#intro") == \
+        normalize_url("http://example.com/docs?a=1&b=2")
+    assert normalize_url("https://example.com/docs?page=2") != normalize_url("https://example.com/docs?page=3")
+    # "ref" often selects content, e.g. a branch or tag
+    assert normalize_url("https://example.com/tree?ref=v1") != normalize_url("https://example.com/tree?ref=v2")
+
+
+def test_reciprocal_rank_fusion_prefers_urls_found_by_several_retrievers():
+    fused = reciprocal_rank_fusion([
+        ["https://a.com", "https://b.com/", "https://c.com"],
+        ["https://d.com", "https://www.b.com"],
+    ])
+
+    assert fused == ["https://b.com/", "https://a.com", "https://d.com", "https://c.com"]
+
+
+def make_retriever(urls, wait=None):
+    class Retriever:
+        def __init__(self, query, query_domains=None):
+            pass
+
+        def search(self, max_results=5):
+            if wait is not None:
+                wait()
+            return [{"href": url} for url in urls[:max_results]]
+
+    return Retriever
+
+
+@pytest.mark.asyncio
+async def test_retrievers_are_queried_concurrently_within_timeout():
+    # Neither of the first two retrievers answers before the other one was called
+    both_called = threading.Barrier(2, timeout=5)
+    release_late = threading.Event()
+    researcher = SimpleNamespace(
+        retrievers=[
+            make_retriever(["https://a.com", "https://b.com"], wait=both_called.wait),
+            make_retriever(["https://b.com", "https://c.com"], wait=both_called.wait),
+            make_retriever(["https://late.com"], wait=release_late.wait),
+        ],
+        cfg=SimpleNamespace(max_search_results_per_query=5, retriever_timeout=0.5),
+        visited_urls=set(),
+        shared_urls=None,
+        verbose=False,
+        websocket=None,
+    )
+
+    try:
+        urls = await ResearchConductor(researcher)._search_relevant_source_urls("query")
+    finally:
+        release_late.set()
+
+    # The retriever still blocked at the timeout contributed nothing
+    assert urls == ["https://b.com", "https://a.com", "https://c.com"]
@@ -0,0 +1,37 @@
+from pathlib import Path
+
+import pytest
+from bs4 import BeautifulSoup
+
+from gpt_researcher.scraper.utils import (
+    clean_soup,
+    extract_title,
+    get_relevant_images,
+    get_text_from_soup,
+    parse_html,
+)
+
+CORPUS = sorted((Path(__file__).parent / "benchmarks" / "html_corpus").glob("*.html"))
+URL = "https://example.com/section/page.html"
+
+
+@pytest.mark.parametrize("path", CORPUS, ids=lambda path: path.name)
+def test_parse_html_matches_soup_pipeline(path):
+    html = path.read_bytes()
+    soup = clean_soup(BeautifulSoup(html, "lxml"))
+
+    content, images, title = parse_html(html, URL)
+
+    assert content == get_text_from_soup(soup)
+    assert images == [(image["url"], image["score"]) for image in get_relevant_images(soup, URL)]
+    assert title == extract_title(soup)
+
+
+def test_parse_html_skips_removed_subtrees_but_keeps_tails():
+    html = b"<html><body><p>kept<nav>menu <b>links</b></nav> tail</p><div class='sidebar x'>ads</div></body></html>"
+
+    content, images, title = parse_html(html, URL)
+
+    assert content == "kept\ntail"
+    assert images == []
+    assert title == ""
@@ -0,0 +1,69 @@
+import time
+
+from gpt_researcher.retrievers.search_cache import SearchCache, cached_retriever
+from gpt_researcher.utils.cache import MemoryCache
+
+
+class FakeSearch:
+    """Counts searches and fails or returns nothing for some queries."""
+
+    calls = []
+
+    def __init__(self, query, headers=None, query_domains=None):
+        self.query = query
+        self.query_domains = query_domains
+
+    def search(self, max_results=5):
+        FakeSearch.calls.append((self.query, max_results))
+        if self.query == "down":
+            raise ConnectionError("API unavailable")
+        if self.query == "nothing":
+            return []
+        return [{"href": f"https://example.com/{self.query}/{i}", "body": "..."} for i in range(max_results)]
+
+
+def setup_function():
+    FakeSearch.calls = []
+
+
+def test_results_are_cached_per_query_domains_and_max_results():
+    Retriever = cached_retriever(FakeSearch, SearchCache(MemoryCache(), ttl=60))
+
+    first = Retriever("python", query_domains=["b.com", "a.com"]).search(max_results=3)
+    again = Retriever("python", query_domains=["a.com", "b.com"]).search(max_results=3)
+    Retriever("python", query_domains=["a.com", "b.com"]).search(max_results=5)
+    Retriever("python").search(max_results=3)
+
+    assert again == first
+    assert Retriever.__name__ == "FakeSearch"
+    assert FakeSearch.calls == [("python", 3), ("python", 5), ("python", 3)]
+
+
+def test_results_are_not_shared_between_headers():
+    Retriever = cached_retriever(FakeSearch, SearchCache(MemoryCache(), ttl=60))
+
+    Retriever("python", headers={"google_cx_key": "engine-a"}).search()
+    Retriever("python", headers={"google_cx_key": "engine-b"}).search()
+    Retriever("python", headers={"google_cx_key": "engine-a"}).search()
+
+    assert len(FakeSearch.calls) == 2
+
+
+def test_empty_results_are_cached_briefly_and_failures_not_at_all():
+    Retriever = cached_retriever(FakeSearch, SearchCache(MemoryCache(), ttl=60, negative_ttl=0.05))
+
+    assert Retriever("down").search() == []
+    assert Retriever("down").search() == []
+    assert len(FakeSearch.calls) == 2
+
+    assert Retriever("nothing").search() == []
+    assert Retriever("nothing").search() == []
+    assert len(FakeSearch.calls) == 3
+
+    time.sleep(0.06)
+    Retriever("nothing").search()
+    assert len(FakeSearch.calls) == 4
+
+
+def test_disabled_cache_returns_retriever_unchanged():
+    assert cached_retriever(FakeSearch, None) is FakeSearch
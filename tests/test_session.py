@@ -0,0 +1,55 @@
+import pytest
+
+from gpt_researcher import GPTResearcher
+from gpt_researcher.session import ResearchSession
+
+
+def test_sub_researchers_share_the_session_resources(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    parent = GPTResearcher(query="parent", language="german")
+    child = GPTResearcher(query="child", parent_query="parent", session=parent.session)
+
+    assert isinstance(parent.session, ResearchSession)
+    assert child.session is parent.session
+    assert child.scraper_manager.worker_pool is parent.scraper_manager.worker_pool
+    assert child.memory is parent.memory
+    assert child.retrievers is parent.retrievers
+    # Per-researcher settings don't leak through the shared config
+    assert parent.cfg.language == "german"
+    assert child.cfg.language == "english"
+
+
+def test_only_the_researcher_that_created_the_session_closes_it(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    parent = GPTResearcher(query="parent")
+    child = GPTResearcher(query="child", session=parent.session)
+    executor = parent.session.worker_pool.executor
+
+    child.close()
+    assert not executor._shutdown
+    parent.close()
+    assert executor._shutdown
+
+
+def test_session_and_config_path_are_exclusive(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    parent = GPTResearcher(query="parent")
+
+    with pytest.raises(ValueError):
+        GPTResearcher(query="child", session=parent.session, config_path="custom.json")
+    parent.close()
+
+
+@pytest.mark.asyncio
+async def test_aclose_closes_the_http_connections_of_the_session(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    parent = GPTResearcher(query="parent")
+    child = GPTResearcher(query="child", session=parent.session)
+    client_sessions = parent.session.worker_pool.client_sessions
+    http_session = client_sessions.get()
+
+    await child.aclose()
+    assert not http_session.closed
+    await parent.aclose()
+    assert http_session.closed
+    assert parent.session.worker_pool.executor._shutdown